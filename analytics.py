@@ -0,0 +1,157 @@
+# analytics.py
+# Universe-wide analytics batch job. The last LOOKBACK daily bars of every
+# symbol are packed right-aligned into (bars, symbols) panels in one
+# shared-memory block; worker processes compute return, risk and indicator
+# columns for chunks of symbols with the 2-D indicator functions, and the
+# parent adds within-sector percentiles and writes one results table. The
+# screener and the peer views read that table instead of profile-only
+# fundamentals when it exists:
+#   python analytics.py [out.parquet] [workers]
+import math
+import os
+import sys
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from indicators import atr, rsi, sma
+from peers import group_percentiles
+from screener import FundamentalsTable
+
+ANALYTICS_PATH = os.environ.get("MARKETPULSE_ANALYTICS", "data/analytics.parquet")
+# Bars kept per symbol: a trading year plus indicator warm-up
+LOOKBACK = 400
+TRADING_DAYS = 252
+PANEL_FIELDS = ("high", "low", "close")
+METRICS = ("Return1M", "Return3M", "Return1Y", "Volatility", "MaxDrawdown", "RSI", "SMA200Gap", "ATRPct")
+# Columns that also get a within-sector percentile, written as <name>Pct
+PERCENTILES = ("PE", "ROE", "ROCE", "MarketCap", "NetProfit", "Return1Y", "Volatility")
+# Below this a pool costs more than it saves. In-process metrics take about
+# 0.05-0.08 ms a symbol; starting the pool and filling shared memory takes
+# 35 ms on one core and ~130 ms with eight workers, so even on eight cores
+# the pool only breaks even near 2,000 symbols (600 symbols: 48 ms in-process,
+# 160 ms pooled). Re-measure with the analytics.serial and analytics.pool
+# benchmark cases.
+MIN_PARALLEL_SYMBOLS = 2000
+CHUNKS_PER_WORKER = 4
+
+
+# ----------------- Metrics -----------------
+def pack_panel(bars_list, out):
+    # out: (fields, LOOKBACK, symbols); short histories are NaN-padded on top
+    out.fill(np.nan)
+    lookback = out.shape[1]
+    for j, bars in enumerate(bars_list):
+        if bars is None:
+            continue
+        for f, field in enumerate(PANEL_FIELDS):
+            col = getattr(bars, field)[-lookback:]
+            out[f, lookback - len(col):, j] = col
+    return out
+
+
+def panel_metrics(high, low, close):
+    # (bars, symbols) panels -> {metric: one value per symbol}
+    last = close[-1]
+    year = close[-(TRADING_DAYS + 1):]
+    with np.errstate(divide="ignore", invalid="ignore"), warnings.catch_warnings():
+        # Symbols without enough history come out as NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        log_returns = np.diff(np.log(year), axis=0)
+        return {
+            "Return1M": 100.0 * (last / close[-22] - 1),
+            "Return3M": 100.0 * (last / close[-64] - 1),
+            "Return1Y": 100.0 * (last / year[0] - 1),
+            "Volatility": 100.0 * np.nanstd(log_returns, axis=0, ddof=1) * math.sqrt(TRADING_DAYS),
+            "MaxDrawdown": 100.0 * np.nanmin(year / np.fmax.accumulate(year, axis=0) - 1, axis=0),
+            "RSI": rsi(close)[-1],
+            "SMA200Gap": 100.0 * (last / sma(close, 200)[-1] - 1),
+            "ATRPct": 100.0 * atr(high, low, close)[-1] / last,
+        }
+
+
+# ----------------- Workers -----------------
+_shm = None
+_panel = None
+
+
+def _attach(name, shape):
+    global _shm, _panel
+    # Workers share the parent's resource tracker, so attaching does not
+    # hand ownership over: the parent unlinks the block when the pool is done
+    _shm = shared_memory.SharedMemory(name=name)
+    _panel = np.ndarray(shape, dtype=np.float64, buffer=_shm.buf)
+
+
+def _chunk(bounds):
+    lo, hi = bounds
+    return lo, panel_metrics(*_panel[:, :, lo:hi])
+
+
+def compute_metrics(bars_list, workers=None, lookback=LOOKBACK):
+    # {metric: array aligned with bars_list}; None entries give NaN rows
+    n = len(bars_list)
+    workers = workers or os.cpu_count() or 1
+    shape = (len(PANEL_FIELDS), lookback, n)
+    if workers == 1 or n < MIN_PARALLEL_SYMBOLS:
+        return panel_metrics(*pack_panel(bars_list, np.empty(shape)))
+    step = math.ceil(n / (workers * CHUNKS_PER_WORKER))
+    shm = shared_memory.SharedMemory(create=True, size=8 * math.prod(shape))
+    try:
+        pack_panel(bars_list, np.ndarray(shape, dtype=np.float64, buffer=shm.buf))
+        out = {name: np.empty(n) for name in METRICS}
+        with ProcessPoolExecutor(workers, initializer=_attach, initargs=(shm.name, shape)) as pool:
+            for lo, part in pool.map(_chunk, [(lo, min(lo + step, n)) for lo in range(0, n, step)]):
+                for name, values in part.items():
+                    out[name][lo:lo + len(values)] = values
+        return out
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+# ----------------- Results table -----------------
+def build_results(data, workers=None):
+    # One row per company: profile fundamentals, METRICS and <name>Pct columns
+    profiles = data.profiles()
+    table = FundamentalsTable.from_profiles(profiles)
+    symbols = list(table.symbols)
+    metrics = compute_metrics([data.daily_bars(s) for s in symbols], workers)
+    frame = pd.DataFrame({"Name": symbols, "Sector": profiles.sectors()})
+    for name, col in {**table.columns, **metrics}.items():
+        frame[name] = col
+    _, groups = np.unique(frame["Sector"].to_numpy(dtype=str), return_inverse=True)
+    for name in PERCENTILES:
+        frame[f"{name}Pct"] = np.round(group_percentiles(groups, frame[name].to_numpy()), 1)
+    return frame
+
+
+def write_results(frame, path=ANALYTICS_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    frame.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def load_results(path=ANALYTICS_PATH):
+    # None when the job has not run (or pyarrow is missing)
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path)
+    except ImportError:
+        return None
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 3:
+        sys.exit("usage: python analytics.py [out.parquet] [workers]")
+    from providers import default_market_data
+
+    out_path = sys.argv[1] if len(sys.argv) > 1 else ANALYTICS_PATH
+    results = build_results(default_market_data(), int(sys.argv[2]) if len(sys.argv) > 2 else None)
+    write_results(results, out_path)
+    print(f"{len(results)} companies -> {out_path}")
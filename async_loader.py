@@ -0,0 +1,77 @@
+# async_loader.py
+# Runs data providers on a QThreadPool so slow sources never block the GUI
+# thread. Results come back through a queued signal and are delivered to the
+# callback on the GUI thread; requests made before the last cancel() are
+# stale and are dropped (or skipped, if they have not started yet).
+import traceback
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class _Signals(QObject):
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+
+class _Task(QRunnable):
+    def __init__(self, loader, token, generation, func, args):
+        super().__init__()
+        self.loader = loader
+        self.token = token
+        self.generation = generation
+        self.func = func
+        self.args = args
+
+    def run(self):
+        # Cancelled while still queued: do not touch the data source at all
+        if self.generation != self.loader.generation:
+            return
+        try:
+            result = self.func(*self.args)
+        except Exception as exc:
+            traceback.print_exc()
+            self.loader.signals.failed.emit(self.token, str(exc) or type(exc).__name__)
+        else:
+            self.loader.signals.finished.emit(self.token, result)
+
+
+class AsyncLoader(QObject):
+    def __init__(self, parent=None, max_threads=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        if max_threads:
+            self.pool.setMaxThreadCount(max_threads)
+        # Created on the GUI thread, so worker emits are queued back to it
+        self.signals = _Signals()
+        self.signals.finished.connect(self._finished)
+        self.signals.failed.connect(self._failed)
+        self.generation = 0
+        self.next_token = 0
+        self.pending = {}
+
+    def load(self, func, *args, on_done, on_error=None):
+        self.next_token += 1
+        token = self.next_token
+        self.pending[token] = (on_done, on_error)
+        self.pool.start(_Task(self, token, self.generation, func, args))
+        return token
+
+    def cancel(self):
+        # Everything requested so far is stale; queued tasks are dropped and
+        # results of running ones are ignored when they arrive
+        self.generation += 1
+        self.pending.clear()
+        self.pool.clear()
+
+    def _finished(self, token, result):
+        callbacks = self.pending.pop(token, None)
+        if callbacks is not None:
+            callbacks[0](result)
+
+    def _failed(self, token, message):
+        callbacks = self.pending.pop(token, None)
+        if callbacks is not None and callbacks[1] is not None:
+            callbacks[1](message)
+
+    def wait(self, msecs=-1):
+        return self.pool.waitForDone(msecs)
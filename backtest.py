@@ -0,0 +1,157 @@
+# backtest.py
+# Vectorized backtests of simple long-only rules over the daily bars behind
+# the candlestick chart. A strategy turns OHLCV arrays into a 0/1 position per
+# bar; entries and exits are carried forward with an index accumulate, and
+# equity, drawdown and the trade list come from cumulative products and
+# np.diff, so nothing loops over bars. Parameter sweeps run on a process pool.
+import itertools
+import math
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from indicators import rsi, sma
+
+# Charged on every change of position, in basis points of the trade value
+FEE_BPS = 10
+# One run over five years of bars takes about a millisecond, while starting
+# the pool and copying the bars into every worker takes about 25 ms, so
+# sweeps smaller than this finish sooner in-process
+MIN_PARALLEL_RUNS = 32
+
+Backtest = namedtuple("Backtest", ["dates", "equity", "drawdown", "position", "trades", "stats"])
+
+
+# ----------------- Building blocks -----------------
+def _hold(enter, exit):
+    # 1 from each entry bar until the next exit bar, 0 before the first entry
+    state = np.where(enter, 1.0, np.where(exit, 0.0, np.nan))
+    idx = np.where(np.isnan(state), 0, np.arange(len(state)))
+    np.maximum.accumulate(idx, out=idx)
+    held = state[idx]
+    held[np.isnan(held)] = 0.0
+    return held
+
+
+def _prior(x, n, func):
+    # func over the n bars before each bar; NaN until n bars exist
+    out = np.full(len(x), np.nan)
+    if len(x) > n:
+        out[n:] = func(sliding_window_view(x, n)[:-1], axis=1)
+    return out
+
+
+# ----------------- Strategies -----------------
+def ma_crossover(close, fast=20, slow=50):
+    # Long while the fast average is above the slow one
+    with np.errstate(invalid="ignore"):
+        return (sma(close, fast) > sma(close, slow)).astype(np.float64)
+
+
+def rsi_reversion(close, n=14, low=30, high=70):
+    # Buy oversold, sell overbought
+    r = rsi(close, n)
+    with np.errstate(invalid="ignore"):
+        return _hold(r < low, r > high)
+
+
+def breakout(high, low, close, n=20, exit_n=10):
+    # Donchian channel: enter above the n-bar high, exit below the exit_n-bar low
+    with np.errstate(invalid="ignore"):
+        return _hold(close > _prior(high, n, np.max), close < _prior(low, exit_n, np.min))
+
+
+Strategy = namedtuple("Strategy", ["func", "inputs", "params"])
+
+STRATEGIES = {
+    "MA Crossover": Strategy(ma_crossover, ("close",), {"fast": 20, "slow": 50}),
+    "RSI Reversion": Strategy(rsi_reversion, ("close",), {"n": 14, "low": 30, "high": 70}),
+    "Breakout": Strategy(breakout, ("high", "low", "close"), {"n": 20, "exit_n": 10}),
+}
+
+
+# ----------------- Engine -----------------
+def run(bars, strategy, fee_bps=FEE_BPS, **params):
+    spec = STRATEGIES[strategy]
+    close = np.asarray(bars.close, dtype=np.float64)
+    if len(close) < 2:
+        # Nothing to trade on a single bar (and the indicators need two)
+        signal = np.zeros(len(close))
+    else:
+        signal = spec.func(*(np.asarray(getattr(bars, f), dtype=np.float64) for f in spec.inputs),
+                           **{**spec.params, **params})
+    # Signals are acted on at the close they appear, so they earn from the next bar
+    position = np.zeros(len(close))
+    position[1:] = signal[:-1]
+    returns = np.zeros(len(close))
+    returns[1:] = close[1:] / close[:-1] - 1
+    turnover = np.abs(np.diff(position, prepend=0.0))
+    strat = position * returns - turnover * fee_bps / 1e4
+    equity = np.cumprod(1 + strat)
+    drawdown = equity / np.maximum.accumulate(equity) - 1
+
+    # A trade holds from bar e (bought at close e-1) to bar x (sold at close x)
+    entries = np.flatnonzero(np.diff(position, prepend=0.0) > 0)
+    exits = np.flatnonzero(np.diff(position, append=0.0) < 0)
+    trades = pd.DataFrame({
+        "Entry": np.asarray(bars.dates)[entries - 1],
+        "Exit": np.asarray(bars.dates)[exits],
+        "Entry Price": close[entries - 1],
+        "Exit Price": close[exits],
+        "Return (%)": 100 * (equity[exits] / equity[entries - 1] - 1),
+        "Bars": exits - entries + 1,
+    })
+    return Backtest(bars.dates, equity, drawdown, position, trades, _stats(bars.dates, strat, equity, drawdown, position, trades))
+
+
+def _stats(dates, strat, equity, drawdown, position, trades):
+    # Years from the calendar span of the bars, and annualized by the bars
+    # actually seen per year, so weekly or gappy series aren't taken as daily
+    dates = np.asarray(dates, dtype="M8[D]")
+    years = (dates[-1] - dates[0]) / np.timedelta64(1, "D") / 365.25 if len(dates) > 1 else 0.0
+    per_year = (len(dates) - 1) / years if years > 0 else 0.0
+    std = strat.std(ddof=1) if len(strat) > 1 else 0.0
+    return {
+        "Total Return (%)": 100 * (equity[-1] - 1) if len(equity) else 0.0,
+        "CAGR (%)": 100 * (equity[-1] ** (1 / years) - 1) if years > 0 else 0.0,
+        "Sharpe": strat.mean() / std * math.sqrt(per_year) if std > 0 and per_year > 0 else np.nan,
+        "Max Drawdown (%)": 100 * drawdown.min() if len(drawdown) else 0.0,
+        "Trades": len(trades),
+        "Win Rate (%)": 100 * float((trades["Return (%)"] > 0).mean()) if len(trades) else np.nan,
+        "Exposure (%)": 100 * position.mean() if len(position) else 0.0,
+    }
+
+
+# ----------------- Sweeps -----------------
+_sweep_bars = None
+
+
+def _set_bars(bars):
+    global _sweep_bars
+    _sweep_bars = bars
+
+
+def _sweep_one(job):
+    strategy, fee_bps, params = job
+    return run(_sweep_bars, strategy, fee_bps, **params).stats
+
+
+def sweep(bars, strategy, grid, fee_bps=FEE_BPS, workers=None):
+    # grid: {param: values}. One row of parameters and stats per combination,
+    # best Sharpe first. Bars go to each worker once, not with every job.
+    combos = [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+    jobs = [(strategy, fee_bps, params) for params in combos]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) < MIN_PARALLEL_RUNS:
+        _set_bars(bars)
+        rows = [_sweep_one(job) for job in jobs]
+        _set_bars(None)
+    else:
+        with ProcessPoolExecutor(workers, initializer=_set_bars, initargs=(bars,)) as pool:
+            rows = list(pool.map(_sweep_one, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    frame = pd.DataFrame([{**params, **stats} for params, stats in zip(combos, rows)])
+    return frame.sort_values("Sharpe", ascending=False, na_position="last", ignore_index=True)
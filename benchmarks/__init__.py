@@ -0,0 +1,3 @@
+# benchmarks
+# Timing cases for data loading, figures, search, statements and Qt tables;
+# run with `python -m benchmarks.run`.
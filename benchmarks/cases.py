@@ -0,0 +1,399 @@
+# benchmarks/cases.py
+# Each case takes a size (rows, bars or symbols) and a scratch directory and
+# returns the function to time. Building inputs and writing files happens in
+# the case itself, outside the timed call.
+import os
+
+import numpy as np
+import pandas as pd
+
+from ohlcv_store import OHLCVStore, OHLCVStoreWriter
+from price_history import synthetic_bars
+
+CASES = {}
+# Panels above this many symbols do not fit in memory on a workstation
+MAX_ANALYTICS_SYMBOLS = 100_000
+# The correlation matrix is symbols^2 float64s
+MAX_CORRELATION_SYMBOLS = 5_000
+# Watchlists are followed by hand; this is already far past one
+MAX_WATCHLIST_SYMBOLS = 100_000
+
+SEARCH_QUERIES = ["tata", "mot", "maruti suz", "hyund", "xyz corp", "greentech", "m&m", "ev"]
+WORDS = ["Motors", "Auto", "Greentech", "Industries", "Suzuki", "EV-Tech", "Finance", "Power"]
+
+
+class Skip(Exception):
+    pass
+
+
+def case(name, unit):
+    def register(func):
+        CASES[name] = (func, unit)
+        return func
+    return register
+
+
+# ----------------- OHLCV -----------------
+@case("ohlcv.generate", "bars")
+def ohlcv_generate(n, tmp):
+    return lambda: synthetic_bars("BENCH", 100.0, days=n)
+
+
+@case("ohlcv.load", "bars")
+def ohlcv_load(n, tmp):
+    root = os.path.join(tmp, f"ohlcv-{n}")
+    with OHLCVStoreWriter(root) as writer:
+        writer.add("BENCH", synthetic_bars("BENCH", 100.0, days=n))
+
+    def run():
+        # Open the store and touch every close, as the chart does
+        bars = OHLCVStore(root).get("BENCH")
+        return float(np.asarray(bars.close).sum())
+    return run
+
+
+# ----------------- Plotly -----------------
+@case("figure.build", "bars")
+def figure_build(n, tmp):
+    from charts import build_price_figure
+    from indicators import IndicatorEngine
+
+    bars = synthetic_bars("BENCH", 100.0, days=n)
+    # Fresh engine each call so indicator memoization does not hide the cost
+    return lambda: build_price_figure(bars, "BENCH", ("SMA", "RSI"), engine=IndicatorEngine())
+
+
+@case("figure.view", "bars")
+def figure_view(n, tmp):
+    # What the dashboard does: resample to the chart width, then build
+    from charts import CHART_WIDTH_PX, build_price_figure
+    from downsample import choose_resolution, resample
+    from indicators import IndicatorEngine
+
+    bars = synthetic_bars("BENCH", 100.0, days=n)
+
+    def run():
+        view = resample(bars, choose_resolution(bars.dates, CHART_WIDTH_PX))
+        return build_price_figure(view, "BENCH", ("SMA", "RSI"), engine=IndicatorEngine())
+    return run
+
+
+@case("figure.cached", "bars")
+def figure_cached(n, tmp):
+    # A repeat view from the figure cache, through to the JSON st.plotly_chart sends
+    import plotly.io as pio
+
+    from charts import CHART_WIDTH_PX, FigureCache, build_price_figure
+    from downsample import choose_resolution, resample
+
+    bars = synthetic_bars("BENCH", 100.0, days=n)
+    view = resample(bars, choose_resolution(bars.dates, CHART_WIDTH_PX))
+    figures = FigureCache()
+    build = lambda: build_price_figure(view, "BENCH", ("SMA", "RSI"))
+    figures.payload("BENCH", n, "view", view, build, overlays=("SMA", "RSI"))
+    return lambda: pio.to_json(figures.figure("BENCH", n, "view", view, build, overlays=("SMA", "RSI")).to_dict(),
+                               validate=False)
+
+
+# ----------------- Backtests -----------------
+@case("backtest.run", "bars")
+def backtest_run(n, tmp):
+    from backtest import STRATEGIES, run
+
+    bars = synthetic_bars("BENCH", 100.0, days=n)
+    return lambda: [run(bars, name) for name in STRATEGIES]
+
+
+# ----------------- Search -----------------
+def _entries(n):
+    rng = np.random.default_rng(n)
+    return [(f"Company{i} {WORDS[w]}", f"C{i}", []) for i, w in enumerate(rng.integers(0, len(WORDS), n))]
+
+
+@case("search.build", "symbols")
+def search_build(n, tmp):
+    from search_index import SearchIndex
+
+    entries = _entries(n)
+    return lambda: SearchIndex(entries)
+
+
+@case("search.query", "symbols")
+def search_query(n, tmp):
+    from search_index import SearchIndex
+
+    index = SearchIndex(_entries(n))
+    return lambda: [index.search(q, limit=10) for q in SEARCH_QUERIES]
+
+
+# ----------------- Financial sections -----------------
+def _statement_rows(n):
+    # n rows as symbols x periods, at most 40 periods per symbol
+    periods = min(n, 40)
+    symbols = max(1, n // periods)
+    ends = pd.date_range("2000-03-31", periods=periods, freq="QE")
+    rng = np.random.default_rng(n)
+    frame = pd.DataFrame({
+        "symbol": np.repeat([f"S{i:07d}" for i in range(symbols)], periods),
+        "period": np.tile(ends.strftime("%b %Y"), symbols),
+        "period_end": np.tile(ends, symbols),
+    })
+    for item in ["Sales +", "Expenses +", "Operating Profit", "Net Profit"]:
+        frame[item] = rng.normal(1e4, 2e3, len(frame))
+    return frame
+
+
+@case("statements.load", "rows")
+def statements_load(n, tmp):
+    from statements_store import StatementsStore, write_statement
+
+    root = os.path.join(tmp, f"statements-{n}")
+    frame = _statement_rows(n)
+    write_statement(root, "Profit & Loss", frame)
+    symbol = frame["symbol"].iloc[len(frame) // 2]
+    # New store per call: measures the filtered read and pivot, not the LRU
+    return lambda: StatementsStore(root).load(symbol, "Profit & Loss")
+
+
+@case("statements.load_arrow", "rows")
+def statements_load_arrow(n, tmp):
+    from statements_store import StatementsStore, write_statement
+
+    root = os.path.join(tmp, f"statements-arrow-{n}")
+    frame = _statement_rows(n)
+    write_statement(root, "Profit & Loss", frame, fmt="arrow")
+    symbol = frame["symbol"].iloc[len(frame) // 2]
+    return lambda: StatementsStore(root).load(symbol, "Profit & Loss")
+
+
+@case("statements.frame", "rows")
+def statements_frame(n, tmp):
+    # Every company's statement reshaped to line items x periods in one go,
+    # as a universe-wide financial section would need
+    frame = _statement_rows(n)
+    items = ["Sales +", "Expenses +", "Operating Profit", "Net Profit"]
+    return lambda: frame.set_index(["symbol", "period_end"])[items].unstack("period_end").stack(0, future_stack=True)
+
+
+# ----------------- Analytics batch -----------------
+@case("analytics.batch", "symbols")
+def analytics_batch(n, tmp):
+    # Every core, over chunks of symbols in shared memory
+    from analytics import LOOKBACK, compute_metrics
+
+    if n > MAX_ANALYTICS_SYMBOLS:
+        raise Skip(f"more than {MAX_ANALYTICS_SYMBOLS:,} symbols")
+    bars = [synthetic_bars(f"S{i}", 100.0, days=LOOKBACK) for i in range(n)]
+    return lambda: compute_metrics(bars)
+
+
+@case("analytics.serial", "symbols")
+def analytics_serial(n, tmp):
+    # In-process, for the crossover against analytics.pool
+    from analytics import LOOKBACK, compute_metrics
+
+    if n > MAX_ANALYTICS_SYMBOLS:
+        raise Skip(f"more than {MAX_ANALYTICS_SYMBOLS:,} symbols")
+    bars = [synthetic_bars(f"S{i}", 100.0, days=LOOKBACK) for i in range(n)]
+    return lambda: compute_metrics(bars, workers=1)
+
+
+@case("analytics.pool", "symbols")
+def analytics_pool(n, tmp):
+    # Always on the pool, however few symbols: where this overtakes
+    # analytics.serial is where MIN_PARALLEL_SYMBOLS belongs
+    import analytics
+
+    if n > MAX_ANALYTICS_SYMBOLS:
+        raise Skip(f"more than {MAX_ANALYTICS_SYMBOLS:,} symbols")
+    bars = [synthetic_bars(f"S{i}", 100.0, days=analytics.LOOKBACK) for i in range(n)]
+    workers = max(2, os.cpu_count() or 1)
+
+    def run():
+        threshold, analytics.MIN_PARALLEL_SYMBOLS = analytics.MIN_PARALLEL_SYMBOLS, 0
+        try:
+            analytics.compute_metrics(bars, workers)
+        finally:
+            analytics.MIN_PARALLEL_SYMBOLS = threshold
+    return run
+
+
+# ----------------- Ratios -----------------
+@case("ratios.derive", "companies")
+def ratios_derive(n, tmp):
+    # Every ratio for four years of n companies in one pass
+    from ratios import INPUTS, derive
+
+    rng = np.random.default_rng(n)
+    rows = n * 4
+    long = pd.DataFrame({item: rng.uniform(100, 10_000, rows) for items in INPUTS.values() for item in items})
+    long["symbol"] = np.repeat(np.arange(n), 4)
+    long["period"] = np.tile(["Mar 2022", "Mar 2023", "Mar 2024", "Mar 2025"], n)
+    long["period_end"] = pd.to_datetime(long["period"], format="%b %Y")
+    market_cap = dict(enumerate(rng.uniform(1_000, 100_000, n)))
+    return lambda: derive(long, market_cap)
+
+
+# ----------------- Profiles -----------------
+def _profile_records(n):
+    from universe import PROFILES
+
+    base = list(PROFILES.values())
+    return {f"Company {i:07d}": dict(base[i % len(base)], Sector=f"Sector {i % 40}") for i in range(n)}
+
+
+@case("profiles.build", "companies")
+def profiles_build(n, tmp):
+    # Parse n dict-form profiles into the column table
+    from profiles import ProfileTable
+
+    records = _profile_records(n)
+    return lambda: ProfileTable.from_records(records)
+
+
+@case("profiles.header", "companies")
+def profiles_header(n, tmp):
+    # Header HTML for every company, twice: the second pass is all cache hits
+    # while n fits in the cache
+    import cards
+    from profiles import ProfileTable
+
+    table = ProfileTable.from_records(_profile_records(n))
+
+    def run():
+        for _ in range(2):
+            for symbol in table:
+                cards.header_html(table.row(symbol))
+
+    return run
+
+
+# ----------------- Correlations -----------------
+def _returns(n):
+    from analytics import TRADING_DAYS
+
+    if n > MAX_CORRELATION_SYMBOLS:
+        raise Skip(f"more than {MAX_CORRELATION_SYMBOLS:,} symbols")
+    return np.random.default_rng(n).normal(0, 0.015, (TRADING_DAYS + 1, n))
+
+
+@case("correlation.build", "symbols")
+def correlation_build(n, tmp):
+    from correlation import CorrelationEngine
+
+    returns = _returns(n)
+    engine = CorrelationEngine(range(n))
+    return lambda: engine.build(returns[:-1])
+
+
+@case("correlation.push", "symbols")
+def correlation_push(n, tmp):
+    # One new day on a full window; compare with correlation.build
+    from correlation import CorrelationEngine
+
+    returns = _returns(n)
+    engine = CorrelationEngine(range(n)).build(returns[:-1])
+    return lambda: engine.push(returns[-1])
+
+
+# ----------------- Watchlist -----------------
+@case("watchlist.refresh", "symbols")
+def watchlist_refresh(n, tmp):
+    # One refresh round where a tenth of the quotes moved: diff, then save
+    # the changed rows in one transaction
+    from watchlist import WatchlistRefresher, WatchlistStore
+
+    if n > MAX_WATCHLIST_SYMBOLS:
+        raise Skip(f"more than {MAX_WATCHLIST_SYMBOLS:,} symbols")
+    symbols = [f"S{i}" for i in range(n)]
+    store = WatchlistStore(os.path.join(tmp, f"watchlist-{n}.db"))
+    store.add(symbols)
+    rng = np.random.default_rng(n)
+    price = rng.uniform(10, 5000, n)
+    rounds = [price]
+    for _ in range(64):
+        price = price.copy()
+        moved = rng.random(n) < 0.1
+        price[moved] *= 1 + rng.normal(0, 0.001, int(moved.sum()))
+        rounds.append(price)
+    answers = iter([{s: [p, 100.0] for s, p in zip(symbols, prices.tolist())} for prices in rounds] * 1000)
+    refresher = WatchlistRefresher(store, lambda wanted: next(answers))
+    refresher.refresh()
+    return refresher.refresh
+
+
+# ----------------- Export -----------------
+def _export_case(fmt):
+    def run_case(n, tmp):
+        # Price history from the memory-mapped store, streamed in chunks
+        from providers import FilesBackend, MarketData
+        from export import export_symbol
+
+        root = os.path.join(tmp, f"export-ohlcv-{n}")
+        if not os.path.exists(root):
+            with OHLCVStoreWriter(root) as writer:
+                writer.add("BENCH", synthetic_bars("BENCH", 100.0, days=n))
+        data = MarketData([FilesBackend(root)])
+        out_dir = os.path.join(tmp, f"export-{fmt}-{n}")
+        return lambda: export_symbol(data, "BENCH", out_dir, ["ohlcv"], fmt)
+    return run_case
+
+
+for _fmt in ("csv", "parquet"):
+    case(f"export.{_fmt}", "bars")(_export_case(_fmt))
+
+
+# ----------------- Qt tables -----------------
+_qt = {}
+
+
+def _qt_app():
+    # One offscreen application and main window for every Qt case
+    if not _qt:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt6.QtWidgets import QApplication
+
+        _qt["app"] = QApplication.instance() or QApplication([])
+        import tempCodeRunnerFile
+
+        _qt["window"] = tempCodeRunnerFile.MarketPulseApp()
+    return _qt["app"], _qt["window"]
+
+
+def _render(table):
+    # Population includes the first paint: the view asks for visible cells only
+    table.resize(900, 300)
+    table.grab()
+
+
+@case("qt.peers_table", "rows")
+def qt_peers_table(n, tmp):
+    app, window = _qt_app()
+    rng = np.random.default_rng(n)
+    frame = pd.DataFrame({
+        "Name": [f"Company {i}" for i in range(n)],
+        "CMP": rng.uniform(10, 20000, n),
+        "P/E": rng.uniform(5, 90, n),
+        "ROE (%)": rng.uniform(-5, 40, n),
+    })
+
+    def run():
+        table = window.create_peers_table(frame)
+        _render(table)
+        table.deleteLater()
+    return run
+
+
+@case("qt.financial_table", "rows")
+def qt_financial_table(n, tmp):
+    from lazy_widgets import LoadingPlaceholder
+
+    app, window = _qt_app()
+    frame = _statement_rows(n).drop(columns=["symbol", "period_end"])
+
+    def run():
+        slot = LoadingPlaceholder()
+        window.show_financial_table(slot, "Bench", frame)
+        _render(slot.content)
+        slot.deleteLater()
+    return run
@@ -0,0 +1,132 @@
+# benchmarks/run.py
+# Command-line benchmark runner. Results are written as JSON so two commits
+# can be compared:
+#   python -m benchmarks.run                       # every case at 10, 10k, 1M
+#   python -m benchmarks.run --cases search,qt --sizes 10,10000
+#   python -m benchmarks.run --out new.json --compare old.json
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+
+from benchmarks.cases import CASES, Skip
+
+DEFAULT_SIZES = (10, 10_000, 1_000_000)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(func, repeat, budget):
+    # At least one call, then up to `repeat` while within `budget` seconds
+    times = []
+    started = time.perf_counter()
+    while len(times) < repeat:
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+        if time.perf_counter() - started > budget:
+            break
+    return times
+
+
+def run(names, sizes, repeat, budget):
+    results = []
+    with tempfile.TemporaryDirectory(prefix="marketpulse-bench-") as tmp:
+        for name in names:
+            setup, unit = CASES[name]
+            for size in sizes:
+                row = {"case": name, "size": size, "unit": unit}
+                try:
+                    func = setup(size, tmp)
+                    times = measure(func, repeat, budget)
+                except (ImportError, Skip) as exc:
+                    row["skipped"] = str(exc)
+                except Exception as exc:
+                    traceback.print_exc()
+                    row["error"] = f"{type(exc).__name__}: {exc}"
+                else:
+                    row.update(runs=len(times), best_s=min(times), median_s=statistics.median(times),
+                               mean_s=statistics.fmean(times))
+                results.append(row)
+                print(_line(row), flush=True)
+    return results
+
+
+def _line(row):
+    label = f"{row['case']:<22} {row['size']:>9,} {row['unit']:<8}"
+    if "skipped" in row:
+        return f"{label} skipped: {row['skipped']}"
+    if "error" in row:
+        return f"{label} error: {row['error']}"
+    return f"{label} best {row['best_s'] * 1e3:10.3f} ms  median {row['median_s'] * 1e3:10.3f} ms  ({row['runs']} runs)"
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = {(r["case"], r["size"]): r for r in json.load(f)["results"]}
+    print(f"\nvs {baseline_path} (median, >1 is slower)")
+    for row in results:
+        old = baseline.get((row["case"], row["size"]))
+        if old and "median_s" in old and "median_s" in row:
+            ratio = row["median_s"] / old["median_s"]
+            flag = "  <-- regression" if ratio > 1.2 else ""
+            print(f"{row['case']:<22} {row['size']:>9,}  {ratio:6.2f}x{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MarketPulse benchmarks")
+    parser.add_argument("--cases", help="comma-separated case names or prefixes (default: all)")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=5.0, help="seconds per case and size")
+    parser.add_argument("--out", help="JSON file (default: bench-<commit>.json)")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--list", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(f"{name} ({unit})" for name, (_, unit) in CASES.items()))
+        return 0
+    names = list(CASES)
+    if args.cases:
+        wanted = [w.strip() for w in args.cases.split(",") if w.strip()]
+        names = [n for n in names if any(n == w or n.startswith(w + ".") or n.startswith(w) for w in wanted)]
+        if not names:
+            parser.error(f"no case matches {args.cases!r}; see --list")
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    commit = git_commit()
+    results = run(names, sizes, args.repeat, args.budget)
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "argv": sys.argv[1:],
+        },
+        "results": results,
+    }
+    out = args.out or f"bench-{commit or 'local'}.json"
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nwrote {os.path.abspath(out)}")
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+# cache.py
+# Small thread-safe caches shared by the Streamlit and Qt front ends.
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+# ----------------- LRU -----------------
+class LRUCache:
+    def __init__(self, maxsize=128):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key, factory):
+        # factory runs outside the lock, so two threads missing the same key
+        # may both build it; the last one to finish wins
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+# ----------------- TTL + LRU -----------------
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class TTLCache:
+    # LRU whose entries also expire `ttl` seconds after they were stored.
+    # get_or_load coalesces concurrent misses: the first caller runs the
+    # loader, the others wait for its result (or its exception).
+    def __init__(self, maxsize=256, ttl=300.0, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self._lru = LRUCache(maxsize)
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.coalesced = 0
+
+    def __len__(self):
+        return len(self._lru)
+
+    def get(self, key, default=None):
+        entry = self._lru.get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        expires, value = entry
+        if expires is not None and self.clock() >= expires:
+            self._lru.pop(key)
+            return default
+        return value
+
+    def put(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        self._lru.put(key, (None if ttl is None else self.clock() + ttl, value))
+
+    def get_or_load(self, key, load, ttl=None):
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            self.hits += 1
+            return value
+        with self._lock:
+            # Re-check: a load may have finished since the miss above
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        try:
+            flight.value = load()
+            self.put(key, flight.value, ttl)
+            return flight.value
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            flight.done.set()
+
+    def invalidate(self, match=None):
+        # Drop every key for which match(key) is true, or everything
+        if match is None:
+            self._lru.clear()
+            return
+        with self._lru._lock:
+            stale = [key for key in self._lru._data if match(key)]
+        for key in stale:
+            self._lru.pop(key)
+
+    def clear(self):
+        self._lru.clear()
+
+
+# ----------------- Byte-bounded LRU -----------------
+class SizedLRUCache:
+    # LRU bounded by the total size of its values (sizeof(value), bytes by
+    # default) rather than their count, for values as uneven as serialized
+    # figures. A value bigger than the whole budget is not stored.
+    def __init__(self, maxbytes, sizeof=len):
+        if maxbytes < 1:
+            raise ValueError("maxbytes must be at least 1")
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self.nbytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, value):
+        size = self.sizeof(value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[0]
+            if size > self.maxbytes:
+                return
+            self._data[key] = (size, value)
+            self.nbytes += size
+            while self.nbytes > self.maxbytes:
+                _, (evicted, _) = self._data.popitem(last=False)
+                self.nbytes -= evicted
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is None:
+                return default
+            self.nbytes -= entry[0]
+            return entry[1]
+
+    def invalidate(self, match=None):
+        # Drop every key for which match(key) is true, or everything
+        with self._lock:
+            stale = list(self._data) if match is None else [key for key in self._data if match(key)]
+            for key in stale:
+                self.nbytes -= self._data.pop(key)[0]
+
+    def clear(self):
+        self.invalidate()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"entries": len(self._data), "bytes": self.nbytes, "maxbytes": self.maxbytes,
+                    "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "hit_rate": self.hits / lookups if lookups else 0.0}
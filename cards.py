@@ -0,0 +1,42 @@
+# cards.py
+# HTML for the Streamlit company header and key-metric cards (styled by the
+# CSS in marketpulse_gui.py). Memoized on the Profile row itself: it is a
+# tuple of plain values, so showing a company again is one dict lookup, and a
+# profile that changed is simply a new key. Lives outside the Streamlit
+# script so the cache survives reruns.
+from functools import lru_cache
+from html import escape
+
+from formatting import format_crore, format_indian, format_percent, format_range
+
+HEADER_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=HEADER_CACHE_SIZE)
+def metric_card_html(label, value, delta=None):
+    delta_html = f"<div class='metric-title'>Δ {delta}</div>" if delta else ""
+    return (f"<div class='metric-card'><div class='metric-title'>{label}</div>"
+            f"<div class='metric-value'>{value}</div>{delta_html}</div>")
+
+
+@lru_cache(maxsize=HEADER_CACHE_SIZE)
+def header_html(profile):
+    # profile: profiles.Profile -> (title, summary line, metric cards)
+    p = profile
+    change_color = "green" if (p.Change or 0) > 0 else "red"
+    title = f"<div class='main-title'>🚗 {escape(p.symbol)} Ltd Dashboard</div>"
+    bigdata = (
+        f"<div class='bigdata'>Price: <b>₹{format_indian(p.Price)}</b>  |  "
+        f"Change: <b style='color:{change_color}'>{format_percent(p.Change)}</b>  |  "
+        f"Market Cap: ₹{format_crore(p.MarketCap)}<br>"
+        f"High/Low: {format_range(p.High, p.Low)} | P/E: {format_indian(p.PE)} | "
+        f"Book Value: ₹{format_indian(p.Book)} | Dividend: {format_percent(p.Div)} | "
+        f"ROCE: {format_percent(p.ROCE)} | ROE: {format_percent(p.ROE)}</div>"
+    )
+    cards = (
+        metric_card_html("Price", f"₹{format_indian(p.Price)}", format_percent(p.Change)),
+        metric_card_html("P/E", format_indian(p.PE)),
+        metric_card_html("Dividend Yield", format_percent(p.Div)),
+        metric_card_html("ROE", format_percent(p.ROE)),
+    )
+    return title, bigdata, cards
@@ -0,0 +1,207 @@
+# charts.py
+# Plotly figures for the Streamlit dashboard, importable without Streamlit so
+# they can be benchmarked and reused.
+import json
+import os
+import threading
+
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.subplots import make_subplots
+
+from cache import SizedLRUCache
+from downsample import lttb
+from indicators import INDICATORS, IndicatorEngine
+
+# Streamlit does not report the browser width; a wide-layout chart is roughly this
+CHART_WIDTH_PX = 1200
+
+OVERLAY_COLORS = ["#f5c542", "#5b8def", "#c77dff", "#ff8c42", "#9ad1d4"]
+
+# Background and text per theme; the dashboard CSS is dark
+CHART_THEMES = {
+    "dark": {"background": "#0e1117", "text": "#f5f5f5"},
+    "light": {"background": "#ffffff", "text": "#262730"},
+}
+DEFAULT_THEME = "dark"
+
+# Budget for serialized price figures, shared by every session
+FIGURE_CACHE_MB = float(os.environ.get("MARKETPULSE_FIGURE_CACHE_MB", "64"))
+
+
+def build_price_figure(bars, symbol=None, overlays=(), engine=None, width=CHART_WIDTH_PX, theme=DEFAULT_THEME):
+    colors = CHART_THEMES[theme]
+    engine = engine or IndicatorEngine()
+    panels = [name for name in overlays if INDICATORS[name].panel != "price"]
+    rows = 1 + len(panels)
+    fig = make_subplots(
+        rows=rows, cols=1, shared_xaxes=True, vertical_spacing=0.03,
+        row_heights=[0.6] + [0.4 / len(panels)] * len(panels) if panels else None,
+        specs=[[{"secondary_y": True}]] + [[{}]] * len(panels),
+    )
+
+    fig.add_trace(go.Candlestick(
+        x=bars.dates,
+        open=bars.open,
+        high=bars.high,
+        low=bars.low,
+        close=bars.close,
+        increasing_line_color='#00c39a',
+        decreasing_line_color='#ff4b4b',
+        name="Price"
+    ), row=1, col=1)
+
+    fig.add_trace(go.Bar(
+        x=bars.dates,
+        y=bars.volume,
+        name="Volume",
+        marker_color="rgba(0,195,154,0.15)",
+    ), row=1, col=1, secondary_y=True)
+
+    color = 0
+    for name in overlays:
+        row = 1 if INDICATORS[name].panel == "price" else 2 + panels.index(name)
+        for label, values in engine.get(symbol, name, bars).items():
+            if label == "Histogram":
+                fig.add_trace(go.Bar(x=bars.dates, y=values, name=label,
+                                     marker_color="rgba(160,160,160,0.4)"), row=row, col=1)
+                continue
+            keep = lttb(bars.dates, values, width // 2)
+            fig.add_trace(go.Scatter(x=bars.dates[keep], y=values[keep], name=label, mode="lines",
+                                     line=dict(width=1.2, color=OVERLAY_COLORS[color % len(OVERLAY_COLORS)])),
+                          row=row, col=1)
+            color += 1
+
+    fig.update_layout(
+        yaxis2=dict(showgrid=False),
+        margin=dict(l=20, r=20, t=40, b=20),
+        height=400 + 150 * len(panels),
+        plot_bgcolor=colors["background"],
+        paper_bgcolor=colors["background"],
+        font=dict(color=colors["text"]),
+        xaxis=dict(showgrid=False, rangeslider=dict(visible=not panels)),
+        yaxis=dict(showgrid=False),
+        showlegend=bool(overlays),
+    )
+    fig.update_xaxes(showgrid=False)
+    fig.update_yaxes(showgrid=False)
+    return fig
+
+
+def build_correlation_heatmap(corr):
+    # corr: square DataFrame of correlations
+    labels = list(corr.columns)
+    fig = go.Figure(go.Heatmap(
+        z=corr.to_numpy(), x=labels, y=labels, zmin=-1, zmax=1, colorscale="RdYlGn",
+        texttemplate="%{z:.2f}" if len(labels) <= 12 else None, hovertemplate="%{y} / %{x}: %{z:.2f}<extra></extra>",
+    ))
+    fig.update_layout(
+        margin=dict(l=20, r=20, t=20, b=20),
+        height=80 + 28 * len(labels),
+        plot_bgcolor="#0e1117",
+        paper_bgcolor="#0e1117",
+        font=dict(color="#f5f5f5"),
+        yaxis=dict(autorange="reversed"),
+    )
+    return fig
+
+
+def build_equity_figure(result, close=None, width=CHART_WIDTH_PX):
+    # Strategy equity (and buy & hold when close is given) over drawdown
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.03, row_heights=[0.7, 0.3])
+    keep = lttb(result.dates, result.equity, width // 2)
+    fig.add_trace(go.Scatter(x=result.dates[keep], y=result.equity[keep], name="Strategy", mode="lines",
+                             line=dict(width=1.5, color="#00c39a")), row=1, col=1)
+    if close is not None:
+        hold = close / close[0]
+        keep = lttb(result.dates, hold, width // 2)
+        fig.add_trace(go.Scatter(x=result.dates[keep], y=hold[keep], name="Buy & Hold", mode="lines",
+                                 line=dict(width=1, color="#9ad1d4", dash="dot")), row=1, col=1)
+    keep = lttb(result.dates, result.drawdown, width // 2)
+    fig.add_trace(go.Scatter(x=result.dates[keep], y=100 * result.drawdown[keep], name="Drawdown (%)", mode="lines",
+                             fill="tozeroy", line=dict(width=1, color="#ff4b4b")), row=2, col=1)
+    fig.update_layout(
+        margin=dict(l=20, r=20, t=20, b=20),
+        height=320,
+        plot_bgcolor="#0e1117",
+        paper_bgcolor="#0e1117",
+        font=dict(color="#f5f5f5"),
+        legend=dict(orientation="h", y=1.08),
+    )
+    fig.update_xaxes(showgrid=False)
+    fig.update_yaxes(showgrid=False)
+    return fig
+
+
+# ----------------- Serialized figure cache -----------------
+def serialize(fig):
+    # The JSON the browser receives (st.plotly_chart sends the same)
+    return pio.to_json(fig, validate=False).encode("utf-8")
+
+
+class PayloadFigure(go.Figure):
+    # A serialized figure in the shape st.plotly_chart accepts: it asks for
+    # to_dict() and re-encodes the plain dict, so the traces are never rebuilt
+    # or validated again (a dict argument would be). Only for display; copy
+    # with go.Figure(fig.to_dict()) to modify it.
+    def __init__(self, payload):
+        super().__init__()
+        self._payload = payload
+
+    def to_dict(self):
+        return json.loads(self._payload)
+
+
+def bars_stamp(bars):
+    # Changes when a bar is added or the last one is revised
+    n = len(bars.close)
+    return (n, bars.dates[-1], float(bars.close[-1])) if n else (0,)
+
+
+class FigureCache:
+    # Serialized price figures keyed by (symbol, period_days, resolution,
+    # theme, overlays), evicted least recently used once their total size
+    # passes maxbytes. Each view remembers the bars it was drawn from; when
+    # they change, every cached figure of that symbol is dropped.
+    def __init__(self, maxbytes=int(FIGURE_CACHE_MB * 2**20)):
+        self.cache = SizedLRUCache(maxbytes)
+        self.stamps = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.cache)
+
+    def payload(self, symbol, period_days, resolution, bars, build, theme=DEFAULT_THEME, overlays=()):
+        # build() -> go.Figure, called on a miss; returns the serialized bytes
+        view, stamp = (symbol, period_days, resolution), bars_stamp(bars)
+        with self._lock:
+            if self.stamps.get(view, stamp) != stamp:
+                self._invalidate(symbol)
+            self.stamps[view] = stamp
+        key = view + (theme, tuple(overlays))
+        payload = self.cache.get(key)
+        if payload is None:
+            # Built outside the lock; two sessions missing together both build
+            payload = serialize(build())
+            self.cache.put(key, payload)
+        return payload
+
+    def figure(self, *args, **kwargs):
+        # payload() wrapped for st.plotly_chart
+        return PayloadFigure(self.payload(*args, **kwargs))
+
+    def _invalidate(self, symbol):
+        if symbol is None:
+            self.stamps.clear()
+            self.cache.clear()
+            return
+        self.stamps = {view: stamp for view, stamp in self.stamps.items() if view[0] != symbol}
+        self.cache.invalidate(lambda key: key[0] == symbol)
+
+    def invalidate(self, symbol=None):
+        # New bars for symbol (or for everything) that did not come through payload()
+        with self._lock:
+            self._invalidate(symbol)
+
+    def stats(self):
+        return self.cache.stats()
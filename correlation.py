@@ -0,0 +1,167 @@
+# correlation.py
+# Rolling covariance and correlation of daily returns for a whole universe.
+#
+# The engine keeps the window's returns, their per-symbol sums and the cross
+# product matrix P = R'R. The first build fills P block by block (upper
+# triangle only, mirrored), so the temporary memory is one block pair. After
+# that a new day is a low-rank update: add the new row's outer product and
+# subtract the outer product of the row leaving the window, applied together
+# as one rank-two product. That is O(N) per symbol instead of recomputing P
+# from the whole window. Returns missing for a symbol on a day count as 0, so
+# short histories pull its correlations towards 0 rather than dropping days
+# for everyone.
+import numpy as np
+import pandas as pd
+
+from analytics import TRADING_DAYS
+
+BLOCK = 512
+
+
+class CorrelationEngine:
+    def __init__(self, symbols, window=TRADING_DAYS, block=BLOCK):
+        self.symbols = list(symbols)
+        self.position = {sym: i for i, sym in enumerate(self.symbols)}
+        self.window = window
+        self.block = block
+        n = len(self.symbols)
+        # Ring buffer of the window's returns; head is the oldest row
+        self.rows = np.zeros((window, n))
+        self.head = 0
+        self.count = 0
+        self.sums = np.zeros(n)
+        self.cross = np.zeros((n, n))
+        self.last_close = np.full(n, np.nan)
+        # Date of the newest day in the window, when built from bars
+        self.last_date = None
+        self.pushes = 0
+
+    @classmethod
+    def from_bars(cls, bars_of, window=TRADING_DAYS, block=BLOCK):
+        # bars_of: {symbol: Bars or None}; closes are aligned on their dates
+        closes = {sym: pd.Series(np.asarray(bars.close, dtype=np.float64)[-(window + 1):],
+                                 index=np.asarray(bars.dates)[-(window + 1):])
+                  for sym, bars in bars_of.items() if bars is not None and len(bars.close)}
+        engine = cls(list(bars_of), window, block)
+        if closes:
+            panel = pd.DataFrame(closes).sort_index().reindex(columns=engine.symbols).iloc[-(window + 1):]
+            engine.build(panel.pct_change(fill_method=None).to_numpy()[1:], panel.ffill().to_numpy()[-1])
+            engine.last_date = np.datetime64(panel.index[-1], "D")
+        return engine
+
+    # ----------------- Build -----------------
+    def build(self, returns, last_close=None):
+        # returns: (days, symbols); only the last `window` days are kept
+        returns = np.nan_to_num(np.asarray(returns, dtype=np.float64)[-self.window:])
+        days, n = returns.shape
+        self.rows[:] = 0.0
+        self.rows[:days] = returns
+        self.head = 0
+        self.pushes = 0
+        self.count = days
+        self.sums = returns.sum(axis=0)
+        for lo in range(0, n, self.block):
+            left = returns[:, lo:lo + self.block]
+            for hi in range(lo, n, self.block):
+                part = left.T @ returns[:, hi:hi + self.block]
+                self.cross[lo:lo + self.block, hi:hi + self.block] = part
+                self.cross[hi:hi + self.block, lo:lo + self.block] = part.T
+        if last_close is not None:
+            self.last_close = np.asarray(last_close, dtype=np.float64).copy()
+        return self
+
+    # ----------------- Updates -----------------
+    def push(self, returns):
+        # Add one day of returns (one per symbol), dropping the oldest day
+        # once the window is full
+        r = np.nan_to_num(np.asarray(returns, dtype=np.float64))
+        slot = (self.head + self.count) % self.window
+        if self.count == self.window:
+            # Add r r' and remove old old' together as one rank-two product
+            old = self.rows[self.head].copy()
+            self.sums -= old
+            left, right = np.stack([r, old], axis=1), np.stack([r, -old])
+            self.head = (self.head + 1) % self.window
+        else:
+            left, right = r[:, None], r[None, :]
+            self.count += 1
+        self.rows[slot] = r
+        self.sums += r
+        # Row blocks keep the temporary small and in cache
+        for lo in range(0, len(r), self.block):
+            self.cross[lo:lo + self.block] += left[lo:lo + self.block] @ right
+        # Adding and subtracting outer products drifts slowly; an exact
+        # rebuild once per window keeps the amortized cost per day the same
+        self.pushes += 1
+        if self.pushes >= self.window:
+            self.build(np.roll(self.rows, -self.head, axis=0)[:self.count])
+
+    def push_closes(self, closes):
+        # A new daily bar for every symbol: {symbol: close}; symbols without
+        # one keep their last close and get a 0 return
+        close = self.last_close.copy()
+        for sym, value in closes.items():
+            close[self.position[sym]] = value
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.push(close / self.last_close - 1)
+        self.last_close = np.where(np.isnan(close), self.last_close, close)
+
+    def push_bars(self, bars_of):
+        # Catch up from {symbol: Bars}: one push per day after last_date, in
+        # date order. Returns the number of days pushed.
+        if self.last_date is None:
+            return 0
+        days = {}
+        for sym, bars in bars_of.items():
+            if bars is None or sym not in self.position:
+                continue
+            dates = np.asarray(bars.dates).astype("M8[D]")
+            start = np.searchsorted(dates, self.last_date, side="right")
+            for day, close in zip(dates[start:].tolist(), np.asarray(bars.close[start:], dtype=np.float64).tolist()):
+                days.setdefault(day, {})[sym] = close
+        for day in sorted(days):
+            self.push_closes(days[day])
+            self.last_date = np.datetime64(day, "D")
+        return len(days)
+
+    # ----------------- Queries -----------------
+    def covariance(self, idx=None):
+        # Sample covariance over the window, for the symbols at positions idx
+        idx = np.arange(len(self.symbols)) if idx is None else np.asarray(idx)
+        n = self.count
+        if n < 2:
+            return np.full((len(idx), len(idx)), np.nan)
+        sums = self.sums[idx]
+        return (self.cross[np.ix_(idx, idx)] - np.outer(sums, sums) / n) / (n - 1)
+
+    def correlation(self, symbols=None):
+        # DataFrame for `symbols` (default: everyone); NaN where a symbol has no variance
+        symbols = self.symbols if symbols is None else [s for s in symbols if s in self.position]
+        idx = np.array([self.position[s] for s in symbols], dtype=np.int64)
+        cov = self.covariance(idx)
+        std = np.sqrt(np.diag(cov))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = cov / np.outer(std, std)
+        np.fill_diagonal(corr, np.where(std > 0, 1.0, np.nan))
+        return pd.DataFrame(np.clip(corr, -1.0, 1.0), index=symbols, columns=symbols)
+
+    def most_correlated(self, symbol, k=5, among=None):
+        # The k symbols whose returns move most with `symbol`: one row of the
+        # matrix, O(N)
+        i = self.position[symbol]
+        n = self.count
+        if n < 2:
+            return pd.Series(dtype=np.float64, name="Correlation")
+        cov = (self.cross[i] - self.sums[i] * self.sums / n) / (n - 1)
+        var = (np.diag(self.cross) - self.sums * self.sums / n) / (n - 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = cov / np.sqrt(var[i] * var)
+        others = np.ones(len(corr), dtype=bool)
+        others[i] = False
+        if among is not None:
+            keep = np.zeros(len(corr), dtype=bool)
+            keep[[self.position[s] for s in among if s in self.position]] = True
+            others &= keep
+        idx = np.flatnonzero(others & np.isfinite(corr))
+        top = idx[np.argsort(-corr[idx], kind="stable")[:k]]
+        return pd.Series(np.round(corr[top], 3), index=[self.symbols[j] for j in top], name="Correlation")
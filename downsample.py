@@ -0,0 +1,99 @@
+# downsample.py
+# Keep the number of points sent to Plotly / the Qt scene bounded: OHLCV bars
+# are resampled to a coarser resolution and line overlays are thinned with
+# Largest-Triangle-Three-Buckets (LTTB).
+import numpy as np
+
+from ohlcv_store import Bars
+
+# Finest to coarsest; the first one that fits the pixel budget wins
+RESOLUTIONS = ("1min", "5min", "15min", "60min", "D", "W", "M")
+_MINUTES = {"1min": 1, "5min": 5, "15min": 15, "60min": 60}
+
+# Narrowest candle that is still readable
+MIN_PX_PER_CANDLE = 4
+
+
+def period_keys(dates, resolution):
+    dates = np.asarray(dates)
+    if resolution in _MINUTES:
+        return dates.astype("M8[m]").astype(np.int64) // _MINUTES[resolution]
+    days = dates.astype("M8[D]").astype(np.int64)
+    if resolution == "D":
+        return days
+    if resolution == "W":
+        # 1970-01-01 was a Thursday; shift so weeks start on Monday
+        return (days + 3) // 7
+    if resolution == "M":
+        return dates.astype("M8[M]").astype(np.int64)
+    raise ValueError(f"unknown resolution {resolution!r}")
+
+
+def resample(bars, resolution):
+    # Bars must be date-sorted. Each output bar is dated by its first input bar.
+    if len(bars.dates) == 0:
+        return bars
+    keys = period_keys(bars.dates, resolution)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1))
+    if len(starts) == len(keys):
+        return bars
+    ends = np.concatenate((starts[1:], [len(keys)])) - 1
+    return Bars(
+        np.asarray(bars.dates)[starts],
+        np.asarray(bars.open)[starts],
+        np.maximum.reduceat(bars.high, starts),
+        np.minimum.reduceat(bars.low, starts),
+        np.asarray(bars.close)[ends],
+        None if bars.volume is None else np.add.reduceat(bars.volume, starts),
+    )
+
+
+def choose_resolution(dates, pixel_width, native="D"):
+    # Finest resolution, no finer than the data itself, whose bar count fits
+    budget = max(1, pixel_width // MIN_PX_PER_CANDLE)
+    if len(dates) <= budget:
+        return native
+    first, last = np.asarray(dates)[[0, -1]]
+    for resolution in RESOLUTIONS[RESOLUTIONS.index(native):]:
+        keys = period_keys(np.array([first, last]), resolution)
+        if keys[1] - keys[0] + 1 <= budget:
+            return resolution
+    return RESOLUTIONS[-1]
+
+
+def for_view(bars, pixel_width, native="D"):
+    resolution = choose_resolution(bars.dates, pixel_width, native)
+    return resolution, (bars if resolution == native else resample(bars, resolution))
+
+
+# ----------------- LTTB -----------------
+def lttb(x, y, n_out):
+    # Indices of the n_out points that best preserve the visual shape of y(x).
+    # NaNs (indicator warm-up) are dropped first.
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    ok = np.flatnonzero(np.isfinite(y))
+    n = len(ok)
+    if n_out >= n or n_out < 3:
+        return ok
+    xs = x[ok].astype(np.float64)
+    ys = y[ok]
+    # Bucket edges for the n - 2 interior points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Average point of every bucket, computed up front from prefix sums
+    cx, cy = np.concatenate(([0.0], np.cumsum(xs))), np.concatenate(([0.0], np.cumsum(ys)))
+    nxt_lo = np.append(edges[1:-1], n - 1)
+    nxt_hi = np.append(edges[2:], n)
+    counts = nxt_hi - nxt_lo
+    avg_x = (cx[nxt_hi] - cx[nxt_lo]) / counts
+    avg_y = (cy[nxt_hi] - cy[nxt_lo]) / counts
+    picked = np.empty(n_out, dtype=np.int64)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        area = np.abs((xs[a] - avg_x[b]) * (ys[lo:hi] - ys[a])
+                      - (xs[a] - xs[lo:hi]) * (avg_y[b] - ys[a]))
+        a = lo + int(np.argmax(area))
+        picked[b + 1] = a
+    return ok[picked]
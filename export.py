@@ -0,0 +1,274 @@
+# export.py
+# Bulk export of price history, financial statements and peer tables to CSV,
+# Parquet or XLSX, for one company or the whole universe:
+#   python export.py out_dir [--symbols "Tata Motors" ...] [--format csv]
+#                            [--datasets ohlcv statements peers] [--workers N]
+#
+# Every (dataset, symbol) pair goes to its own file, out_dir/<dataset>/<symbol>.<ext>,
+# written by a pool of threads. Each file is streamed in chunks of CHUNK_ROWS
+# rows (a CSV block, a Parquet row group, rows of a write-only worksheet), so
+# memory stays at a few chunks per worker however large the universe is.
+import argparse
+import hashlib
+import os
+import re
+import zipfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pcsv
+    import pyarrow.parquet as pq
+except ImportError:  # CSV (through pandas) and XLSX still work
+    pa = pcsv = pq = None
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # CSV and Parquet still work
+    Workbook = None
+
+from providers.base import STATEMENT_NAMES
+
+CHUNK_ROWS = 65_536
+# Excel's limit; longer exports continue on another sheet
+XLSX_MAX_ROWS = 1_048_576
+EXPORT_DIR = os.environ.get("MARKETPULSE_EXPORT_DIR", "data/exports")
+# Written as dates, not midnight timestamps
+DATE_COLUMNS = ("date",)
+
+
+def _arrow(chunk):
+    table = pa.Table.from_pandas(chunk, preserve_index=False)
+    for name in DATE_COLUMNS:
+        if name in table.column_names and pa.types.is_timestamp(table.schema.field(name).type):
+            table = table.set_column(table.column_names.index(name), name, table[name].cast(pa.date32()))
+    return table.replace_schema_metadata(None)
+
+
+# ----------------- Sinks -----------------
+class CSVSink:
+    # pyarrow formats numbers an order of magnitude faster than to_csv
+    ext = "csv"
+    label = "CSV"
+
+    def __init__(self, path, title=None):
+        self.path = path
+        self.writer = None
+        self.schema = None
+        self.file = None if pa is not None else open(path, "w", newline="", encoding="utf-8")
+
+    def write(self, chunk):
+        if self.file is not None:
+            chunk.to_csv(self.file, header=self.file.tell() == 0, index=False, date_format="%Y-%m-%d")
+            return
+        table = _arrow(chunk)
+        if self.writer is None:
+            self.schema = table.schema
+            self.writer = pcsv.CSVWriter(self.path, self.schema,
+                                         write_options=pcsv.WriteOptions(quoting_style="needed"))
+        self.writer.write_table(table.cast(self.schema))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        if self.file is not None:
+            self.file.close()
+
+
+class ParquetSink:
+    ext = "parquet"
+    label = "Parquet"
+
+    def __init__(self, path, title=None):
+        if pq is None:
+            raise ImportError("pyarrow is required for Parquet exports (pip install pyarrow)")
+        self.path = path
+        self.writer = None
+
+    def write(self, chunk):
+        # One row group per chunk; the first chunk fixes the schema
+        table = _arrow(chunk)
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table.cast(self.writer.schema))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class XLSXSink:
+    # title names the worksheet
+    ext = "xlsx"
+    label = "Excel (XLSX)"
+
+    def __init__(self, path, title="Sheet"):
+        if Workbook is None:
+            raise ImportError("openpyxl is required for XLSX exports (pip install openpyxl)")
+        self.path = path
+        self.title = title
+        # Write-only: rows go to a temporary file instead of staying in memory
+        self.book = Workbook(write_only=True)
+        self.sheet = None
+        self.rows = 0
+        self.columns = None
+
+    def _new_sheet(self):
+        count = len(self.book.worksheets)
+        self.sheet = self.book.create_sheet(self.title if count == 0 else f"{self.title} ({count + 1})")
+        self.sheet.append(self.columns)
+        self.rows = 1
+
+    def write(self, chunk):
+        if self.columns is None:
+            self.columns = [str(c) for c in chunk.columns]
+        for row in chunk.itertuples(index=False):
+            if self.sheet is None or self.rows >= XLSX_MAX_ROWS:
+                self._new_sheet()
+            self.sheet.append([None if isinstance(v, float) and np.isnan(v) else v for v in row])
+            self.rows += 1
+
+    def close(self):
+        if self.sheet is None:
+            self.book.create_sheet(self.title)
+        self.book.save(self.path)
+
+
+SINKS = {"csv": CSVSink, "parquet": ParquetSink, "xlsx": XLSXSink}
+
+
+# ----------------- Datasets -----------------
+def ohlcv_chunks(data, symbol, chunk_rows=CHUNK_ROWS):
+    # Slices of the bars (memory-mapped when they come from the store)
+    bars = data.daily_bars(symbol)
+    if bars is None:
+        return
+    for lo in range(0, len(bars.close), chunk_rows):
+        hi = min(lo + chunk_rows, len(bars.close))
+        yield pd.DataFrame({
+            "symbol": symbol,
+            "date": np.asarray(bars.dates[lo:hi], dtype="M8[D]").astype("M8[ms]"),
+            "open": bars.open[lo:hi],
+            "high": bars.high[lo:hi],
+            "low": bars.low[lo:hi],
+            "close": bars.close[lo:hi],
+            "volume": np.zeros(hi - lo, dtype=np.int64) if bars.volume is None else bars.volume[lo:hi],
+        })
+
+
+def statement_chunks(data, symbol, chunk_rows=CHUNK_ROWS):
+    # One long chunk per statement: symbol, statement, item, period, value
+    for name in STATEMENT_NAMES:
+        frame = data.statement(symbol, name)
+        if frame is None or frame.empty:
+            continue
+        long = frame.melt(id_vars="", var_name="period", value_name="value").rename(columns={"": "item"})
+        long["value"] = pd.to_numeric(long["value"], errors="coerce").astype(np.float64)
+        yield long.assign(symbol=symbol, statement=name)[["symbol", "statement", "item", "period", "value"]]
+
+
+def peer_chunks(data, symbol, chunk_rows=CHUNK_ROWS):
+    frame = data.peers(symbol)
+    if frame is not None and not frame.empty:
+        yield frame.assign(symbol=symbol)[["symbol"] + list(frame.columns)]
+
+
+DATASETS = {"ohlcv": ohlcv_chunks, "statements": statement_chunks, "peers": peer_chunks}
+
+
+# ----------------- Pipeline -----------------
+def file_name(symbol):
+    return re.sub(r"[^\w.-]+", "_", symbol).strip("_") or "_"
+
+
+def file_names(symbols):
+    # file_name per symbol, plus a short hash of the symbol where two would
+    # share a file ("M&M" and "M & M"; case-insensitive file systems too)
+    names = {symbol: file_name(symbol) for symbol in symbols}
+    counts = Counter(name.casefold() for name in names.values())
+    return {symbol: name if counts[name.casefold()] == 1
+            else f"{name}-{hashlib.blake2b(symbol.encode('utf-8'), digest_size=4).hexdigest()}"
+            for symbol, name in names.items()}
+
+
+def export_symbol(data, symbol, out_dir, datasets=tuple(DATASETS), fmt="csv", chunk_rows=CHUNK_ROWS, name=None):
+    # Writes one file per dataset that has data, named `name` (default
+    # file_name(symbol)); returns their paths
+    sink_cls = SINKS[fmt]
+    name = name or file_name(symbol)
+    paths = []
+    for dataset in datasets:
+        os.makedirs(os.path.join(out_dir, dataset), exist_ok=True)
+        path = os.path.join(out_dir, dataset, f"{name}.{sink_cls.ext}")
+        tmp = path + ".tmp"
+        sink = None
+        try:
+            for chunk in DATASETS[dataset](data, symbol, chunk_rows):
+                if sink is None:
+                    sink = sink_cls(tmp, dataset)
+                sink.write(chunk)
+        finally:
+            if sink is not None:
+                sink.close()
+        # Readers only ever see complete files; a failed write leaves the .tmp
+        if sink is not None:
+            os.replace(tmp, path)
+            paths.append(path)
+    return paths
+
+
+def export_iter(data, out_dir, symbols=None, datasets=tuple(DATASETS), fmt="csv", workers=None,
+                chunk_rows=CHUNK_ROWS):
+    # Yields (symbol, paths) as each company finishes; symbols=None exports
+    # the whole universe
+    if fmt not in SINKS:
+        raise ValueError(f"unknown format {fmt!r}; expected one of {', '.join(SINKS)}")
+    unknown = set(datasets) - set(DATASETS)
+    if unknown:
+        raise ValueError(f"unknown datasets {', '.join(sorted(unknown))}; expected {', '.join(DATASETS)}")
+    # Once each, under names no other symbol shares, so no two workers ever
+    # write the same file
+    symbols = list(dict.fromkeys(data.companies() if symbols is None else symbols))
+    names = file_names(symbols)
+    workers = workers or min(8, (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(workers) as pool:
+        futures = {pool.submit(export_symbol, data, s, out_dir, datasets, fmt, chunk_rows, names[s]): s
+                   for s in symbols}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def export(data, out_dir, symbols=None, datasets=tuple(DATASETS), fmt="csv", workers=None,
+           chunk_rows=CHUNK_ROWS):
+    # Paths of every file written
+    return [path for _, paths in export_iter(data, out_dir, symbols, datasets, fmt, workers, chunk_rows)
+            for path in paths]
+
+
+def zip_files(paths, root, zip_path):
+    # One archive for downloading; files are copied in blocks, not loaded whole
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for path in paths:
+            archive.write(path, os.path.relpath(path, root))
+    return zip_path
+
+
+if __name__ == "__main__":
+    from providers import default_market_data
+
+    parser = argparse.ArgumentParser(description="Export MarketPulse data to CSV, Parquet or XLSX.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--symbols", nargs="+", help="companies to export (default: all)")
+    parser.add_argument("--format", default="csv", choices=list(SINKS))
+    parser.add_argument("--datasets", nargs="+", default=list(DATASETS), choices=list(DATASETS))
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+    written = 0
+    for symbol, paths in export_iter(default_market_data(), args.out_dir, args.symbols, args.datasets,
+                                     args.format, args.workers):
+        written += len(paths)
+    print(f"{written} files -> {args.out_dir}")
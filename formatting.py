@@ -0,0 +1,44 @@
+# formatting.py
+# Display strings shared by both front ends. Numbers use Indian digit
+# grouping (2,57,980 rather than 257,980) and are cached: across a universe
+# the same prices, ratios and percentages come up again and again.
+import math
+from functools import lru_cache
+
+MISSING = "-"
+
+
+def _missing(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+@lru_cache(maxsize=65536)
+def _indian(value, decimals):
+    text = f"{abs(value):.{decimals}f}"
+    whole, _, frac = text.partition(".")
+    frac = frac.rstrip("0")
+    if len(whole) > 3:
+        # Last three digits, then groups of two: 12,34,56,789
+        head, tail = whole[:-3], whole[-3:]
+        whole = ",".join([head[max(0, i - 2):i] for i in range(len(head), 0, -2)][::-1] + [tail])
+    sign = "-" if value < 0 and (whole.strip("0,") or frac) else ""
+    return sign + whole + ("." + frac if frac else "")
+
+
+def format_indian(value, decimals=2):
+    # 257980 -> "2,57,980"; 1234.5 -> "1,234.5"; None / NaN -> "-"
+    return MISSING if _missing(value) else _indian(float(value), decimals)
+
+
+def format_crore(value):
+    # Amounts already in crore: 257980 -> "2,57,980 Cr"
+    return MISSING if _missing(value) else f"{_indian(float(value), 0)} Cr"
+
+
+def format_percent(value, decimals=2):
+    return MISSING if _missing(value) else f"{_indian(float(value), decimals)}%"
+
+
+def format_range(high, low):
+    # 52-week range, high first: "948 / 536"
+    return f"{format_indian(high)} / {format_indian(low)}"
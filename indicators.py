@@ -0,0 +1,213 @@
+# indicators.py
+# Vectorized technical indicators over OHLCV arrays.
+#
+# Every function takes 1-D arrays (one symbol) or 2-D arrays shaped
+# (bars, symbols) for a whole universe, and returns arrays of the same shape
+# with NaN until the lookback window is full. Leading NaNs (symbols listed
+# later than others) delay the window per column; gaps are forward-filled.
+from collections import namedtuple
+
+import numpy as np
+
+from cache import LRUCache
+
+# Largest growth factor allowed inside one EWM block (see _ewm)
+_EWM_RANGE = 1e6
+
+
+# ----------------- Building blocks -----------------
+def _prepare(x):
+    a = np.asarray(x, dtype=np.float64)
+    a = a.reshape(len(a), -1)
+    rows = len(a)
+    valid = ~np.isnan(a)
+    start = np.where(valid.any(axis=0), valid.argmax(axis=0), rows)
+    gaps = np.flatnonzero(~valid.all(axis=0))
+    if len(gaps) == 0:
+        return a, start
+    head = int(start.min())
+    if head < rows and valid[head:].all():
+        # Common case: every column starts on the same row (e.g. an indicator
+        # of an indicator), so only the leading rows need a value
+        a = a.copy()
+        a[:head] = a[head]
+        return a, start
+    # Only columns with NaNs are filled: gaps carry the last value forward,
+    # the leading run takes the first valid value
+    sub = a[:, gaps]
+    idx = np.where(valid[:, gaps], np.arange(rows)[:, None], 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    sub = sub[idx, np.arange(len(gaps))]
+    first = a[np.minimum(start[gaps], rows - 1), gaps]
+    sub = np.where(np.arange(rows)[:, None] < start[gaps], first, sub)
+    a = a.copy()
+    a[:, gaps] = sub
+    return a, start
+
+
+def _finish(out, start, warmup, x):
+    cut = start + warmup - 1
+    if np.all(cut == cut[0]):
+        out[:cut[0]] = np.nan
+    else:
+        out[np.arange(len(out))[:, None] < cut] = np.nan
+    return out.reshape(np.shape(x))
+
+
+def _window_sum(c, n):
+    # Turn a running sum into sums over the trailing n rows
+    out = np.empty_like(c)
+    out[:n] = c[:n]
+    np.subtract(c[n:], c[:-n], out=out[n:])
+    return out
+
+
+def _rolling_sums(f, n, squares=False):
+    # Windowed sums of (f - shift), and optionally of its square; the
+    # per-column shift keeps the subtraction well conditioned
+    shift = f[0]
+    dev = f - shift
+    s1 = _window_sum(np.cumsum(dev, axis=0), n)
+    if not squares:
+        return shift, s1, None
+    np.multiply(dev, dev, out=dev)
+    return shift, s1, _window_sum(np.cumsum(dev, axis=0), n)
+
+
+def _ewm(f, alpha):
+    # y[t] = y[t-1] + alpha * (x[t] - y[t-1]), seeded with x[0]. Inside a block
+    # of k bars the recursion has the closed form
+    #   y[k] = d^(k+1) * y_prev + alpha * d^k * cumsum(x[s] * d^-s)
+    # with d = 1 - alpha; blocks are sized so d^-k stays below _EWM_RANGE, which
+    # leaves a Python loop over blocks, never over bars.
+    d = 1.0 - alpha
+    if d <= 0:
+        return f.copy()
+    rows = len(f)
+    block = int(max(1, min(rows, np.log(_EWM_RANGE) / -np.log(d))))
+    k = np.arange(block, dtype=np.float64)[:, None]
+    grow, decay = d ** -k, d ** k
+    out = np.empty_like(f)
+    prev = f[0]
+    for lo in range(0, rows, block):
+        x = f[lo:lo + block]
+        m = len(x)
+        y = decay[:m] * (d * prev + alpha * np.cumsum(x * grow[:m], axis=0))
+        out[lo:lo + block] = y
+        prev = y[-1]
+    return out
+
+
+def sma(x, n=20):
+    f, start = _prepare(x)
+    shift, s1, _ = _rolling_sums(f, n)
+    s1 /= n
+    s1 += shift
+    return _finish(s1, start, n, x)
+
+
+def ema(x, n=20):
+    f, start = _prepare(x)
+    return _finish(_ewm(f, 2.0 / (n + 1)), start, n, x)
+
+
+def wilder(x, n=14):
+    f, start = _prepare(x)
+    return _finish(_ewm(f, 1.0 / n), start, n, x)
+
+
+def true_range(high, low, close):
+    high, low, close = (np.asarray(a, dtype=np.float64) for a in (high, low, close))
+    prev = np.empty_like(close)
+    prev[0] = np.nan
+    prev[1:] = close[:-1]
+    return np.fmax(high - low, np.fmax(np.abs(high - prev), np.abs(low - prev)))
+
+
+# ----------------- Indicators -----------------
+def rsi(close, n=14):
+    close = np.asarray(close, dtype=np.float64)
+    delta = np.diff(close, axis=0)
+    gain = wilder(np.maximum(delta, 0.0), n)
+    loss = wilder(np.maximum(-delta, 0.0), n)
+    out = np.full(close.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[1:] = np.where(loss == 0, 100.0, 100.0 - 100.0 / (1.0 + gain / loss))
+    out[1:][np.isnan(loss)] = np.nan
+    return out
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    line = ema(close, fast) - ema(close, slow)
+    sig = ema(line, signal)
+    return line, sig, line - sig
+
+
+def bollinger(close, n=20, k=2.0):
+    f, start = _prepare(close)
+    shift, s1, s2 = _rolling_sums(f, n, squares=True)
+    mean = s1 / n
+    std = np.sqrt(np.maximum(s2 / n - mean * mean, 0.0))
+    mid = _finish(mean + shift, start, n, close)
+    width = k * std.reshape(np.shape(close))
+    return mid, mid + width, mid - width
+
+
+def vwap(high, low, close, volume, n=None):
+    # Cumulative VWAP over the loaded range, or rolling over n bars
+    typical = (np.asarray(high, dtype=np.float64) + low + close) / 3.0
+    volume = np.asarray(volume, dtype=np.float64)
+    pv = np.cumsum(typical * volume, axis=0)
+    vol = np.cumsum(volume, axis=0)
+    if n is not None:
+        pv[n:] = pv[n:] - pv[:-n]
+        vol[n:] = vol[n:] - vol[:-n]
+        pv[:n - 1] = np.nan
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return pv / vol
+
+
+def atr(high, low, close, n=14):
+    return wilder(true_range(high, low, close), n)
+
+
+# ----------------- Registry -----------------
+# panel "price" draws on the candlestick axes, anything else gets its own pane
+Indicator = namedtuple("Indicator", ["func", "inputs", "params", "outputs", "panel"])
+
+INDICATORS = {
+    "SMA": Indicator(sma, ("close",), {"n": 20}, ("SMA",), "price"),
+    "EMA": Indicator(ema, ("close",), {"n": 20}, ("EMA",), "price"),
+    "Bollinger": Indicator(bollinger, ("close",), {"n": 20, "k": 2.0}, ("BB Mid", "BB Upper", "BB Lower"), "price"),
+    "VWAP": Indicator(vwap, ("high", "low", "close", "volume"), {}, ("VWAP",), "price"),
+    "RSI": Indicator(rsi, ("close",), {"n": 14}, ("RSI",), "RSI"),
+    "MACD": Indicator(macd, ("close",), {"fast": 12, "slow": 26, "signal": 9}, ("MACD", "Signal", "Histogram"), "MACD"),
+    "ATR": Indicator(atr, ("high", "low", "close"), {"n": 14}, ("ATR",), "ATR"),
+}
+
+
+def available(bars):
+    # Indicators whose inputs are present (the Qt dummy data has no volume)
+    return [name for name, ind in INDICATORS.items()
+            if all(getattr(bars, field) is not None for field in ind.inputs)]
+
+
+def compute(name, bars, **params):
+    ind = INDICATORS[name]
+    result = ind.func(*(getattr(bars, field) for field in ind.inputs), **{**ind.params, **params})
+    if not isinstance(result, tuple):
+        result = (result,)
+    return dict(zip(ind.outputs, result))
+
+
+class IndicatorEngine:
+    # Results are memoized per (symbol, indicator, params) and the identity of
+    # the bars they were computed from, so a new bar or period misses cleanly
+    def __init__(self, maxsize=512):
+        self.cache = LRUCache(maxsize)
+
+    def get(self, symbol, name, bars, **params):
+        dates = bars.dates
+        span = (len(dates), str(dates[0]), str(dates[-1])) if len(dates) else (0,)
+        key = (symbol, name, tuple(sorted({**INDICATORS[name].params, **params}.items())), span)
+        return self.cache.get_or_set(key, lambda: compute(name, bars, **params))
@@ -0,0 +1,149 @@
+# lazy_widgets.py
+# Deferred construction for the Qt dashboard. Sections below the fold and
+# inactive tabs start as empty placeholders and call their builder the first
+# time they become visible, so the window paints after the header, metrics
+# and chart are built regardless of how much data the other sections load.
+from PyQt6.QtCore import QCoreApplication, QEvent, QObject, QPoint, Qt, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QLabel, QLayout, QTabWidget, QVBoxLayout, QWidget
+
+# Build sections this many pixels before they scroll into the viewport
+PREFETCH_PX = 200
+
+
+def _as_widget(content):
+    if isinstance(content, QLayout):
+        widget = QWidget()
+        widget.setLayout(content)
+        content.setContentsMargins(0, 0, 0, 0)
+        return widget
+    return content
+
+
+class LoadingPlaceholder(QWidget):
+    # Stands in for a widget whose data is still loading; set_content swaps
+    # the real widget (or layout) in, set_error shows why it never arrived
+    def __init__(self, text="Loading…", height=0, parent=None):
+        super().__init__(parent)
+        self.content = None
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.label = QLabel(text)
+        self.label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.label.setProperty("role", "placeholder")
+        layout.addWidget(self.label)
+        self.setMinimumHeight(height)
+
+    def set_content(self, content):
+        self.content = content
+        widget = _as_widget(content)
+        self.label.hide()
+        self.layout().addWidget(widget)
+        widget.show()
+        self.setMinimumHeight(0)
+        return content
+
+    def set_error(self, message):
+        self.label.setText(f"Could not load: {message}")
+
+
+class LazySection(QWidget):
+    built = pyqtSignal(object)
+
+    def __init__(self, build, placeholder_height=200, parent=None):
+        super().__init__(parent)
+        self.build = build
+        self.placeholder_height = placeholder_height
+        self.content = None
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        # Reserve roughly the final height so the scroll range is stable
+        self.setMinimumHeight(placeholder_height)
+
+    def is_built(self):
+        return self.content is not None
+
+    def ensure_built(self):
+        if self.content is None:
+            self.content = self.build()
+            widget = _as_widget(self.content)
+            self.layout().addWidget(widget)
+            # Show now rather than on the next event loop pass so the size
+            # hints are right for the scroll watcher
+            widget.show()
+            self.setMinimumHeight(0)
+            self.built.emit(self.content)
+        return self.content
+
+    def reset(self):
+        # Drop the content; it is rebuilt the next time the section is shown
+        if self.content is None:
+            return
+        layout = self.layout()
+        while layout.count():
+            layout.takeAt(0).widget().deleteLater()
+        self.content = None
+        self.setMinimumHeight(self.placeholder_height)
+
+
+class LazyScrollWatcher(QObject):
+    # Builds LazySections of a QScrollArea as they come within PREFETCH_PX of
+    # the viewport; checked on scroll and whenever the viewport or the scrolled
+    # widget is resized (which is also when the first layout lands)
+    def __init__(self, scroll_area, sections=()):
+        super().__init__(scroll_area)
+        self.scroll_area = scroll_area
+        self.sections = list(sections)
+        scroll_area.verticalScrollBar().valueChanged.connect(self.check)
+        scroll_area.viewport().installEventFilter(self)
+        scroll_area.widget().installEventFilter(self)
+
+    def add(self, section):
+        self.sections.append(section)
+        self.check()
+
+    def eventFilter(self, obj, event):
+        if event.type() in (QEvent.Type.Resize, QEvent.Type.Show):
+            QTimer.singleShot(0, self.check)
+        return False
+
+    def check(self, *_):
+        viewport = self.scroll_area.viewport()
+        if not viewport.isVisible():
+            return
+        # Settle pending layouts so positions account for sections built so far
+        QCoreApplication.sendPostedEvents(None, QEvent.Type.LayoutRequest.value)
+        bottom = viewport.height() + PREFETCH_PX
+        for section in self.sections:
+            if section.is_built() or not section.isVisibleTo(self.scroll_area):
+                continue
+            top = section.mapTo(viewport, QPoint(0, 0)).y()
+            if top < bottom and top + section.height() > -PREFETCH_PX:
+                section.ensure_built()
+                QCoreApplication.sendPostedEvents(None, QEvent.Type.LayoutRequest.value)
+
+
+class LazyTabWidget(QTabWidget):
+    # Each tab is a LazySection; only the current one is built
+    tab_built = pyqtSignal(str, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.currentChanged.connect(self.ensure_tab)
+
+    def add_lazy_tab(self, name, build, placeholder_height=0):
+        section = LazySection(build, placeholder_height)
+        section.built.connect(lambda content, name=name: self.tab_built.emit(name, content))
+        return self.addTab(section, name)
+
+    def ensure_tab(self, index):
+        section = self.widget(index)
+        if isinstance(section, LazySection):
+            section.ensure_built()
+
+    def ensure_current(self):
+        self.ensure_tab(self.currentIndex())
+
+    def reset(self):
+        for i in range(self.count()):
+            self.widget(i).reset()
+        self.ensure_current()
@@ -0,0 +1,202 @@
+# live_feed.py
+# Live mode: a tick stream folded into the current bar of every symbol.
+#
+# A TickTape is a recorded stream as parallel arrays sorted by time. replay()
+# plays it back on asyncio in small batches (a local stand-in for a market
+# data socket), and BarAggregator folds each batch into per-symbol bar arrays
+# with a handful of ufunc.at calls, so a batch costs the same whether it holds
+# one tick or hundreds. Front ends poll LiveFeed.snapshot() and patch only the
+# last candle of their chart.
+import asyncio
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from price_history import stable_seed
+
+TickTape = namedtuple("TickTape", ["symbols", "ts", "symbol", "price", "size"])
+# start is the bar's bucket start in epoch seconds; seq changes on every
+# update and bar_seq only when a new bar is opened
+LiveBar = namedtuple("LiveBar", ["start", "open", "high", "low", "close", "volume", "seq", "bar_seq"])
+
+DAY = 86400
+BATCH_MS = 50
+
+
+# ----------------- Recorded ticks -----------------
+def synthetic_tape(last_prices, seconds=900, rate=300, start=None):
+    # `rate` ticks per second spread across all symbols, each a small random
+    # walk around its last price; identical in every process
+    symbols = list(last_prices)
+    n = int(seconds * rate)
+    rng = np.random.default_rng(stable_seed("|".join(symbols)))
+    start = time.time() if start is None else start
+    ts = start + np.sort(rng.uniform(0, seconds, n))
+    sym = rng.integers(0, len(symbols), n).astype(np.int32)
+    steps = rng.normal(0, 0.0004, n)
+    price = np.empty(n)
+    for i, name in enumerate(symbols):
+        mask = sym == i
+        price[mask] = last_prices[name] * np.exp(np.cumsum(steps[mask]))
+    size = rng.integers(1, 500, n).astype(np.int64)
+    return TickTape(symbols, ts, sym, price, size)
+
+
+def load_tape(path):
+    # CSV with columns symbol, ts (epoch seconds or a timestamp), price, size
+    frame = pd.read_csv(path)
+    ts = frame["ts"]
+    if not np.issubdtype(ts.dtype, np.number):
+        ts = pd.to_datetime(ts).astype("int64") / 1e9
+    frame = frame.assign(ts=ts).sort_values("ts", kind="stable")
+    codes, symbols = pd.factorize(frame["symbol"])
+    return TickTape(list(symbols), frame["ts"].to_numpy(np.float64), codes.astype(np.int32),
+                    frame["price"].to_numpy(np.float64), frame["size"].to_numpy(np.int64))
+
+
+async def replay(tape, speed=1.0, batch_ms=BATCH_MS, shift=True):
+    # Yields (ts, symbol, price, size) array slices. With shift the tape is
+    # moved so its first tick happens now; speed > 1 plays it faster.
+    ts = tape.ts
+    if len(ts) == 0:
+        return
+    offset = time.time() - ts[0] if shift else 0.0
+    clock0 = time.monotonic()
+    step = batch_ms / 1000.0 * speed
+    lo = 0
+    while lo < len(ts):
+        upto = ts[0] + (time.monotonic() - clock0) * speed + step
+        hi = int(np.searchsorted(ts, upto, side="right"))
+        if hi > lo:
+            yield ts[lo:hi] + offset, tape.symbol[lo:hi], tape.price[lo:hi], tape.size[lo:hi]
+            lo = hi
+        await asyncio.sleep(batch_ms / 1000.0)
+
+
+# ----------------- Aggregation -----------------
+class BarAggregator:
+    def __init__(self, symbols, interval=DAY):
+        self.symbols = list(symbols)
+        self.index = {name: i for i, name in enumerate(self.symbols)}
+        self.interval = interval
+        n = len(self.symbols)
+        self.start = np.full(n, -np.inf)
+        self.open = np.full(n, np.nan)
+        self.high = np.full(n, np.nan)
+        self.low = np.full(n, np.nan)
+        self.close = np.full(n, np.nan)
+        self.volume = np.zeros(n, dtype=np.int64)
+        self.seq = np.zeros(n, dtype=np.int64)
+        self.bar_seq = np.zeros(n, dtype=np.int64)
+        # Ticks are multiplied by this, so a tape can drive a chart whose
+        # history came from elsewhere (see seed)
+        self.scale = np.ones(n)
+
+    def seed(self, symbol, start, open_, high, low, close, volume=0, first_price=None):
+        # Continue from the last historical bar instead of opening a new one
+        i = self.index[symbol]
+        self.start[i] = start // self.interval * self.interval
+        self.open[i], self.high[i], self.low[i], self.close[i] = open_, high, low, close
+        self.volume[i] = volume or 0
+        if first_price:
+            self.scale[i] = close / first_price
+
+    def update(self, ts, sym, price, size):
+        # One batch, time-sorted. Returns the indices of symbols that changed.
+        price = price * self.scale[sym]
+        buckets = ts // self.interval * self.interval
+        # A batch rarely crosses a bar boundary; split it where it does
+        cuts = np.flatnonzero(np.diff(buckets)) + 1
+        for lo, hi in zip(np.concatenate(([0], cuts)), np.concatenate((cuts, [len(ts)]))):
+            self._fold(buckets[lo], sym[lo:hi], price[lo:hi], size[lo:hi])
+        changed = np.unique(sym)
+        self.seq[changed] += 1
+        return changed
+
+    def _fold(self, bucket, sym, price, size):
+        names, first = np.unique(sym, return_index=True)
+        last = len(sym) - 1 - np.unique(sym[::-1], return_index=True)[1]
+        rolled = names[self.start[names] < bucket]
+        if len(rolled):
+            self.start[rolled] = bucket
+            self.high[rolled] = -np.inf
+            self.low[rolled] = np.inf
+            self.volume[rolled] = 0
+            self.open[rolled] = price[first[np.isin(names, rolled)]]
+            self.bar_seq[rolled] += 1
+        np.maximum.at(self.high, sym, price)
+        np.minimum.at(self.low, sym, price)
+        np.add.at(self.volume, sym, size)
+        self.close[names] = price[last]
+
+    def bar(self, symbol):
+        i = self.index.get(symbol)
+        if i is None or not np.isfinite(self.start[i]):
+            return None
+        return LiveBar(float(self.start[i]), float(self.open[i]), float(self.high[i]), float(self.low[i]),
+                       float(self.close[i]), int(self.volume[i]), int(self.seq[i]), int(self.bar_seq[i]))
+
+
+# ----------------- Feed -----------------
+class LiveFeed:
+    # Replays a tape on a background asyncio loop; readers take snapshots
+    # under a lock from any thread
+    def __init__(self, tape, interval=DAY, speed=1.0):
+        self.tape = tape
+        self.speed = speed
+        self.aggregator = BarAggregator(tape.symbols, interval)
+        self.lock = threading.Lock()
+        self.ticks = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def seed(self, symbol, bars):
+        # bars: Bars whose last bar is the one live ticks continue
+        if symbol not in self.aggregator.index or len(bars.close) == 0:
+            return
+        first = self.tape.price[np.argmax(self.tape.symbol == self.aggregator.index[symbol])]
+        start = np.datetime64(bars.dates[-1], "s").astype(np.int64) \
+            if np.issubdtype(np.asarray(bars.dates).dtype, np.datetime64) else time.time()
+        volume = 0 if bars.volume is None else int(bars.volume[-1])
+        with self.lock:
+            self.aggregator.seed(symbol, start, bars.open[-1], bars.high[-1], bars.low[-1],
+                                 bars.close[-1], volume, first)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=asyncio.run, args=(self._run(),), daemon=True,
+                                            name="marketpulse-live-feed")
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    async def _run(self):
+        async for ts, sym, price, size in replay(self.tape, self.speed):
+            if self._stop.is_set():
+                break
+            with self.lock:
+                self.aggregator.update(ts, sym, price, size)
+                self.ticks += len(ts)
+
+    def snapshot(self, symbol):
+        with self.lock:
+            return self.aggregator.bar(symbol)
+
+    def last_prices(self, symbols):
+        # {symbol: close of its live bar} for the symbols that have ticked
+        agg = self.aggregator
+        idx = [agg.index[s] for s in symbols if s in agg.index]
+        with self.lock:
+            close = agg.close[idx].copy()
+            started = np.isfinite(agg.start[idx])
+        return {agg.symbols[i]: float(c) for i, c, ok in zip(idx, close.tolist(), started.tolist()) if ok}
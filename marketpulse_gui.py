@@ -1,8 +1,41 @@
+import os
+import shutil
+import tempfile
+import time
 import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+
+import backtest
+import charts
+from cards import header_html
+from charts import CHART_WIDTH_PX, DEFAULT_THEME, FigureCache
+from downsample import period_keys
+from export import DATASETS, EXPORT_DIR, SINKS, export_iter, zip_files
+from indicators import INDICATORS, IndicatorEngine
+from live_feed import LiveFeed, load_tape, synthetic_tape
+from providers import default_market_data
+from screener import FIELDS
+from search_index import SearchIndex
+from timings import DEBUG, METRICS_PORT, TIMINGS, section, timed
+from timings import serve as serve_metrics
+from universe import UNIVERSE
+from watchlist import REFRESH_S as WATCHLIST_REFRESH_S
+from watchlist import WatchlistRefresher, WatchlistStore
+
+PERIODS = {"1M": 30, "6M": 180, "1Y": 365, "3Y": 3 * 365, "5Y": 5 * 365}
+# Recorded ticks replayed in live mode (CSV: symbol, ts, price, size);
+# without one a synthetic tape is generated
+TICKS_PATH = os.environ.get("MARKETPULSE_TICKS", "data/ticks.csv")
+LIVE_REFRESH_S = 1.0
+# Largest peer group drawn as a heatmap (the biggest companies of the sector)
+HEATMAP_MAX = 20
+# Streamlit holds a download in memory while serving it, so larger archives
+# are not offered (export.py has no limit); unclaimed ones are removed
+EXPORT_DOWNLOAD_MAX_MB = float(os.environ.get("MARKETPULSE_EXPORT_DOWNLOAD_MB", "200"))
+EXPORT_MAX_AGE_S = 3600
+EXPORT_PREFIX = "download-"
 
 # -------------------------------
 # PAGE CONFIG
@@ -36,209 +69,430 @@ st.markdown("""
 # -------------------------------
 # DATA
 # -------------------------------
-companies = [
-    "Tata Motors", "Maruti Suzuki", "M & M", "Hyundai Motor",
-    "Force Motors", "Olectra Greentech", "Mercury EV-Tech"
-]
-
-profiles = {
-    "Tata Motors": {"Price": 701, "Change": -1.67, "Market Cap": "2,57,980 Cr", "HighLow": "948 / 536",
-                    "PE": 12.0, "Book": 315, "Div": 0.84, "ROCE": 20.0, "ROE": 28.1},
-    "Maruti Suzuki": {"Price": 16117, "Change": 0.87, "Market Cap": "5,06,714 Cr", "HighLow": "18000 / 9600",
-                    "PE": 34.9, "Book": 1200, "Div": 0.84, "ROCE": 21.7, "ROE": 18.2},
-    "M & M": {"Price": 3494, "Change": 2.15, "Market Cap": "4,34,532 Cr", "HighLow": "4200 / 1800",
-                    "PE": 31.7, "Book": 850, "Div": 0.73, "ROCE": 13.9, "ROE": 15.5},
-    "Hyundai Motor": {"Price": 2445, "Change": -7.74, "Market Cap": "1,98,682 Cr", "HighLow": "3000 / 1500",
-                    "PE": 36.9, "Book": 600, "Div": 0.87, "ROCE": 54.3, "ROE": 25.1},
-    "Force Motors": {"Price": 15898, "Change": 52.40, "Market Cap": "20,947 Cr", "HighLow": "18500 / 8000",
-                    "PE": 34.7, "Book": 2100, "Div": 0.24, "ROCE": 30.0, "ROE": 22.8},
-    "Olectra Greentech": {"Price": 1545, "Change": 8.46, "Market Cap": "12,681 Cr", "HighLow": "2000 / 800",
-                    "PE": 90.0, "Book": 300, "Div": 0.03, "ROCE": 20.5, "ROE": 12.3},
-    "Mercury EV-Tech": {"Price": 47, "Change": 304.08, "Market Cap": "888 Cr", "HighLow": "85 / 15",
-                    "PE": 94.5, "Book": 25, "Div": 0.00, "ROCE": 5.2, "ROE": 8.1}
-}
+@st.cache_resource
+def get_market_data():
+    # Shared with every session (and with the Qt app's provider code): one
+    # cache, and concurrent loads of the same symbol are coalesced
+    return default_market_data()
+
+companies = get_market_data().companies()
+
+profiles = get_market_data().profiles()
 
 # -------------------------------
-# SESSION STATE FOR COMPANY SELECTION
+# PRICE HISTORY
 # -------------------------------
-if "selected_company" not in st.session_state:
-    st.session_state.selected_company = None
+def get_price_history():
+    # Bars come from the provider chain; windows and figures share its LRU
+    return get_market_data().history
 
-if st.session_state.selected_company is None:
-    st.markdown("<div class='main-title'>✨ Screener.in Glow Up</div>", unsafe_allow_html=True)
-    st.caption("Stock analysis and screening tool for investors in India.")
-    q = st.text_input("🔍 Search for company")
-    show = [c for c in companies if q.lower() in c.lower()] if q else companies
-    company = st.selectbox("Or pick...", show)
-    if st.button("Analyze This Company"):
-        st.session_state.selected_company = company
-        st.stop()
-    st.write("Quick:", ", ".join(show))
-    st.stop()
+@st.cache_resource
+def get_indicator_engine():
+    return IndicatorEngine()
 
-company = st.session_state.selected_company
-cinfo = profiles[company]
+@st.cache_resource
+def get_live_feed():
+    # One replay per process; every live session reads snapshots from it
+    last_prices = dict(zip(profiles.symbols, profiles.columns["Price"].tolist()))
+    tape = load_tape(TICKS_PATH) if os.path.exists(TICKS_PATH) else synthetic_tape(last_prices)
+    feed = LiveFeed(tape)
+    history = get_price_history()
+    for name in tape.symbols:
+        if name in last_prices:
+            feed.seed(name, history.get(name, 5))
+    get_watchlist().live = feed
+    return feed.start()
 
-if st.button("← Change company"):
-    st.session_state.selected_company = None
-    st.stop()
+@st.cache_resource
+def get_watchlist():
+    # One refresher per server process: a batched quote request per interval,
+    # read by every session
+    return WatchlistRefresher(WatchlistStore(), get_market_data().quotes).start()
 
-# -------------------------------
-# COMPANY HEADER + METRICS
-# -------------------------------
-st.markdown(f"<div class='main-title'>🚗 {company} Ltd Dashboard</div>", unsafe_allow_html=True)
-st.markdown(
-    f"<div class='bigdata'>Price: <b>₹{cinfo['Price']}</b>  |  Change: <b style='color:{'green' if cinfo['Change']>0 else 'red'}'>{cinfo['Change']}%</b>  |  Market Cap: ₹{cinfo['Market Cap']}<br>"
-    f"High/Low: {cinfo['HighLow']} | P/E: {cinfo['PE']} | Book Value: ₹{cinfo['Book']} | Dividend: {cinfo['Div']}% | ROCE: {cinfo['ROCE']}% | ROE: {cinfo['ROE']}%</div>",
-    unsafe_allow_html=True
-)
+@st.cache_resource
+def get_figure_cache():
+    # Serialized price figures shared by every session; new bars for a symbol
+    # drop its figures
+    return FigureCache()
+
+def build_price_figure(bars, symbol=None, overlays=(), theme=DEFAULT_THEME):
+    return charts.build_price_figure(bars, symbol, overlays, engine=get_indicator_engine(), width=CHART_WIDTH_PX,
+                                     theme=theme)
+
+def get_fundamentals():
+    return get_market_data().fundamentals()
 
-cols = st.columns(4)
-metrics = [("Price", f"₹{cinfo['Price']}", f"{cinfo['Change']}%"),
-           ("P/E", cinfo['PE'], None),
-           ("Dividend Yield", f"{cinfo['Div']}%", None),
-           ("ROE", f"{cinfo['ROE']}%", None)]
+def get_sector_index():
+    # Peer groups and percentile ranks for the whole universe, computed once
+    return get_market_data().sector_index()
 
-for i, (label, val, delta) in enumerate(metrics):
-    with cols[i]:
-        st.markdown(f"<div class='metric-card'><div class='metric-title'>{label}</div><div class='metric-value'>{val}</div>{'' if not delta else f'<div class=\"metric-title\">Δ {delta}</div>'}</div>", unsafe_allow_html=True)
+@st.cache_resource
+def start_metrics_server():
+    # One exporter per server process, shared by every session
+    return serve_metrics(TIMINGS, port=METRICS_PORT, background=True) if METRICS_PORT else None
+
+start_metrics_server()
+
+@st.cache_resource
+def get_search_index():
+    # Built once per process and shared by every session's search box
+    fundamentals = get_fundamentals()
+    caps = [fundamentals.columns["MarketCap"][fundamentals.position[name]] for name, _, _ in UNIVERSE]
+    return SearchIndex(UNIVERSE, weights=caps)
+
+# -------------------------------
+# DASHBOARD SECTIONS
+# -------------------------------
+# Every section is a function of its inputs. Section data is cached on those
+# inputs, and sections with their own widgets run as fragments, so changing the
+# chart period reruns only the chart and switching company only rebuilds what
+# depends on the company.
 
-st.markdown("---")
+# -------------------------------
+# COMPANY HEADER + METRICS
+# -------------------------------
+@timed("header")
+def render_header(company):
+    # Memoized on the profile row in cards.py, so reruns reuse the HTML
+    title, bigdata, cards = header_html(get_market_data().profile(company))
+    st.markdown(title, unsafe_allow_html=True)
+    st.markdown(bigdata, unsafe_allow_html=True)
+    cols = st.columns(len(cards))
+    for col, card in zip(cols, cards):
+        with col:
+            st.markdown(card, unsafe_allow_html=True)
+    st.markdown("---")
 
 # -------------------------------
 # CANDLESTICK + VOLUME CHART
 # -------------------------------
-with st.container():
-    st.markdown("<div class='graph-container'>", unsafe_allow_html=True)
-    
-    period_days = 180
-    np.random.seed(abs(hash(company)) % 10**6)
-    price_base = cinfo['Price']
-    price = np.cumsum(np.random.normal(0, 3, period_days)) + price_base
-    openp = price - np.random.uniform(2, 5, period_days)
-    closep = price + np.random.uniform(-2, 5, period_days)
-    highp = np.maximum(openp, closep) + np.random.uniform(0, 3, period_days)
-    lowp = np.minimum(openp, closep) - np.random.uniform(0, 3, period_days)
-    volume = np.abs(np.random.normal(2e6, 5e5, period_days)).astype(int)
-    dates = pd.date_range(end=datetime.today(), periods=period_days)
-    
-    fig = go.Figure(data=[go.Candlestick(
-        x=dates,
-        open=openp,
-        high=highp,
-        low=lowp,
-        close=closep,
-        increasing_line_color='#00c39a',
-        decreasing_line_color='#ff4b4b',
-        name="Price"
-    )])
-
-    fig.add_trace(go.Bar(
-        x=dates,
-        y=volume,
-        name="Volume",
-        marker_color="rgba(0,195,154,0.15)",
-        yaxis='y2'
-    ))
-
-    fig.update_layout(
-        yaxis2=dict(overlaying='y', side='right', showgrid=False),
-        margin=dict(l=20, r=20, t=40, b=20),
-        height=400,
-        plot_bgcolor="#0e1117",
-        paper_bgcolor="#0e1117",
-        font=dict(color="#f5f5f5"),
-        xaxis=dict(showgrid=False),
-        yaxis=dict(showgrid=False)
-    )
+@st.fragment
+@timed("chart")
+def render_chart(company):
+    with st.container():
+        st.markdown("<div class='graph-container'>", unsafe_allow_html=True)
+
+        period_col, overlay_col, backtest_col, live_col = st.columns([2, 3, 2, 1])
+        with period_col:
+            period = st.radio("Period", list(PERIODS), index=1, horizontal=True, key="period")
+        with overlay_col:
+            overlays = tuple(st.multiselect("Indicators", list(INDICATORS), key="indicators"))
+        with backtest_col:
+            strategy = st.selectbox("Backtest", ["None"] + list(backtest.STRATEGIES), key="backtest")
+        with live_col:
+            live = st.toggle("Live", key="live")
+        period_days = PERIODS[period]
+        history = get_price_history()
+        resolution = history.resolution_for(company, period_days, CHART_WIDTH_PX)
+        bars = history.get(company, period_days, resolution)
+        fig = get_figure_cache().figure(company, period_days, resolution, bars,
+                                        lambda: build_price_figure(bars, company, overlays, DEFAULT_THEME),
+                                        DEFAULT_THEME, overlays)
+
+        if live:
+            render_live_chart(company, (period_days, resolution, overlays), fig, bars, resolution)
+        else:
+            st.session_state.pop("live_chart", None)
+            st.plotly_chart(fig, use_container_width=True)
+        if strategy != "None":
+            render_backtest(company, strategy, period_days)
+        st.markdown("</div>", unsafe_allow_html=True)
 
+@timed("backtest")
+def render_backtest(company, strategy, period_days):
+    # Daily bars of the chart period; results are memoized with the history
+    defaults = backtest.STRATEGIES[strategy].params
+    with st.expander(f"{strategy} parameters"):
+        cols = st.columns(len(defaults))
+        params = {name: col.number_input(name, value=value, key=f"bt_{strategy}_{name}")
+                  for col, (name, value) in zip(cols, defaults.items())}
+    history = get_price_history()
+    key = ("backtest", strategy, tuple(params.items()))
+    result = history.memo(key, company, period_days, "D", lambda bars: backtest.run(bars, strategy, **params))
+    fig = history.memo(key + ("figure",), company, period_days, "D",
+                       lambda bars: charts.build_equity_figure(result, np.asarray(bars.close, dtype=np.float64)))
+    stats = result.stats
+    for col, label in zip(st.columns(5), ["Total Return (%)", "CAGR (%)", "Sharpe", "Max Drawdown (%)", "Win Rate (%)"]):
+        col.metric(label, "-" if np.isnan(stats[label]) else f"{stats[label]:.2f}")
     st.plotly_chart(fig, use_container_width=True)
-    st.markdown("</div>", unsafe_allow_html=True)
+    with st.expander(f"Trades ({stats['Trades']})"):
+        st.dataframe(result.trades.round(dict.fromkeys(["Entry Price", "Exit Price", "Return (%)"], 2)), use_container_width=True, hide_index=True)
+
+@st.fragment(run_every=LIVE_REFRESH_S)
+@timed("chart.live")
+def render_live_chart(company, key, base_fig, bars, resolution):
+    st.plotly_chart(live_figure(company, key, base_fig, bars, resolution), use_container_width=True)
+
+def live_figure(company, key, base_fig, bars, resolution):
+    # The session keeps its own copy of the figure and patches only the last
+    # candle from the feed; the cached payload is shared and never modified
+    state = st.session_state.get("live_chart")
+    if state is None or state["key"] != (company, key):
+        state = {
+            "key": (company, key), "fig": go.Figure(base_fig.to_dict()), "seq": -1, "bar_seq": None,
+            "candles": [np.asarray(bars.dates).astype("M8[D]")] + [np.array(c, dtype=np.float64) for c in bars[1:5]],
+        }
+        state["base"] = tuple(c[-1] for c in state["candles"][1:4])
+        st.session_state.live_chart = state
+    bar = get_live_feed().snapshot(company)
+    if bar is None or bar.seq == state["seq"]:
+        return state["fig"]
+    x, o, h, l, c = state["candles"]
+    if state["bar_seq"] is not None and bar.bar_seq != state["bar_seq"]:
+        day = np.datetime64(int(bar.start), "s").astype("M8[D]")
+        if period_keys(day[None], resolution)[0] != period_keys(x[-1:], resolution)[0]:
+            # New candle: the only time the x values change
+            x, o, h, l, c = state["candles"] = [np.append(x, day)] + [np.append(a, bar.open) for a in (o, h, l, c)]
+            state["base"] = (bar.open, bar.high, bar.low)
+        else:
+            state["base"] = (o[-1], h[-1], l[-1])
+    base_open, base_high, base_low = state["base"]
+    o[-1], h[-1], l[-1], c[-1] = base_open, max(base_high, bar.high), min(base_low, bar.low), bar.close
+    candle = state["fig"].data[0]
+    with state["fig"].batch_update():
+        if len(x) != len(candle.x):
+            candle.x = x
+        candle.open, candle.high, candle.low, candle.close = o, h, l, c
+    state["seq"], state["bar_seq"] = bar.seq, bar.bar_seq
+    return state["fig"]
 
 # -------------------------------
 # PROS / CONS
 # -------------------------------
-st.markdown("### 🟩 Pros")
-st.success("• Company has reduced debt.\n• Good profit growth 37.2% CAGR (5 yrs).\n• Strong ROE track record.")
-st.markdown("### 🟥 Cons")
-st.error("• Promoter holding has decreased over last 3 years: -3.83%")
-st.markdown("---")
+@timed("pros_cons")
+def render_pros_cons(company):
+    pros_cons = get_market_data().pros_cons(company)
+    st.markdown("### 🟩 Pros")
+    st.success("\n".join(f"• {item}" for item in pros_cons["Pros"]))
+    st.markdown("### 🟥 Cons")
+    st.error("\n".join(f"• {item}" for item in pros_cons["Cons"]))
+    st.markdown("---")
 
 # -------------------------------
 # PEERS TABLE
 # -------------------------------
-st.markdown("Peer Comparison")
-d = pd.DataFrame({
-    "Name": ["Maruti Suzuki", "M & M", company, "Hyundai Motor", "Force Motors"],
-    "CMP": [16117, 3494, cinfo['Price'], 2445, 15898],
-    "P/E": [34.8, 31.7, cinfo['PE'], 36.9, 34.7],
-    "Market Cap": [506714, 434532, 257980, 198682, 20947],
-    "Net Profit Qtr": [3792, 4376, 4003, 1335, 176],
-    "ROCE (%)": [21.7, 13.9, 19.97, 54.25, 29.99]
-})
-st.dataframe(d, use_container_width=True)
-st.markdown("---")
-
-# -------------------------------
-# QUARTERLY RESULTS
-# -------------------------------
-st.markdown("Quarterly Results")
-dfq = pd.DataFrame({
-    "": ["Sales +", "Expenses +", "Operating Profit", "Net Profit"],
-    "Jun 2022": [71935, 69522, 2413, -4951],
-    "Sep 2022": [79611, 74039, 5572, -898],
-    "Dec 2022": [86489, 77668, 8820, 3043],
-    "Mar 2023": [105932, 92818, 13114, 5496]
-})
-st.dataframe(dfq, use_container_width=True)
-st.markdown("---")
-
-# -------------------------------
-# PROFIT & LOSS
-# -------------------------------
-st.markdown("Profit & Loss")
-st.dataframe(pd.DataFrame({
-    "": ["Sales +", "Expenses +", "Operating Profit", "Net Profit"],
-    "Mar 2022": [278454, 253734, 24720, -11309],
-    "Mar 2023": [345967, 314151, 31816, 2690],
-    "Mar 2024": [434016, 376192, 57824, 31807],
-    "Mar 2025": [439695, 384479, 55216, 28149],
-}), use_container_width=True)
-st.markdown("---")
-
-# -------------------------------
-# BALANCE SHEET
-# -------------------------------
-st.markdown("### 🧾 Balance Sheet")
-st.dataframe(pd.DataFrame({
-    "": ["Equity Capital", "Reserves", "Total Liabilities", "Total Assets"],
-    "Mar 2024": [767, 84151, 369521, 369521],
-    "Mar 2025": [736, 115408, 376973, 376973]
-}), use_container_width=True)
-st.markdown("---")
-
-# -------------------------------
-# CASH FLOW
-# -------------------------------
-st.markdown("### 💳 Cash Flow")
-st.dataframe(pd.DataFrame({
-    "": ["Cash from Op", "Cash from Investing", "Net Cash Flow"],
-    "Mar 2024": [67915, -22781, 8128],
-    "Mar 2025": [63102, -49982, -5666]
-}), use_container_width=True)
-st.markdown("---")
-
-# -------------------------------
-# FINANCIAL RATIOS
-# -------------------------------
-st.markdown("### 📐 Financial Ratios")
-ratios = {
-    "": ["P/E", "P/B", "ROE %", "ROCE %", "Div Yield %"],
-    "Current": [cinfo['PE'], 2.2, cinfo['ROE'], cinfo['ROCE'], cinfo['Div']],
-    "Industry Avg": [18.5, 3.1, 18.5, 15.2, 1.2]
-}
-st.dataframe(pd.DataFrame(ratios), use_container_width=True)
-st.markdown("---")
+@timed("peers")
+def render_peers(company):
+    st.markdown("Peer Comparison")
+    sector_index = get_sector_index()
+    peers = sector_index.peers(company)
+    st.caption(f"{sector_index.sector(company)} · {len(peers)} companies · percentiles are within the sector")
+    table_col, corr_col = st.columns([3, 2])
+    with table_col:
+        st.dataframe(peers, use_container_width=True, hide_index=True)
+    with corr_col:
+        render_correlations(company, peers["Name"].tolist()[:HEATMAP_MAX])
+    st.markdown("---")
+
+def render_correlations(company, peer_names):
+    engine = get_market_data().correlations()
+    st.caption(f"Correlation of daily returns · last {engine.count} days")
+    st.plotly_chart(charts.build_correlation_heatmap(engine.correlation(peer_names)), use_container_width=True)
+    closest = engine.most_correlated(company, k=5, among=peer_names)
+    st.caption("Most correlated peers")
+    st.dataframe(closest.rename_axis("Company").reset_index(), use_container_width=True, hide_index=True)
+
+# -------------------------------
+# WATCHLIST (sidebar)
+# -------------------------------
+@st.fragment(run_every=WATCHLIST_REFRESH_S)
+@timed("watchlist")
+def render_watchlist():
+    # Reruns on its own; rows whose quote changed since this session's last
+    # look are highlighted
+    board = get_watchlist().board
+    layout, version, rows, _ = board.changed_since(st.session_state.get("watch_version", 0))
+    if st.session_state.get("watch_layout") != layout:
+        rows = []
+    st.session_state.watch_layout, st.session_state.watch_version = layout, version
+    frame = board.frame()
+    st.markdown("### 👀 Watchlist")
+    if frame.empty:
+        st.caption("Follow a company to watch its price here.")
+        return
+    changed = np.zeros(len(frame), dtype=bool)
+    changed[rows] = True
+    styled = frame.style.format({"Price": "{:,.2f}", "Change": "{:+,.2f}", "Change %": "{:+.2f}%"}, na_rep="") \
+        .apply(lambda row: ["background-color: #1f3b33" if changed[row.name] else ""] * len(row), axis=1)
+    event = st.dataframe(styled, use_container_width=True, hide_index=True, on_select="rerun",
+                         selection_mode="single-row", key="watchlist_table")
+    if event.selection.rows:
+        st.session_state.selected_company = frame["Symbol"].iloc[event.selection.rows[0]]
+        st.rerun()
+
+def render_follow(company):
+    watchlist = get_watchlist()
+    following = watchlist.following(company)
+    if st.button("★ Following" if following else "☆ Follow", key="follow"):
+        if following:
+            watchlist.unfollow(company)
+        else:
+            watchlist.follow(company)
+        st.rerun()
+
+# -------------------------------
+# FINANCIAL STATEMENTS
+# -------------------------------
+def statement_frame(company, statement):
+    # First backend that has this company's statement (files, then the
+    # built-in samples); cached by the provider
+    return get_market_data().statement(company, statement)
+
+def render_table(title, frame):
+    st.markdown(title)
+    st.dataframe(frame, use_container_width=True)
+    st.markdown("---")
+
+# -------------------------------
+# EXPORT
+# -------------------------------
+def sweep_exports(max_age=EXPORT_MAX_AGE_S):
+    # Archives (and interrupted export dirs) that no session claimed in time,
+    # from any session on this server
+    if not os.path.isdir(EXPORT_DIR):
+        return
+    cutoff = time.time() - max_age
+    for entry in os.scandir(EXPORT_DIR):
+        if entry.name.startswith(EXPORT_PREFIX) and entry.stat().st_mtime < cutoff:
+            if entry.is_dir():
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                os.remove(entry.path)
+
+def serve_export(zip_path):
+    # Read when the button is clicked, then deleted: each archive is served once
+    with open(zip_path, "rb") as f:
+        data = f.read()
+    os.remove(zip_path)
+    return data
+
+@st.fragment
+def render_export(company):
+    # Files are written per company on a thread pool, zipped on disk, and
+    # only the finished archive is handed to the download button
+    with st.expander("📦 Export"):
+        scope_col, data_col, format_col = st.columns([2, 3, 2])
+        with scope_col:
+            scope = st.radio("Companies", [company, "All companies"], key="export_scope")
+        with data_col:
+            datasets = st.multiselect("Data", list(DATASETS), default=list(DATASETS), key="export_datasets")
+        with format_col:
+            fmt = st.selectbox("Format", list(SINKS), format_func=lambda f: SINKS[f].label, key="export_format")
+        if scope == "All companies":
+            st.caption(f"All {len(companies):,} companies: downloads are limited to {EXPORT_DOWNLOAD_MAX_MB:.0f} MB. "
+                       "For larger exports run `python export.py <out_dir>` on the server.")
+        if st.button("Prepare export", disabled=not datasets):
+            symbols = None if scope == "All companies" else [company]
+            total = len(companies) if symbols is None else 1
+            progress = st.progress(0.0, text="Exporting…")
+            os.makedirs(EXPORT_DIR, exist_ok=True)
+            sweep_exports()
+            previous = st.session_state.pop("export_zip", None)
+            if previous and os.path.exists(previous):
+                os.remove(previous)
+            out_dir = tempfile.mkdtemp(prefix=EXPORT_PREFIX, dir=EXPORT_DIR)
+            try:
+                paths = []
+                for done, (_, written) in enumerate(export_iter(get_market_data(), out_dir, symbols, datasets, fmt), 1):
+                    paths += written
+                    progress.progress(done / total, text=f"Exported {done:,} of {total:,} companies")
+                zip_path = zip_files(paths, out_dir, out_dir + ".zip")
+            finally:
+                shutil.rmtree(out_dir, ignore_errors=True)
+            size_mb = os.path.getsize(zip_path) / 2**20
+            if size_mb > EXPORT_DOWNLOAD_MAX_MB:
+                os.remove(zip_path)
+                st.warning(f"The archive is {size_mb:,.0f} MB, over the {EXPORT_DOWNLOAD_MAX_MB:.0f} MB download "
+                           "limit. Export fewer datasets, or run `python export.py` on the server.")
+            else:
+                st.session_state.export_zip = zip_path
+                st.session_state.export_name = f"marketpulse-{'all' if symbols is None else company}-{fmt}.zip"
+        zip_path = st.session_state.get("export_zip")
+        if zip_path and os.path.exists(zip_path):
+            st.download_button("⬇ Download", lambda: serve_export(zip_path), file_name=st.session_state.export_name,
+                               mime="application/zip")
+
+# -------------------------------
+# RENDER TIMINGS (MARKETPULSE_DEBUG=1 or ?debug=1)
+# -------------------------------
+def render_timings():
+    summary = TIMINGS.summary()
+    with st.expander("⏱ Render timings", expanded=True):
+        frame = pd.DataFrame.from_dict(summary, orient="index")[["count", "last_ms", "p50_ms", "p95_ms", "max_ms"]]
+        st.dataframe(frame.round(1), use_container_width=True)
+        st.caption("Rolling window of recent renders in this server process; "
+                   "set MARKETPULSE_METRICS_PORT to scrape them as Prometheus metrics.")
+        figures = get_figure_cache().stats()
+        st.caption(f"Figure cache: {figures['entries']} figures, {figures['bytes'] / 2**20:.2f} of "
+                   f"{figures['maxbytes'] / 2**20:.0f} MB, {figures['hits']} hits / {figures['misses']} misses "
+                   f"({figures['hit_rate']:.0%}), {figures['evictions']} evicted")
+
+# -------------------------------
+# SESSION STATE FOR COMPANY SELECTION
+# -------------------------------
+if "selected_company" not in st.session_state:
+    st.session_state.selected_company = None
+
+with st.sidebar:
+    render_watchlist()
+
+if st.session_state.selected_company is None:
+    st.markdown("<div class='main-title'>✨ Screener.in Glow Up</div>", unsafe_allow_html=True)
+    st.caption("Stock analysis and screening tool for investors in India.")
+    q = st.text_input("🔍 Search for company")
+    show = get_search_index().search(q, limit=len(companies)) if q else companies
+    company = st.selectbox("Or pick...", show)
+    if st.button("Analyze This Company"):
+        st.session_state.selected_company = company
+        st.stop()
+    st.write("Quick:", ", ".join(show))
+
+    with st.expander("📊 Screener"):
+        query = st.text_input("Query", placeholder="PE < 20 AND ROE > 15 AND MarketCap > 10000", key="screen_query")
+        fundamentals = get_fundamentals()
+        # Only fields the table has computed; the analytics-only ones would fail to sort
+        sortable = [f for f in FIELDS if f in fundamentals.columns]
+        sort_by = st.selectbox("Sort by", sortable, index=sortable.index("MarketCap") if "MarketCap" in sortable else 0,
+                               key="screen_sort")
+        try:
+            st.dataframe(fundamentals.screen(query, sort_by=sort_by), use_container_width=True, hide_index=True)
+        except ValueError as e:
+            st.error(str(e))
+    st.stop()
+
+
+company = st.session_state.selected_company
+
+back_col, follow_col = st.columns([1, 1])
+with back_col:
+    if st.button("← Change company"):
+        st.session_state.selected_company = None
+        st.stop()
+with follow_col:
+    render_follow(company)
+
+render_header(company)
+render_chart(company)
+render_pros_cons(company)
+render_peers(company)
+with section("quarterly"):
+    render_table("Quarterly Results", statement_frame(company, "Quarterly"))
+with section("profit_loss"):
+    render_table("Profit & Loss", statement_frame(company, "Profit & Loss"))
+with section("balance_sheet"):
+    render_table("### 🧾 Balance Sheet", statement_frame(company, "Balance Sheet"))
+with section("cash_flow"):
+    render_table("### 💳 Cash Flow", statement_frame(company, "Cash Flow"))
+with section("ratios"):
+    st.markdown("### 📐 Financial Ratios")
+    st.caption("Derived from the statements above; Industry Avg is the sector median of the latest values. "
+               "Quoted is the figure shown in the header and peer table.")
+    st.dataframe(get_market_data().ratios(company), use_container_width=True)
+    st.markdown("---")
+render_export(company)
+
+if DEBUG or st.query_params.get("debug") == "1":
+    render_timings()
 
 # -------------------------------
 # FOOTER
@@ -0,0 +1,142 @@
+# ohlcv_store.py
+# On-disk columnar OHLCV history.
+#
+# Layout of a store directory:
+#   index.json      symbol -> [offset, length] into the column files
+#   date.bin        datetime64[D]
+#   open.bin ...    float64 prices (open, high, low, close)
+#   volume.bin      int64
+#
+# Every symbol is one contiguous, date-sorted segment in each column file, so a
+# date range is two binary searches and a slice of a read-only memmap.
+import json
+import os
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+Bars = namedtuple("Bars", ["dates", "open", "high", "low", "close", "volume"])
+
+FIELDS = {
+    "date": np.dtype("<M8[D]"),
+    "open": np.dtype("<f8"),
+    "high": np.dtype("<f8"),
+    "low": np.dtype("<f8"),
+    "close": np.dtype("<f8"),
+    "volume": np.dtype("<i8"),
+}
+
+INDEX_FILE = "index.json"
+
+
+def _column_path(root, field):
+    return os.path.join(root, f"{field}.bin")
+
+
+# ----------------- Reader -----------------
+class OHLCVStore:
+    def __init__(self, root):
+        self.root = root
+        with open(os.path.join(root, INDEX_FILE)) as f:
+            self.index = {sym: tuple(seg) for sym, seg in json.load(f).items()}
+        self.columns = {}
+        for field, dtype in FIELDS.items():
+            path = _column_path(root, field)
+            if os.path.getsize(path) == 0:
+                self.columns[field] = np.empty(0, dtype=dtype)
+            else:
+                self.columns[field] = np.memmap(path, dtype=dtype, mode="r")
+
+    def __contains__(self, symbol):
+        return symbol in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def symbols(self):
+        return list(self.index)
+
+    def get(self, symbol, start=None, end=None):
+        # Zero-copy views of the bars of `symbol` with start <= date <= end
+        offset, length = self.index[symbol]
+        dates = self.columns["date"][offset:offset + length]
+        lo = 0 if start is None else int(np.searchsorted(dates, np.datetime64(start, "D"), side="left"))
+        hi = length if end is None else int(np.searchsorted(dates, np.datetime64(end, "D"), side="right"))
+        seg = slice(offset + lo, offset + hi)
+        return Bars(*(self.columns[field][seg] for field in FIELDS))
+
+    def window(self, symbol, days):
+        # Last `days` calendar days of history, ending at the symbol's latest bar
+        offset, length = self.index[symbol]
+        if length == 0:
+            return self.get(symbol)
+        last = self.columns["date"][offset + length - 1]
+        return self.get(symbol, start=last - np.timedelta64(days - 1, "D"))
+
+
+# ----------------- Writer -----------------
+class OHLCVStoreWriter:
+    # Appends symbol segments to the column files. Re-adding a symbol points the
+    # index at the new segment; the old bytes stay until the store is rebuilt.
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        index_path = os.path.join(root, INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                self.index = json.load(f)
+        else:
+            self.index = {}
+        self.files = {field: open(_column_path(root, field), "ab") for field in FIELDS}
+        self.rows = self.files["date"].tell() // FIELDS["date"].itemsize
+
+    def add(self, symbol, bars):
+        columns = [np.ascontiguousarray(col, dtype=FIELDS[field]) for field, col in zip(FIELDS, bars)]
+        length = len(columns[0])
+        if any(len(col) != length for col in columns):
+            raise ValueError(f"{symbol}: OHLCV columns have different lengths")
+        order = np.argsort(columns[0], kind="stable")
+        if length and np.any(order != np.arange(length)):
+            columns = [col[order] for col in columns]
+        for field, col in zip(FIELDS, columns):
+            col.tofile(self.files[field])
+        self.index[symbol] = [self.rows, length]
+        self.rows += length
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+        tmp = os.path.join(self.root, INDEX_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.index, f)
+        os.replace(tmp, os.path.join(self.root, INDEX_FILE))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def import_csv_dir(csv_dir, root):
+    # One CSV per symbol (file name = symbol) with Date,Open,High,Low,Close,Volume
+    import pandas as pd
+
+    with OHLCVStoreWriter(root) as writer:
+        for name in sorted(os.listdir(csv_dir)):
+            if not name.lower().endswith(".csv"):
+                continue
+            df = pd.read_csv(os.path.join(csv_dir, name), parse_dates=["Date"])
+            writer.add(os.path.splitext(name)[0], Bars(
+                df["Date"].to_numpy("datetime64[D]"),
+                df["Open"].to_numpy(), df["High"].to_numpy(),
+                df["Low"].to_numpy(), df["Close"].to_numpy(),
+                df["Volume"].to_numpy(),
+            ))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python ohlcv_store.py <csv_dir> <store_dir>")
+    import_csv_dir(sys.argv[1], sys.argv[2])
@@ -0,0 +1,79 @@
+# peers.py
+# Sector peer groups, precomputed once for the whole universe.
+#
+# Percentile ranks are computed for every metric in one lexsort over
+# (sector, value), and each sector's peer table is built once, so showing the
+# peers of a company is a dict lookup however large its sector is.
+import numpy as np
+import pandas as pd
+
+# Peer table column -> FundamentalsTable column
+PEER_METRICS = {
+    "CMP": "Price",
+    "P/E": "PE",
+    "Market Cap": "MarketCap",
+    "Net Profit Qtr": "NetProfit",
+    "ROCE (%)": "ROCE",
+    "ROE (%)": "ROE",
+    # Only shown once analytics.py has run
+    "1Y Return (%)": "Return1Y",
+    "Volatility (%)": "Volatility",
+}
+# Metrics that get a percentile column
+RANKED = ("P/E", "ROCE (%)", "Market Cap", "Net Profit Qtr", "1Y Return (%)")
+
+
+def group_percentiles(groups, values):
+    # Percentile (0-100) of each value within its group; NaNs stay NaN.
+    # lexsort puts NaNs last inside each group, so valid values rank 0..k-1.
+    values = np.asarray(values, dtype=np.float64)
+    order = np.lexsort((values, groups))
+    sizes = np.bincount(groups)
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    rank = np.empty(len(values), dtype=np.float64)
+    rank[order] = np.arange(len(values)) - starts[groups[order]]
+    valid = np.bincount(groups, weights=~np.isnan(values), minlength=len(sizes))[groups]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(valid > 1, 100.0 * rank / (valid - 1), 100.0)
+    pct[np.isnan(values)] = np.nan
+    return pct
+
+
+class SectorIndex:
+    def __init__(self, symbols, sectors, columns, percentiles=None):
+        symbols = np.asarray(symbols, dtype=object)
+        self.sectors, groups = np.unique(np.asarray(sectors, dtype=str), return_inverse=True)
+        self.sector_of = dict(zip(symbols, self.sectors[groups]))
+
+        frame = pd.DataFrame({"Name": symbols})
+        for label, field in PEER_METRICS.items():
+            if field in columns:
+                frame[label] = columns[field]
+        # Percentiles the analytics job already computed are used as they are
+        percentiles = percentiles or {}
+        for label in RANKED:
+            if label in frame:
+                pct = percentiles.get(PEER_METRICS[label])
+                if pct is None:
+                    pct = np.round(group_percentiles(groups, frame[label].to_numpy()), 1)
+                frame[f"{label} %ile"] = pct
+
+        self.tables = {}
+        for g, sector in enumerate(self.sectors):
+            members = frame[groups == g].sort_values("Market Cap", ascending=False, na_position="last")
+            self.tables[sector] = members.reset_index(drop=True)
+
+    @classmethod
+    def from_fundamentals(cls, fundamentals, sector_of):
+        if fundamentals.sectors is not None:
+            sectors = fundamentals.sectors
+        else:
+            sectors = [sector_of.get(sym, "Unclassified") for sym in fundamentals.symbols]
+        return cls(fundamentals.symbols, sectors, fundamentals.columns, fundamentals.percentiles)
+
+    def sector(self, symbol):
+        return self.sector_of[symbol]
+
+    def peers(self, symbol):
+        # Shared, precomputed table: callers must not modify it
+        return self.tables[self.sector_of[symbol]]
@@ -0,0 +1,100 @@
+# price_history.py
+# Price history for the candlestick chart: real bars from the OHLCV store when
+# available, otherwise a synthetic series that is identical in every process.
+import hashlib
+
+import numpy as np
+
+from cache import LRUCache
+from downsample import RESOLUTIONS, choose_resolution, resample
+from ohlcv_store import Bars
+
+SYNTHETIC_DAYS = 5 * 365
+
+
+def stable_seed(symbol):
+    # hash() is salted per process; blake2b is not
+    return int.from_bytes(hashlib.blake2b(symbol.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def synthetic_bars(symbol, last_price, days=SYNTHETIC_DAYS, end=None):
+    # Random walk that ends near `last_price`, so every period is a tail of
+    # the same series and the chart lines up with the quoted price
+    rng = np.random.default_rng(stable_seed(symbol))
+    walk = np.cumsum(rng.normal(0, 0.015, days))
+    closep = last_price * np.exp(walk - walk[-1])
+    openp = closep * (1 - rng.normal(0, 0.008, days))
+    highp = np.maximum(openp, closep) * (1 + rng.uniform(0, 0.01, days))
+    lowp = np.minimum(openp, closep) * (1 - rng.uniform(0, 0.01, days))
+    volume = np.abs(rng.normal(2e6, 5e5, days)).astype(np.int64)
+    end = np.datetime64("today", "D") if end is None else np.datetime64(end, "D")
+    dates = end - np.arange(days - 1, -1, -1).astype("timedelta64[D]")
+    return Bars(dates, openp, highp, lowp, closep, volume)
+
+
+def today():
+    return np.datetime64("today", "D")
+
+
+def calendar_window(bars, days):
+    # Bars of the last `days` calendar days up to the latest bar, as
+    # OHLCVStore.window cuts them: a year is a year whether the series has
+    # one bar per calendar day or per trading day
+    dates = np.asarray(bars.dates).astype("M8[D]")
+    if not len(dates):
+        return bars
+    start = np.searchsorted(dates, dates[-1] - np.timedelta64(days - 1, "D"))
+    return Bars(*(None if col is None else col[start:] for col in bars))
+
+
+# ----------------- Provider -----------------
+class PriceHistoryProvider:
+    # Memoizes bars and derived objects (e.g. backtest results) per
+    # (symbol, period, resolution) in one bounded LRU shared by all sessions.
+    # Keys include the current date, so a long-running server moves on to
+    # the new day's history (the synthetic series ends today) and yesterday's
+    # entries age out of the LRU.
+    # source(symbol) -> full daily Bars, when given, replaces store/synthetic.
+    def __init__(self, store=None, last_prices=None, maxsize=256, source=None, clock=today):
+        self.store = store
+        self.last_prices = last_prices or {}
+        self.source = source
+        self.clock = clock
+        self.cache = LRUCache(maxsize)
+
+    def _load(self, symbol, period_days, resolution, day):
+        if resolution != "D":
+            return resample(self._get(symbol, period_days, "D", day), resolution)
+        if self.source is not None:
+            return calendar_window(self.source(symbol), period_days)
+        if self.store is not None and symbol in self.store:
+            return self.store.window(symbol, period_days)
+        full = self.cache.get_or_set(
+            ("synthetic", symbol, day),
+            lambda: synthetic_bars(symbol, self.last_prices.get(symbol, 100.0), end=day),
+        )
+        return calendar_window(full, period_days)
+
+    def get(self, symbol, period_days, resolution="D"):
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"unsupported resolution {resolution!r}")
+        return self._get(symbol, period_days, resolution, self.clock())
+
+    def _get(self, symbol, period_days, resolution, day):
+        # One date for a whole load, even one that spans midnight
+        return self.cache.get_or_set(
+            ("bars", symbol, period_days, resolution, day),
+            lambda: self._load(symbol, period_days, resolution, day),
+        )
+
+    def resolution_for(self, symbol, period_days, pixel_width):
+        # Finest resolution (daily or coarser) whose candles fit pixel_width
+        return choose_resolution(self.get(symbol, period_days).dates, pixel_width)
+
+    def memo(self, kind, symbol, period_days, resolution, build):
+        # Cache anything derived from one history, e.g. memo(("backtest", ...), ..., run)
+        day = self.clock()
+        return self.cache.get_or_set(
+            (kind, symbol, period_days, resolution, day),
+            lambda: build(self._get(symbol, period_days, resolution, day)),
+        )
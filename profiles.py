@@ -0,0 +1,92 @@
+# profiles.py
+# Company profiles as a struct-of-arrays table: one float64 column per field,
+# a small integer code per row for the sector, and the symbols interned and
+# indexed once. Per company that is a dozen machine words instead of a dict of
+# boxed values and preformatted strings, and universe-wide questions (every
+# price, everyone in a sector) are column slices. Display strings are made
+# on demand by formatting.py.
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+from screener import parse_number
+
+# Same names as the screener's fields
+COLUMNS = ("Price", "Change", "MarketCap", "High", "Low", "PE", "Book", "Div", "ROCE", "ROE", "NetProfit")
+UNCLASSIFIED = "Unclassified"
+# Keys of the dict form (universe.PROFILES) that map straight onto a column
+RECORD_KEYS = {"Price": "Price", "Change": "Change", "PE": "PE", "Book": "Book", "Div": "Div",
+               "ROCE": "ROCE", "ROE": "ROE", "NetProfit": "Net Profit"}
+
+# One company; missing values are None so equal profiles compare (and hash) equal
+Profile = namedtuple("Profile", ("symbol", "sector") + COLUMNS)
+
+
+def blank_profile(symbol):
+    return Profile(symbol, UNCLASSIFIED, *([None] * len(COLUMNS)))
+
+
+class ProfileTable:
+    def __init__(self, symbols, sectors, columns):
+        self.symbols = np.array([sys.intern(str(s)) for s in symbols], dtype=object)
+        self.position = {s: i for i, s in enumerate(self.symbols)}
+        n = len(self.symbols)
+        names, codes = np.unique(np.array([s or UNCLASSIFIED for s in sectors], dtype=str), return_inverse=True)
+        self.sector_names = [sys.intern(str(s)) for s in names]
+        self.sector_codes = codes.astype(np.int32).reshape(n)
+        self.columns = {name: np.asarray(columns[name], dtype=np.float64) if name in columns else np.full(n, np.nan)
+                        for name in COLUMNS}
+
+    @classmethod
+    def from_records(cls, profiles):
+        # {symbol: {"Price": 701, "Market Cap": "2,57,980 Cr", "HighLow": "948 / 536", ...}};
+        # the strings are parsed once here
+        names = list(profiles)
+        records = [profiles[n] for n in names]
+        highlow = [str(r.get("HighLow", "")).split("/") + [""] for r in records]
+        columns = {name: [r.get(key, np.nan) for r in records] for name, key in RECORD_KEYS.items()}
+        columns["MarketCap"] = [parse_number(r.get("Market Cap", "")) for r in records]
+        columns["High"] = [parse_number(h[0]) for h in highlow]
+        columns["Low"] = [parse_number(h[1]) for h in highlow]
+        return cls(names, [r.get("Sector") for r in records], columns)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return symbol in self.position
+
+    def __iter__(self):
+        return iter(self.symbols)
+
+    # ----------------- Rows -----------------
+    def row(self, symbol):
+        i = self.position.get(symbol)
+        if i is None:
+            return None
+        values = [self.columns[name][i].item() for name in COLUMNS]
+        return Profile(self.symbols[i], self.sector_names[self.sector_codes[i]],
+                       *(None if v != v else v for v in values))
+
+    def value(self, symbol, name, default=np.nan):
+        i = self.position.get(symbol)
+        return default if i is None else float(self.columns[name][i])
+
+    def sector(self, symbol):
+        i = self.position.get(symbol)
+        return UNCLASSIFIED if i is None else self.sector_names[self.sector_codes[i]]
+
+    # ----------------- Columns -----------------
+    def sectors(self):
+        # Sector name per row
+        return np.asarray(self.sector_names, dtype=object)[self.sector_codes]
+
+    def in_sector(self, sector):
+        if sector not in self.sector_names:
+            return []
+        return self.symbols[self.sector_codes == self.sector_names.index(sector)].tolist()
+
+    def nbytes(self):
+        # Array memory, not counting the shared symbol strings
+        return sum(col.nbytes for col in self.columns.values()) + self.sector_codes.nbytes + self.symbols.nbytes
@@ -0,0 +1,9 @@
+# providers
+# Single source of data for the Streamlit and Qt front ends. Backends
+# (memory, files, HTTP) answer raw questions; MarketData chains them behind a
+# shared TTL+LRU cache with coalesced loads and derives everything else.
+from providers.base import STATEMENT_NAMES, Backend
+from providers.files import FilesBackend
+from providers.http import HTTPBackend, serve
+from providers.memory import MemoryBackend
+from providers.service import MarketData, default_backends, default_market_data, local_backends
@@ -0,0 +1,33 @@
+# providers/base.py
+# A backend answers the raw questions the dashboards ask. Every method
+# returns None when the backend has nothing for it, so MarketData can fall
+# through to the next backend in its chain.
+
+# Statement names shared by every backend
+STATEMENT_NAMES = ("Quarterly", "Profit & Loss", "Balance Sheet", "Cash Flow", "Shareholding")
+
+
+class Backend:
+    name = "backend"
+
+    def profiles(self):
+        # profiles.ProfileTable for the whole universe
+        return None
+
+    def daily_bars(self, symbol):
+        # Full daily history as ohlcv_store.Bars
+        return None
+
+    def pros_cons(self, symbol):
+        # {"Pros": [...], "Cons": [...]}
+        return None
+
+    def statement(self, symbol, name):
+        # DataFrame: first column "" holds the line items, then one column
+        # per period, oldest first
+        return None
+
+    def quotes(self, symbols):
+        # {symbol: [last price, previous close]} for many symbols in one call;
+        # symbols left out fall through to the next backend
+        return None
@@ -0,0 +1,48 @@
+# providers/compat.py
+# List-shaped views of MarketData for the standalone widget scripts at the
+# top of tempCodeRunnerFile.py, which predate the provider package.
+from formatting import MISSING
+from providers.service import default_market_data
+
+CHART_DAYS = 30
+
+
+def _symbol(symbol):
+    return symbol or default_market_data().companies()[0]
+
+
+def get_key_metrics(symbol=None):
+    return default_market_data().key_metrics(_symbol(symbol))
+
+
+def get_stock_data(symbol=None):
+    # [(open, high, low, close), ...] for the last CHART_DAYS days
+    bars = default_market_data().history.get(_symbol(symbol), CHART_DAYS)
+    return list(zip(bars.open.tolist(), bars.high.tolist(), bars.low.tolist(), bars.close.tolist()))
+
+
+def get_line_chart_data(symbol=None):
+    return default_market_data().history.get(_symbol(symbol), CHART_DAYS).close.tolist()
+
+
+def get_pros_cons(symbol=None):
+    return default_market_data().pros_cons(_symbol(symbol))
+
+
+def get_peers(symbol=None):
+    peers = default_market_data().peers(_symbol(symbol))
+    return [[name, f"{cmp:,.0f}", f"{pe:.1f}", f"{roe:.1f}%"] for name, cmp, pe, roe in
+            zip(peers["Name"], peers["CMP"], peers["P/E"], peers["ROE (%)"])]
+
+
+def get_financials(tab_name, symbol=None):
+    # One row per period, newest first: [period, item1, item2, ...]
+    data = default_market_data()
+    frame = data.ratios(_symbol(symbol)) if tab_name == "Ratios" else \
+        data.statement(_symbol(symbol), "Cash Flow" if tab_name == "Cashflows" else tab_name)
+    if frame is None:
+        return []
+    body = frame.set_index("").T
+    return [[str(period)] + [(MISSING if v != v else f"{v:,.2f}".rstrip("0").rstrip(".")) if isinstance(v, float)
+                             else str(v) for v in values]
+            for period, values in zip(body.index[::-1], body.to_numpy(dtype=object)[::-1])]
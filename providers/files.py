@@ -0,0 +1,28 @@
+# providers/files.py
+# Local files: the memory-mapped OHLCV store and the columnar statements
+# store. Either directory may be missing; the backend then answers None.
+import os
+
+from ohlcv_store import OHLCVStore
+from providers.base import Backend
+from statements_store import STATEMENTS, open_statements_store
+
+
+class FilesBackend(Backend):
+    name = "files"
+
+    def __init__(self, ohlcv_dir=None, statements_dir=None):
+        self.ohlcv = None
+        if ohlcv_dir and os.path.exists(os.path.join(ohlcv_dir, "index.json")):
+            self.ohlcv = OHLCVStore(ohlcv_dir)
+        self.statements = open_statements_store(statements_dir) if statements_dir else None
+
+    def daily_bars(self, symbol):
+        if self.ohlcv is None or symbol not in self.ohlcv:
+            return None
+        return self.ohlcv.get(symbol)
+
+    def statement(self, symbol, name):
+        if self.statements is None or name not in STATEMENTS:
+            return None
+        return self.statements.load(symbol, name)
@@ -0,0 +1,156 @@
+# providers/http.py
+# JSON over HTTP. HTTPBackend is the client; serve() is a local stand-in
+# server that publishes any other backend, e.g.
+#   python -m providers.http 8765
+#   MARKETPULSE_DATA_URL=http://127.0.0.1:8765 streamlit run marketpulse_gui.py
+import http.client
+import json
+import sys
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from ohlcv_store import Bars
+from profiles import COLUMNS as PROFILE_COLUMNS
+from profiles import ProfileTable
+from providers.base import Backend
+
+BAR_FIELDS = Bars._fields
+
+
+# ----------------- Wire format -----------------
+def encode_bars(bars):
+    out = {"dates": np.datetime_as_string(np.asarray(bars.dates, dtype="M8[D]")).tolist()}
+    for field in BAR_FIELDS[1:]:
+        col = getattr(bars, field)
+        out[field] = None if col is None else np.asarray(col).tolist()
+    return out
+
+
+def decode_bars(data):
+    return Bars(np.array(data["dates"], dtype="M8[D]"),
+                *(None if data[f] is None else np.asarray(data[f], dtype=np.int64 if f == "volume" else np.float64)
+                  for f in BAR_FIELDS[1:]))
+
+
+def encode_profiles(table):
+    # NaN is not JSON
+    return {"symbols": table.symbols.tolist(), "sectors": table.sectors().tolist(),
+            "columns": {name: [None if v != v else v for v in table.columns[name].tolist()] for name in PROFILE_COLUMNS}}
+
+
+def decode_profiles(data):
+    return ProfileTable(data["symbols"], data["sectors"],
+                        {name: np.array(col, dtype=np.float64) for name, col in data["columns"].items()})
+
+
+def encode_frame(frame):
+    return {"columns": [str(c) for c in frame.columns], "data": frame.to_numpy(dtype=object).tolist()}
+
+
+def decode_frame(data):
+    return pd.DataFrame(data["data"], columns=data["columns"])
+
+
+# ----------------- Client -----------------
+class HTTPBackend(Backend):
+    name = "http"
+
+    def __init__(self, base_url, timeout=5.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _get(self, path, decode=None, **params):
+        # Every failure to get a usable answer is an OSError, which the
+        # callers treat as "this backend is down"; 404 means "no data"
+        url = f"{self.base_url}/{path}"
+        if params:
+            url += "?" + urllib.parse.urlencode(params)
+        try:
+            with urllib.request.urlopen(url, timeout=self.timeout) as response:
+                data = json.load(response)
+            return data if decode is None else decode(data)
+        except urllib.error.HTTPError as exc:
+            if exc.code == 404:
+                return None
+            raise
+        except (ValueError, KeyError, TypeError, http.client.HTTPException) as exc:
+            # Truncated or non-JSON body, or JSON that is not the expected shape
+            raise OSError(f"bad response from {url}: {exc!r}") from exc
+
+    def profiles(self):
+        return self._get("profiles", decode_profiles)
+
+    def daily_bars(self, symbol):
+        return self._get("bars", decode_bars, symbol=symbol)
+
+    def pros_cons(self, symbol):
+        return self._get("pros_cons", symbol=symbol)
+
+    def statement(self, symbol, name):
+        return self._get("statement", decode_frame, symbol=symbol, name=name)
+
+    def quotes(self, symbols):
+        # One request for the whole list
+        return self._get("quotes", dict, symbols="\n".join(symbols))
+
+
+# ----------------- Stand-in server -----------------
+def _handler(backend):
+    routes = {
+        "/profiles": lambda q: _maybe(encode_profiles, backend.profiles()),
+        "/bars": lambda q: _maybe(encode_bars, backend.daily_bars(q["symbol"])),
+        "/pros_cons": lambda q: backend.pros_cons(q["symbol"]),
+        "/statement": lambda q: _maybe(encode_frame, backend.statement(q["symbol"], q["name"])),
+        "/quotes": lambda q: backend.quotes(q["symbols"].split("\n")),
+    }
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urllib.parse.urlsplit(self.path)
+            route = routes.get(url.path)
+            query = dict(urllib.parse.parse_qsl(url.query))
+            try:
+                data = None if route is None else route(query)
+            except KeyError as exc:
+                self.send_error(400, f"missing parameter {exc}")
+                return
+            if data is None:
+                self.send_error(404)
+                return
+            body = json.dumps(data).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def _maybe(encode, value):
+    return None if value is None else encode(value)
+
+
+def serve(backend, host="127.0.0.1", port=8765, background=False):
+    server = ThreadingHTTPServer((host, port), _handler(backend))
+    if background:
+        threading.Thread(target=server.serve_forever, daemon=True, name="marketpulse-data-server").start()
+        return server
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    from providers.service import MarketData, local_backends
+
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    print(f"serving MarketPulse data on http://127.0.0.1:{port}")
+    serve(MarketData(local_backends()), port=port)
@@ -0,0 +1,96 @@
+# providers/memory.py
+# Built-in data: the universe profiles, a synthetic price history and sample
+# statements. Always answers, so it ends every backend chain.
+import numpy as np
+import pandas as pd
+
+from price_history import synthetic_bars
+from profiles import ProfileTable
+from providers.base import Backend
+from universe import PROFILES
+
+PROS_CONS = {
+    "Pros": [
+        "Company has reduced debt", "Good profit growth 37.2% CAGR (5 yrs)", "Strong ROE track record",
+        "Consistent dividend", "Efficient cost management", "High operating margin",
+        "Expanding market share", "Stable cash flows",
+    ],
+    "Cons": [
+        "Promoter holding has decreased over last 3 years: -3.83%", "Cyclical industry",
+        "Vulnerable to regulation changes", "Exposure to currency fluctuations",
+        "High competition", "Geopolitical risks",
+    ],
+}
+
+# Whose statements the samples are, and which of them are amounts (not %)
+SAMPLE_COMPANY = "Tata Motors"
+SCALED = ("Quarterly", "Profit & Loss", "Balance Sheet", "Cash Flow")
+
+STATEMENTS = {
+    "Quarterly": {
+        "": ["Sales +", "Expenses +", "Operating Profit", "Net Profit"],
+        "Jun 2022": [71935, 69522, 2413, -4951],
+        "Sep 2022": [79611, 74039, 5572, -898],
+        "Dec 2022": [86489, 77668, 8820, 3043],
+        "Mar 2023": [105932, 92818, 13114, 5496],
+    },
+    "Profit & Loss": {
+        "": ["Sales +", "Expenses +", "Operating Profit", "Net Profit"],
+        "Mar 2022": [278454, 253734, 24720, -11309],
+        "Mar 2023": [345967, 314151, 31816, 2690],
+        "Mar 2024": [434016, 376192, 57824, 31807],
+        "Mar 2025": [439695, 384479, 55216, 28149],
+    },
+    "Balance Sheet": {
+        "": ["Equity Capital", "Reserves", "Borrowings", "Total Liabilities", "Total Assets"],
+        "Mar 2024": [767, 84151, 134113, 369521, 369521],
+        "Mar 2025": [736, 115408, 100826, 376973, 376973],
+    },
+    "Cash Flow": {
+        "": ["Cash from Op", "Cash from Investing", "Dividends Paid", "Net Cash Flow"],
+        "Mar 2024": [67915, -22781, -1350, 8128],
+        "Mar 2025": [63102, -49982, -2210, -5666],
+    },
+    "Shareholding": {
+        "": ["Promoters", "Institutional", "Retail"],
+        "Mar 2025": [50.0, 30.0, 20.0],
+    },
+}
+
+
+class MemoryBackend(Backend):
+    name = "memory"
+
+    def __init__(self, profiles=None, statements=None, pros_cons=None):
+        # profiles: a ProfileTable or the {symbol: dict} form of universe.PROFILES
+        profiles = PROFILES if profiles is None else profiles
+        self._profiles = profiles if isinstance(profiles, ProfileTable) else ProfileTable.from_records(profiles)
+        self._statements = STATEMENTS if statements is None else statements
+        self._pros_cons = PROS_CONS if pros_cons is None else pros_cons
+
+    def profiles(self):
+        return self._profiles
+
+    def daily_bars(self, symbol):
+        price = self._profiles.value(symbol, "Price")
+        return synthetic_bars(symbol, 100.0 if np.isnan(price) else price)
+
+    def pros_cons(self, symbol):
+        return self._pros_cons
+
+    def statement(self, symbol, name):
+        # The samples are one company's figures; the others get them scaled
+        # by quarterly net profit so sizes and valuation ratios stay plausible
+        table = self._statements.get(name)
+        if table is None:
+            return None
+        frame = pd.DataFrame(table)
+        if name in SCALED:
+            periods = frame.columns[1:]
+            frame[periods] = (frame[periods] * self._scale(symbol)).round(2)
+        return frame
+
+    def _scale(self, symbol):
+        base = self._profiles.value(SAMPLE_COMPANY, "NetProfit")
+        own = self._profiles.value(symbol, "NetProfit")
+        return own / base if base and own and not np.isnan(base + own) else 1.0
@@ -0,0 +1,188 @@
+# providers/service.py
+# MarketData is what the front ends talk to. It asks its backends in order
+# (first non-None answer wins) and keeps answers in one TTL+LRU cache whose
+# loads are coalesced, so concurrent views of one symbol cost one fetch.
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+from analytics import ANALYTICS_PATH, load_results
+from cache import TTLCache
+from correlation import CorrelationEngine
+from peers import SectorIndex
+from formatting import format_crore, format_indian, format_percent
+from price_history import PriceHistoryProvider
+from profiles import ProfileTable, blank_profile
+from providers.files import FilesBackend
+from providers.http import HTTPBackend
+from providers.memory import MemoryBackend
+from ratios import RatioEngine
+from screener import FundamentalsTable
+
+OHLCV_DIR = os.environ.get("MARKETPULSE_OHLCV_DIR", "data/ohlcv")
+STATEMENTS_DIR = os.environ.get("MARKETPULSE_STATEMENTS_DIR", "data/statements")
+DATA_URL = os.environ.get("MARKETPULSE_DATA_URL")
+DATA_TTL = float(os.environ.get("MARKETPULSE_DATA_TTL", "300"))
+HISTORY_CACHE_SIZE = int(os.environ.get("MARKETPULSE_HISTORY_CACHE_SIZE", "256"))
+
+
+def local_backends():
+    return [FilesBackend(OHLCV_DIR, STATEMENTS_DIR), MemoryBackend()]
+
+
+def default_backends():
+    # A data server, when configured, is asked first
+    return ([HTTPBackend(DATA_URL)] if DATA_URL else []) + local_backends()
+
+
+class MarketData:
+    def __init__(self, backends, ttl=DATA_TTL, maxsize=512):
+        self.backends = list(backends)
+        self.cache = TTLCache(maxsize, ttl)
+        # Resampled windows and figures are memoized per history on top
+        self.history = PriceHistoryProvider(source=self.daily_bars, maxsize=HISTORY_CACHE_SIZE)
+        # Memoized on the statements themselves, so it survives cache expiry
+        self.ratio_engine = RatioEngine(self.statement, self.profiles)
+        # Built once, then updated with new days; see correlations()
+        self._correlations = None
+        self._correlations_checked = 0.0
+        self._correlations_lock = threading.Lock()
+
+    def _first(self, method, *args):
+        for backend in self.backends:
+            try:
+                value = getattr(backend, method)(*args)
+            except OSError as exc:
+                # An unreachable server should not take the dashboards down
+                print(f"{backend.name} backend: {method}{args} failed: {exc}", file=sys.stderr)
+                continue
+            if value is not None:
+                return value
+        return None
+
+    def _get(self, method, *args):
+        return self.cache.get_or_load((method,) + args, lambda: self._first(method, *args))
+
+    def invalidate(self, symbol=None):
+        if symbol is None:
+            self.cache.clear()
+            with self._correlations_lock:
+                self._correlations = None
+        else:
+            self.cache.invalidate(lambda key: symbol in key[1:])
+        self.history.cache.clear()
+
+    # ----------------- Backend questions -----------------
+    def profiles(self):
+        return self._get("profiles") or ProfileTable([], [], {})
+
+    def daily_bars(self, symbol):
+        return self._get("daily_bars", symbol)
+
+    def pros_cons(self, symbol):
+        return self._get("pros_cons", symbol) or {"Pros": [], "Cons": []}
+
+    def statement(self, symbol, name):
+        return self.cache.get_or_load(("statement", symbol, name), lambda: self._load_statement(symbol, name))
+
+    def _load_statement(self, symbol, name):
+        # Every (re)load is reported, so derived ratios change only with the data
+        frame = self._first("statement", symbol, name)
+        self.ratio_engine.statement_loaded(symbol, name, frame)
+        return frame
+
+    def quotes(self, symbols):
+        # Never cached: one batched call per backend for the symbols still
+        # unanswered, then the last two daily bars for the rest
+        out = {}
+        for backend in self.backends:
+            missing = [s for s in symbols if s not in out]
+            if not missing:
+                break
+            try:
+                answer = backend.quotes(missing)
+            except OSError as exc:
+                print(f"{backend.name} backend: quotes failed: {exc}", file=sys.stderr)
+                continue
+            out.update({s: q for s, q in (answer or {}).items() if s in missing})
+        for symbol in symbols:
+            if symbol not in out:
+                bars = self.daily_bars(symbol)
+                if bars is not None and len(bars.close):
+                    close = np.asarray(bars.close[-2:], dtype=np.float64)
+                    out[symbol] = [float(close[-1]), float(close[0])]
+        return out
+
+    # ----------------- Derived -----------------
+    def companies(self):
+        return self.profiles().symbols.tolist()
+
+    def profile(self, symbol):
+        # profiles.Profile; every value None for an unknown symbol
+        return self.profiles().row(symbol) or blank_profile(symbol)
+
+    def key_metrics(self, symbol):
+        p = self.profile(symbol)
+        return {
+            "Market Cap": format_crore(p.MarketCap),
+            "Current Price": format_indian(p.Price),
+            "P/E": format_indian(p.PE),
+            "ROCE": format_percent(p.ROCE),
+            "ROE": format_percent(p.ROE),
+            "Dividend Yield": format_percent(p.Div),
+            "Book Value": format_indian(p.Book),
+        }
+
+    def fundamentals(self):
+        return self.cache.get_or_load(("fundamentals",), self._fundamentals)
+
+    def _fundamentals(self):
+        # The universe-wide table from analytics.py when it has been run
+        results = load_results(ANALYTICS_PATH)
+        if results is not None:
+            return FundamentalsTable.from_frame(results)
+        return FundamentalsTable.from_profiles(self.profiles())
+
+    def sector_index(self):
+        return self.cache.get_or_load(("sector_index",), lambda: SectorIndex.from_fundamentals(
+            self.fundamentals(), dict(zip(self.profiles().symbols, self.profiles().sectors()))))
+
+    def peers(self, symbol):
+        return self.sector_index().peers(symbol)
+
+    def correlations(self):
+        # Rolling correlation of daily returns over the universe. Built once;
+        # after that, days newer than the engine's are pushed into it, checked
+        # at most once per TTL since that is how long bars are cached
+        with self._correlations_lock:
+            now = time.monotonic()
+            if self._correlations is None:
+                self._correlations = CorrelationEngine.from_bars(self._all_bars())
+                self._correlations_checked = now
+            elif now - self._correlations_checked >= self.cache.ttl:
+                self._correlations_checked = now
+                self._correlations.push_bars(self._all_bars())
+            return self._correlations
+
+    def _all_bars(self):
+        return {name: self.daily_bars(name) for name in self.companies()}
+
+    def ratios(self, symbol):
+        # Derived from the statements, with the sector median alongside
+        return self.ratio_engine.table(symbol)
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_market_data():
+    # Process-wide instance shared by every window and session
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = MarketData(default_backends())
+    return _default
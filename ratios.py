@@ -0,0 +1,176 @@
+# ratios.py
+# Financial ratios derived from the statements instead of quoted figures.
+#
+# P&L, balance sheet and cash flow of any number of companies are joined into
+# one long table (a row per company and period), and every ratio is one
+# column expression over it, so all periods of all companies are derived in
+# a single vectorized pass. Results are memoized per company and industry
+# medians per sector until the data they came from changes: the statement
+# provider reports every reload through statement_loaded(), which compares a
+# fingerprint of the new statement with the one the memo was derived from and
+# drops the company and its sector's median only if it differs. A new profile
+# table (market caps, sectors) drops everything. Reading a memo costs no
+# statement lookups.
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+# Statements read and the line items they contribute
+INPUTS = {
+    "Profit & Loss": ["Sales +", "Operating Profit", "Net Profit"],
+    "Balance Sheet": ["Equity Capital", "Reserves", "Borrowings", "Total Assets"],
+    "Cash Flow": ["Cash from Op", "Dividends Paid"],
+}
+# Display order; valuation ratios only exist for the latest period
+RATIOS = ["P/E", "P/B", "Div Yield %", "ROE %", "ROCE %", "Operating Margin %", "Net Margin %",
+          "Debt / Equity", "Asset Turnover", "Cash Conversion"]
+# The profile figures (as in the header and peer table) shown next to the
+# derived ones; P/B is quoted as price over book value
+QUOTED = {"P/E": "PE", "Div Yield %": "Div", "ROE %": "ROE", "ROCE %": "ROCE"}
+
+
+def _long(symbol, statement, frame):
+    # "" + one column per period -> one row per period
+    if frame is None or frame.empty:
+        return None
+    body = frame.set_index("").T
+    items = [item for item in INPUTS[statement] if item in body.columns]
+    body = body[items].apply(pd.to_numeric, errors="coerce")
+    return body.rename_axis("period").reset_index().assign(symbol=symbol)
+
+
+def derive(long, market_cap):
+    # long: symbol, period and line-item columns; market_cap: {symbol: Cr}.
+    # Returns symbol, period and one column per ratio.
+    col = lambda name: long[name] if name in long else pd.Series(np.nan, index=long.index)
+    sales, op, net = col("Sales +"), col("Operating Profit"), col("Net Profit")
+    net_worth = col("Equity Capital") + col("Reserves")
+    borrowings = col("Borrowings")
+    out = long[["symbol", "period"]].copy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["ROE %"] = 100 * net / net_worth
+        out["ROCE %"] = 100 * op / (net_worth + borrowings)
+        out["Operating Margin %"] = 100 * op / sales
+        out["Net Margin %"] = 100 * net / sales
+        out["Debt / Equity"] = borrowings / net_worth
+        out["Asset Turnover"] = sales / col("Total Assets")
+        out["Cash Conversion"] = col("Cash from Op") / net
+        # Valuation: today's market cap against the latest period
+        latest = long["period_end"].eq(long.groupby("symbol")["period_end"].transform("max")).to_numpy()
+        cap = long["symbol"].map(market_cap).to_numpy(dtype=np.float64)
+        out["P/E"] = np.where(latest & (net > 0), cap / net, np.nan)
+        out["P/B"] = np.where(latest, cap / net_worth, np.nan)
+        out["Div Yield %"] = np.where(latest, 100 * col("Dividends Paid").abs() / cap, np.nan)
+    out = out.replace([np.inf, -np.inf], np.nan)
+    return out[["symbol", "period"] + RATIOS]
+
+
+def _join(frames):
+    # Outer join of the per-statement long tables on (symbol, period),
+    # ordered by period end ("Mar 2025"); unparseable periods keep their order
+    merged = None
+    for frame in frames:
+        if frame is not None:
+            merged = frame if merged is None else merged.merge(frame, on=["symbol", "period"], how="outer", sort=False)
+    if merged is None:
+        return None
+    merged["period_end"] = pd.to_datetime(merged["period"], format="%b %Y", errors="coerce")
+    return merged.sort_values(["symbol", "period_end"], kind="stable", na_position="first", ignore_index=True)
+
+
+def _fingerprint(frame):
+    return None if frame is None else (tuple(frame.columns), int(pd.util.hash_pandas_object(frame, index=False).sum()))
+
+
+class RatioEngine:
+    # statement(symbol, name) -> DataFrame or None; profiles() -> ProfileTable
+    def __init__(self, statement, profiles):
+        self.statement = statement
+        self.profiles = profiles
+        # symbol -> (fingerprint per input statement, ratios frame or None)
+        self._company = {}
+        self._industry = {}
+        self._profiles = None
+        self._lock = threading.Lock()
+
+    def _current(self):
+        # The profile table in use; memos made with another one are dropped
+        profiles = self.profiles()
+        with self._lock:
+            if profiles is not self._profiles:
+                self._profiles = profiles
+                self._company.clear()
+                self._industry.clear()
+        return profiles
+
+    def statement_loaded(self, symbol, name, frame):
+        # Called by the statement provider whenever it (re)loads a statement
+        if name not in INPUTS or symbol not in self._company:
+            return
+        fingerprint = _fingerprint(frame)
+        with self._lock:
+            memo = self._company.get(symbol)
+            if memo is None or memo[0][list(INPUTS).index(name)] == fingerprint:
+                return
+            del self._company[symbol]
+            profiles = self._profiles
+            if profiles is not None:
+                self._industry.pop(profiles.sector(symbol), None)
+
+    def _derive(self, symbols, profiles):
+        # One vectorized pass over every company without a memo
+        with self._lock:
+            stale = [symbol for symbol in symbols if symbol not in self._company]
+        if stale:
+            frames = {symbol: [self.statement(symbol, name) for name in INPUTS] for symbol in stale}
+            per_statement = []
+            for i, name in enumerate(INPUTS):
+                parts = [_long(sym, name, frames[sym][i]) for sym in stale]
+                parts = [part for part in parts if part is not None]
+                per_statement.append(pd.concat(parts, ignore_index=True) if parts else None)
+            long = _join(per_statement)
+            market_cap = {sym: profiles.value(sym, "MarketCap") for sym in stale}
+            derived = None if long is None else derive(long, market_cap)
+            with self._lock:
+                for symbol in stale:
+                    rows = None if derived is None else derived[derived["symbol"] == symbol].drop(columns="symbol")
+                    self._company[symbol] = (tuple(_fingerprint(f) for f in frames[symbol]),
+                                             None if rows is None or rows.empty else rows.reset_index(drop=True))
+        with self._lock:
+            return {symbol: self._company[symbol][1] for symbol in symbols}
+
+    def company(self, symbol):
+        # period + RATIOS, oldest period first; None without statements
+        return self._derive([symbol], self._current())[symbol]
+
+    def industry(self, sector):
+        # Median of each ratio's latest value over the sector's companies
+        profiles = self._current()
+        with self._lock:
+            cached = self._industry.get(sector)
+        if cached is not None:
+            return cached
+        frames = self._derive(profiles.in_sector(sector), profiles)
+        latest = [frame[RATIOS].ffill().iloc[-1] for frame in frames.values() if frame is not None]
+        median = pd.DataFrame(latest).median() if latest else pd.Series(np.nan, index=RATIOS)
+        with self._lock:
+            self._industry[sector] = median
+        return median
+
+    def table(self, symbol):
+        # The dashboard's ratio table: derived ratios as rows, periods as
+        # columns, then the industry median and the quoted profile figures
+        frame = self.company(symbol)
+        profiles = self._current()
+        table = pd.DataFrame({"": RATIOS})
+        if frame is not None:
+            for _, row in frame.iterrows():
+                table[row["period"]] = np.round(row[RATIOS].to_numpy(dtype=np.float64), 2)
+        table["Industry Avg"] = np.round(self.industry(profiles.sector(symbol))[RATIOS].to_numpy(dtype=np.float64), 2)
+        quoted = {ratio: profiles.value(symbol, name) for ratio, name in QUOTED.items()}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            quoted["P/B"] = profiles.value(symbol, "Price") / profiles.value(symbol, "Book")
+        table["Quoted"] = np.round([quoted.get(ratio, np.nan) for ratio in RATIOS], 2)
+        return table
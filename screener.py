@@ -0,0 +1,206 @@
+# screener.py
+# Typed fundamentals columns and a small query language evaluated as
+# vectorized boolean masks, e.g.
+#   PE < 20 AND ROE > 15 AND MarketCap > 10000
+#   (ROCE >= 20 OR ROE >= 20) AND NOT Div = 0
+#   Market Cap > 1000 AND 52w High < 900
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Canonical column -> accepted spellings (compared case-insensitively with
+# everything but letters, digits and '/' removed, so "Market Cap" and
+# "52w High" match too)
+FIELDS = {
+    "Price": ["price", "cmp"],
+    "Change": ["change", "chg"],
+    "MarketCap": ["marketcap", "mcap", "mktcap"],
+    "High": ["high", "52whigh", "52weekhigh"],
+    "Low": ["low", "52wlow", "52weeklow"],
+    "PE": ["pe", "p/e"],
+    "Book": ["book", "bookvalue", "bv"],
+    "Div": ["div", "dividend", "dividendyield", "divyield"],
+    "ROCE": ["roce"],
+    "ROE": ["roe"],
+    "NetProfit": ["netprofit", "np", "profit"],
+    # Computed for the whole universe by analytics.py
+    "Return1M": ["return1m", "ret1m"],
+    "Return3M": ["return3m", "ret3m"],
+    "Return1Y": ["return1y", "ret1y", "return"],
+    "Volatility": ["volatility", "vol"],
+    "MaxDrawdown": ["maxdrawdown", "drawdown", "mdd"],
+    "RSI": ["rsi", "rsi14"],
+    "SMA200Gap": ["sma200gap", "sma200"],
+    "ATRPct": ["atrpct", "atr"],
+}
+_ALIASES = {alias: name for name, aliases in FIELDS.items() for alias in aliases + [name.lower()]}
+
+
+def parse_number(text):
+    # "2,57,980 Cr" -> 257980.0 ; "" / "-" -> nan
+    cleaned = re.sub(r"[^0-9.\-]", "", str(text))
+    try:
+        return float(cleaned)
+    except ValueError:
+        return np.nan
+
+
+def field_name(text):
+    key = re.sub(r"[^a-z0-9/]", "", text.lower())
+    if key not in _ALIASES:
+        raise ValueError(f"unknown field {text!r}; try one of {', '.join(FIELDS)}")
+    return _ALIASES[key]
+
+
+# ----------------- Table -----------------
+class FundamentalsTable:
+    def __init__(self, symbols, columns, percentiles=None, sectors=None):
+        self.symbols = np.asarray(symbols, dtype=object)
+        self.columns = {name: np.asarray(col, dtype=np.float64) for name, col in columns.items()}
+        self.position = {sym: i for i, sym in enumerate(self.symbols)}
+        # Precomputed within-sector percentiles and sectors (analytics table)
+        self.percentiles = {name: np.asarray(col, dtype=np.float64) for name, col in (percentiles or {}).items()}
+        self.sectors = None if sectors is None else np.asarray(sectors, dtype=object)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    @classmethod
+    def from_profiles(cls, profiles):
+        # profiles.ProfileTable: its columns already are the fields
+        return cls(profiles.symbols, profiles.columns)
+
+    @classmethod
+    def from_frame(cls, frame):
+        # The analytics.py results table: Name, Sector, FIELDS and <field>Pct
+        columns = {name: frame[name].to_numpy() for name in FIELDS if name in frame}
+        percentiles = {col[:-3]: frame[col].to_numpy() for col in frame.columns
+                       if col.endswith("Pct") and col[:-3] in columns}
+        sectors = frame["Sector"].to_numpy() if "Sector" in frame else None
+        return cls(frame["Name"].to_numpy(), columns, percentiles, sectors)
+
+    def column(self, name):
+        if name not in self.columns:
+            raise ValueError(f"{name} is not computed yet; run python analytics.py")
+        return self.columns[name]
+
+    def mask(self, query):
+        if not query or not query.strip():
+            return np.ones(len(self), dtype=bool)
+        try:
+            return compile_query(query)(self.columns)
+        except KeyError as exc:
+            self.column(exc.args[0])
+            raise
+
+    def screen(self, query, sort_by=None, descending=True, limit=None):
+        idx = np.flatnonzero(self.mask(query))
+        if sort_by:
+            col = self.column(field_name(sort_by))[idx]
+            # NaNs sort last in either direction
+            order = np.argsort(np.where(np.isnan(col), np.inf, -col if descending else col), kind="stable")
+            idx = idx[order]
+        if limit is not None:
+            idx = idx[:limit]
+        frame = pd.DataFrame({name: col[idx] for name, col in self.columns.items()})
+        frame.insert(0, "Name", self.symbols[idx])
+        return frame
+
+
+# ----------------- Query language -----------------
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<word>\d*[A-Za-z_][A-Za-z0-9_/]*)
+      | (?P<num>-?\d+(?:\.\d+)?)
+      | (?P<op><=|>=|!=|==|=|<|>)
+      | (?P<paren>[()])
+      | (?P<bool>&&?|\|\|?)
+    )""", re.VERBOSE)
+
+_OPS = {
+    "<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal,
+    "=": np.equal, "==": np.equal, "!=": np.not_equal,
+}
+
+
+def _tokenize(query):
+    pos, tokens = 0, []
+    query = query.rstrip()
+    while pos < len(query):
+        m = _TOKEN.match(query, pos)
+        if not m or m.end() == pos:
+            raise ValueError(f"cannot parse query near {query[pos:pos + 15]!r}")
+        kind = m.lastgroup
+        value = m.group(kind)
+        if kind == "word" and value.upper() in ("AND", "OR", "NOT"):
+            kind, value = "bool", value.upper()
+        elif kind == "bool":
+            value = "AND" if value.startswith("&") else "OR"
+        tokens.append((kind, value))
+        pos = m.end()
+    return tokens
+
+
+class _Parser:
+    # expr := term (OR term)* ; term := factor (AND factor)*
+    # factor := NOT factor | '(' expr ')' | FIELD OP NUMBER ; FIELD := WORD+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self, kind, value=None):
+        tok = self.peek()
+        if tok[0] != kind or (value is not None and tok[1] != value):
+            raise ValueError(f"expected {value or kind}, got {tok[1] or 'end of query'}")
+        self.pos += 1
+        return tok[1]
+
+    def expr(self):
+        node = self.term()
+        while self.peek() == ("bool", "OR"):
+            self.pos += 1
+            left, right = node, self.term()
+            node = lambda cols, a=left, b=right: a(cols) | b(cols)
+        return node
+
+    def term(self):
+        node = self.factor()
+        while self.peek() == ("bool", "AND"):
+            self.pos += 1
+            left, right = node, self.factor()
+            node = lambda cols, a=left, b=right: a(cols) & b(cols)
+        return node
+
+    def factor(self):
+        kind, value = self.peek()
+        if (kind, value) == ("bool", "NOT"):
+            self.pos += 1
+            inner = self.factor()
+            return lambda cols: ~inner(cols)
+        if (kind, value) == ("paren", "("):
+            self.pos += 1
+            node = self.expr()
+            self.take("paren", ")")
+            return node
+        # Consecutive words are one field name: "Market Cap", "Net Profit"
+        words = [self.take("word")]
+        while self.peek()[0] == "word":
+            words.append(self.take("word"))
+        name = field_name(" ".join(words))
+        op = _OPS[self.take("op")]
+        number = float(self.take("num"))
+        return lambda cols: op(cols[name], number)
+
+
+@lru_cache(maxsize=256)
+def compile_query(query):
+    parser = _Parser(_tokenize(query))
+    node = parser.expr()
+    if parser.pos != len(parser.tokens):
+        raise ValueError(f"unexpected {parser.peek()[1]!r}")
+    return node
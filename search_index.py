@@ -0,0 +1,114 @@
+# search_index.py
+# Typeahead over company names, tickers and aliases.
+#
+# Keys are normalized by case-folding and dropping everything but letters and
+# digits, so "M&M", "m & m" and "M & M" are the same key. Two structures are
+# built once:
+#   - a prefix trie whose nodes keep the best-ranked entries below them, so a
+#     prefix lookup costs O(len(prefix)) no matter how many symbols match
+#   - a trigram -> entries posting index for typo-tolerant matches, scored
+#     with the Dice coefficient
+import re
+from bisect import insort
+
+import numpy as np
+
+TOP_K = 16
+
+
+def normalize(text):
+    return re.sub(r"[^0-9a-z]", "", text.casefold())
+
+
+def words(text):
+    return [w for w in re.split(r"[^0-9a-z]+", text.casefold()) if w]
+
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    def __init__(self, entries, weights=None):
+        # entries: list of (name, ticker, aliases); weights rank ties (e.g. market cap)
+        self.names = [name for name, _, _ in entries]
+        n = len(self.names)
+        self.weights = np.zeros(n) if weights is None else np.nan_to_num(np.asarray(weights, dtype=np.float64))
+        # Rank of every entry by weight, best first; lists in the trie stay in this order
+        self.rank = np.empty(n, dtype=np.int64)
+        self.rank[np.argsort(-self.weights, kind="stable")] = np.arange(n)
+
+        self.exact = {}
+        self.trie = {}
+        postings = {}
+        self.tri_count = np.zeros(n, dtype=np.int64)
+        for i, (name, ticker, aliases) in enumerate(entries):
+            full_keys = {normalize(k) for k in [name, ticker, *aliases] if normalize(k)}
+            word_keys = {w for k in [name, *aliases] for w in words(k)}
+            for key in full_keys:
+                self.exact.setdefault(key, []).append(i)
+            for key in full_keys | word_keys:
+                self._insert(key, i, full=key in full_keys)
+            grams = set().union(*(trigrams(k) for k in full_keys)) if full_keys else set()
+            self.tri_count[i] = len(grams)
+            for g in grams:
+                postings.setdefault(g, []).append(i)
+        self.postings = {g: np.asarray(ids, dtype=np.int64) for g, ids in postings.items()}
+
+    def _insert(self, key, i, full):
+        # Each node: {"c": children, "ids": best TOP_K (is_word, rank, id)};
+        # full-name prefixes outrank prefixes of a later word
+        entry = (0 if full else 1, int(self.rank[i]), i)
+        node = self.trie
+        for ch in key:
+            node = node.setdefault("c", {}).setdefault(ch, {})
+            ids = node.setdefault("ids", [])
+            if len(ids) == TOP_K and entry > ids[-1]:
+                continue
+            insort(ids, entry)
+            del ids[TOP_K:]
+
+    def _prefix(self, key):
+        node = self.trie
+        for ch in key:
+            node = node.get("c", {}).get(ch)
+            if node is None:
+                return []
+        # An entry can sit in a node as both a full-name and a word prefix
+        seen, out = set(), []
+        for _, _, i in node.get("ids", []):
+            if i not in seen:
+                seen.add(i)
+                out.append(i)
+        return out
+
+    def _fuzzy(self, key, limit):
+        grams = [g for g in trigrams(key) if g in self.postings]
+        if not grams:
+            return [], []
+        hits = np.bincount(np.concatenate([self.postings[g] for g in grams]), minlength=len(self.names))
+        candidates = np.flatnonzero(hits)
+        score = 2.0 * hits[candidates] / (len(trigrams(key)) + self.tri_count[candidates])
+        keep = score >= 0.3
+        candidates, score = candidates[keep], score[keep]
+        order = np.lexsort((self.rank[candidates], -score))[:limit]
+        return candidates[order].tolist(), score[order].tolist()
+
+    def search(self, query, limit=10):
+        key = normalize(query)
+        if not key:
+            return []
+        ranked, seen = [], set()
+
+        def add(ids):
+            for i in ids:
+                if i not in seen and len(ranked) < limit:
+                    seen.add(i)
+                    ranked.append(i)
+
+        add(sorted(self.exact.get(key, []), key=lambda i: self.rank[i]))
+        add(self._prefix(key))
+        if len(ranked) < limit:
+            add(self._fuzzy(key, limit)[0])
+        return [self.names[i] for i in ranked]
@@ -0,0 +1,142 @@
+# statements_store.py
+# Financial statements on disk, one columnar file per statement:
+#   <root>/quarterly.parquet, profit_loss.parquet, balance_sheet.parquet,
+#   cash_flow.parquet   (or .arrow for Arrow IPC, memory-mapped)
+#
+# Each file holds every company: columns symbol, period, period_end and one
+# float column per line item, sorted by symbol and written in row groups of a
+# few symbols, so reading one company touches only its row groups and only the
+# requested line items. Arrow files get record batches of the same blocks, and
+# a binary search over them maps only the batches holding the company.
+import bisect
+import os
+import sys
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # the apps fall back to their built-in tables
+    pa = pc = pq = None
+
+from cache import LRUCache
+
+STATEMENTS = {
+    "Quarterly": ("quarterly", ["Sales +", "Expenses +", "Operating Profit", "Net Profit"]),
+    "Profit & Loss": ("profit_loss", ["Sales +", "Expenses +", "Operating Profit", "Net Profit"]),
+    "Balance Sheet": ("balance_sheet", ["Equity Capital", "Reserves", "Borrowings", "Total Liabilities",
+                                        "Total Assets"]),
+    "Cash Flow": ("cash_flow", ["Cash from Op", "Cash from Investing", "Dividends Paid", "Net Cash Flow"]),
+}
+KEY_COLUMNS = ["symbol", "period", "period_end"]
+SYMBOLS_PER_ROW_GROUP = 16
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for the statements store (pip install pyarrow)")
+
+
+# ----------------- Reader -----------------
+class StatementsStore:
+    def __init__(self, root, maxsize=32):
+        _require_pyarrow()
+        self.root = root
+        # Only recently viewed (company, statement) frames stay in memory
+        self.cache = LRUCache(maxsize)
+
+    def path(self, statement):
+        stem = STATEMENTS[statement][0]
+        for ext in (".parquet", ".arrow"):
+            path = os.path.join(self.root, stem + ext)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _read(self, statement, symbol, columns):
+        # Line items missing from an older file are skipped
+        path = self.path(statement)
+        if path is None:
+            return None
+        if path.endswith(".parquet"):
+            names = set(pq.read_schema(path).names)
+            return pq.read_table(path, columns=[c for c in columns if c in names], filters=[("symbol", "=", symbol)])
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            # Batches are symbol blocks in symbol order: start at the first one
+            # ending at or after the symbol, stop at the first starting past it
+            i = bisect.bisect_left(range(reader.num_record_batches), symbol,
+                                   key=lambda i: reader.get_batch(i)["symbol"][-1].as_py())
+            batches = []
+            while i < reader.num_record_batches:
+                batch = reader.get_batch(i)
+                if batch.num_rows and batch["symbol"][0].as_py() > symbol:
+                    break
+                batches.append(batch)
+                i += 1
+            table = pa.Table.from_batches(batches, reader.schema)
+            table = table.select([c for c in columns if c in table.column_names])
+            return table.filter(pc.equal(table["symbol"], symbol))
+
+    def load(self, symbol, statement, items=None):
+        # Long history for one company as the dashboard shows it: line items as
+        # rows, periods as columns, oldest first. None when there is no data.
+        items = tuple(items or STATEMENTS[statement][1])
+        return self.cache.get_or_set((symbol, statement, items),
+                                     lambda: self._load(symbol, statement, items))
+
+    def _load(self, symbol, statement, items):
+        table = self._read(statement, symbol, KEY_COLUMNS + list(items))
+        if table is None or table.num_rows == 0:
+            return None
+        df = table.to_pandas().sort_values("period_end")
+        frame = df.set_index("period")[[item for item in items if item in df]].T
+        frame.columns.name = None
+        return frame.rename_axis("").reset_index()
+
+
+def open_statements_store(root):
+    if pa is None or not os.path.isdir(root):
+        return None
+    return StatementsStore(root)
+
+
+# ----------------- Writer -----------------
+def write_statement(root, statement, frame, fmt="parquet"):
+    # frame: long table with KEY_COLUMNS plus the statement's line items
+    _require_pyarrow()
+    os.makedirs(root, exist_ok=True)
+    stem, items = STATEMENTS[statement]
+    items = [item for item in items if item in frame]
+    frame = frame[KEY_COLUMNS + items].sort_values(["symbol", "period_end"], kind="stable")
+    frame = frame.astype({item: "float64" for item in items})
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    path = os.path.join(root, f"{stem}.{'parquet' if fmt == 'parquet' else 'arrow'}")
+    # Row groups aligned to symbol blocks keep the Parquet min/max statistics
+    # tight; Arrow files get record batches of the same blocks
+    symbols = frame["symbol"].to_numpy()
+    starts = [0] + [i for i in range(1, len(symbols)) if symbols[i] != symbols[i - 1]]
+    bounds = starts[::SYMBOLS_PER_ROW_GROUP] + [len(symbols)]
+    blocks = [table.slice(lo, hi - lo) for lo, hi in zip(bounds[:-1], bounds[1:])]
+    if fmt == "parquet":
+        with pq.ParquetWriter(path, table.schema) as writer:
+            for block in blocks:
+                writer.write_table(block)
+    else:
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            for block in blocks:
+                writer.write_table(block)
+    return path
+
+
+def import_csv(root, statement, csv_path, fmt="parquet"):
+    frame = pd.read_csv(csv_path, parse_dates=["period_end"])
+    return write_statement(root, statement, frame, fmt)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (4, 5):
+        sys.exit('usage: python statements_store.py <store_dir> "<statement>" <csv> [parquet|arrow]')
+    import_csv(sys.argv[1], sys.argv[2], sys.argv[3], *(sys.argv[4:]))
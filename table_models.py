@@ -0,0 +1,161 @@
+# table_models.py
+# Qt model/view tables backed by column arrays instead of one QTableWidgetItem
+# per cell. Cells are formatted only when the view asks for them (visible
+# rows), sorting is one numpy argsort, and filtering evaluates a vectorized
+# mask once per filter change.
+import numpy as np
+import pandas as pd
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt
+
+SORT_ROLE = Qt.ItemDataRole.UserRole
+
+
+def _sort_key(values):
+    # Numeric columns sort by value; text like "1,250" or "17%" sorts as a
+    # number when every non-empty cell parses, otherwise case-insensitively
+    if values.dtype.kind in "biuf":
+        return values.astype(np.float64)
+    text = pd.Series(values, dtype=object).astype(str)
+    numbers = pd.to_numeric(text.str.replace(r"[,%₹\s]|Cr$", "", regex=True), errors="coerce")
+    if numbers.notna().sum() == (text.str.strip() != "").sum():
+        return numbers.to_numpy(dtype=np.float64)
+    return text.str.casefold().to_numpy(dtype=object)
+
+
+class ColumnTableModel(QAbstractTableModel):
+    def __init__(self, frame=None, formats=None, parent=None):
+        super().__init__(parent)
+        self.formats = formats or {}
+        self.set_frame(frame if frame is not None else pd.DataFrame())
+
+    def set_frame(self, frame):
+        # frame: DataFrame, dict of columns, or list of rows (first row = data)
+        if isinstance(frame, list):
+            frame = pd.DataFrame(frame, columns=[f"Col {i+1}" for i in range(len(frame[0]))] if frame else None)
+        elif not isinstance(frame, pd.DataFrame):
+            frame = pd.DataFrame(frame)
+        self.beginResetModel()
+        self.headers = [str(c) for c in frame.columns]
+        self.columns = [frame[c].to_numpy() for c in frame.columns]
+        self._keys = [None] * len(self.columns)
+        self.order = np.arange(len(frame))
+        self.endResetModel()
+
+    def update_rows(self, rows, values):
+        # values: {header: new values for `rows`}. Only those rows repaint; the
+        # order is kept until the next sort.
+        rows = np.asarray(rows, dtype=np.int64)
+        if not len(rows):
+            return
+        for name, new in values.items():
+            col = self.headers.index(name)
+            if not self.columns[col].flags.writeable:
+                self.columns[col] = self.columns[col].copy()
+            self.columns[col][rows] = new
+            self._keys[col] = None
+        position = np.empty(len(self.order), dtype=np.int64)
+        position[self.order] = np.arange(len(self.order))
+        last = len(self.columns) - 1
+        for row in np.sort(position[rows]).tolist():
+            self.dataChanged.emit(self.index(row, 0), self.index(row, last))
+
+    def sort_key(self, column):
+        if self._keys[column] is None:
+            self._keys[column] = _sort_key(self.columns[column])
+        return self._keys[column]
+
+    # ----------------- Qt model API -----------------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        value = self.columns[index.column()][self.order[index.row()]]
+        if role == Qt.ItemDataRole.DisplayRole:
+            if isinstance(value, (float, np.floating)):
+                if np.isnan(value):
+                    return ""
+                return self.formats.get(self.headers[index.column()], "{:,.2f}").format(value)
+            if isinstance(value, (np.integer, int)) and not isinstance(value, bool):
+                return self.formats.get(self.headers[index.column()], "{:,}").format(value)
+            return str(value)
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            if self.columns[index.column()].dtype.kind in "biuf":
+                return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            return None
+        if role == SORT_ROLE:
+            key = self.sort_key(index.column())[self.order[index.row()]]
+            return key.item() if isinstance(key, np.generic) else key
+        return None
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        if not 0 <= column < len(self.columns):
+            return
+        key = self.sort_key(column)
+        if key.dtype == object:
+            ranks = np.argsort(key.astype(str), kind="stable")
+        else:
+            # NaNs last in both directions
+            ranks = np.argsort(np.where(np.isnan(key), np.inf, key), kind="stable")
+        if order == Qt.SortOrder.DescendingOrder:
+            valid = len(ranks) if key.dtype == object else int((~np.isnan(key)).sum())
+            ranks = np.concatenate((ranks[:valid][::-1], ranks[valid:]))
+        self.layoutAboutToBeChanged.emit()
+        old = self.persistentIndexList()
+        position = np.empty(len(ranks), dtype=np.int64)
+        position[ranks] = np.arange(len(ranks))
+        new = [self.index(int(position[self.order[i.row()]]), i.column()) for i in old]
+        self.order = ranks
+        self.changePersistentIndexList(old, new)
+        self.layoutChanged.emit()
+
+
+class ColumnFilterProxy(QSortFilterProxyModel):
+    # Filtering runs as a numpy mask over the source columns; sorting is handed
+    # to the source model so it stays one argsort instead of O(n log n)
+    # Python comparisons
+    def __init__(self, source, parent=None):
+        super().__init__(parent)
+        self.mask = None
+        self.setSourceModel(source)
+        source.modelReset.connect(self.clear_filter)
+
+    def clear_filter(self):
+        self.mask = None
+        self.invalidateRowsFilter()
+
+    def set_text_filter(self, text, column=0):
+        source = self.sourceModel()
+        if not text:
+            self.mask = None
+        else:
+            values = pd.Series(source.columns[column], dtype=object).astype(str)
+            self.mask = values.str.contains(text, case=False, regex=False).to_numpy()
+        self.invalidateRowsFilter()
+
+    def set_range_filter(self, column, low=None, high=None):
+        key = self.sourceModel().sort_key(column)
+        mask = np.ones(len(key), dtype=bool)
+        if low is not None:
+            mask &= key >= low
+        if high is not None:
+            mask &= key <= high
+        self.mask = mask
+        self.invalidateRowsFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.mask is None:
+            return True
+        return bool(self.mask[self.sourceModel().order[source_row]])
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.sourceModel().sort(column, order)
@@ -8,34 +8,8 @@ from PyQt6.QtGui import QFont, QColor
 from PyQt6.QtCore import Qt
 from PyQt6.QtCharts import QChart, QChartView, QLineSeries, QCandlestickSeries, QCandlestickSet
 
-# ----------------- Dummy Data -----------------
-def get_key_metrics():
-    return {
-        "Market Cap": "1,23,456 Cr",
-        "Current Price": "1,234",
-        "P/E": "25.3",
-        "ROCE": "18%",
-        "ROE": "15%",
-        "Dividend Yield": "1.2%",
-        "Book Value": "450"
-    }
-
-# Additional dummy data for chart
-def get_stock_data():
-    # returns list of tuples: (open, high, low, close)
-    return [
-        (100, 110, 95, 105),
-        (105, 115, 100, 110),
-        (110, 120, 105, 115),
-        (115, 125, 110, 120),
-        (120, 130, 115, 125),
-        (125, 140, 120, 135),
-        (135, 150, 130, 145),
-        (140, 155, 135, 150)
-    ]
-
-def get_line_chart_data():
-    return [100, 120, 115, 130, 125, 140, 150, 160]
+# ----------------- Data -----------------
+from providers.compat import get_key_metrics, get_line_chart_data, get_stock_data
 
 # ----------------- Main Application -----------------
 class MarketPulseApp(QMainWindow):
@@ -196,34 +170,8 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtGui import QFont, QColor
 
-# ----------------- Dummy Data -----------------
-def get_pros_cons():
-    return {
-        "Pros": [
-            "Strong balance sheet", "High ROE", "Consistent dividend",
-            "Good management", "Strong growth in past years",
-            "Efficient cost management", "Low debt-to-equity ratio",
-            "High operating margin", "Expanding market share", "Stable cash flows"
-        ],
-        "Cons": [
-            "High debt", "Cyclical industry", "Limited growth",
-            "Vulnerable to regulation changes", "Low liquidity",
-            "Dependence on single product", "Exposure to currency fluctuations",
-            "High competition", "Slow innovation", "Geopolitical risks"
-        ]
-    }
-
-def get_peers():
-    return [
-        ["Company A", "1200", "24", "17%"], ["Company B", "980", "22", "14%"],
-        ["Company C", "1500", "28", "19%"], ["Company D", "1350", "26", "16%"],
-        ["Company E", "900", "21", "13%"], ["Company F", "1100", "23", "15%"],
-        ["Company G", "1400", "27", "18%"], ["Company H", "1250", "25", "16%"],
-        ["Company I", "1450", "29", "20%"], ["Company J", "1300", "24", "17%"],
-        ["Company K", "1150", "22", "15%"], ["Company L", "1050", "23", "14%"],
-        ["Company M", "950", "21", "13%"], ["Company N", "1250", "25", "16%"],
-        ["Company O", "1400", "28", "18%"], ["Company P", "1500", "30", "19%"]
-    ]
+# ----------------- Data -----------------
+from providers.compat import get_peers, get_pros_cons
 
 # ----------------- Pros & Cons Section -----------------
 def create_pros_cons_section():
@@ -332,23 +280,8 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtGui import QFont
 
-# ----------------- Dummy Data for Financials -----------------
-def get_financials(tab_name):
-    if tab_name == "Quarterly":
-        return [[f"Q{i} 2025", str(1000+i*50), str(150+i*5), str(120+i*5)] for i in range(12)]
-    elif tab_name == "Profit & Loss":
-        return [[f"{2025-i}", str(5000-i*100), str(700-i*10), str(600-i*10)] for i in range(12)]
-    elif tab_name == "Balance Sheet":
-        return [[f"{2025-i}", str(20000-i*500), str(5000-i*50), str(15000-i*450)] for i in range(12)]
-    elif tab_name == "Cashflows":
-        return [[f"{2025-i}", str(600-i*10), str(400-i*5), str(200-i*5)] for i in range(12)]
-    elif tab_name == "Ratios":
-        return [[f"{2025-i}", str(25-i), f"{18-i}%", f"{15-i}%"] for i in range(12)]
-    elif tab_name == "Shareholding":
-        return [
-            ["Promoters", "50%"], ["Institutional", "30%"], ["Retail", "20%"]
-        ]
-    return []
+# ----------------- Data -----------------
+from providers.compat import get_financials
 
 # ----------------- Financial Tabs -----------------
 def create_financial_tabs():
@@ -437,78 +370,74 @@ if __name__ == "__main__":
 
 # marketpulse_final.py
 import sys
+import os
+import numpy as np
+import pandas as pd
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QLineEdit, QPushButton, QFrame, QScrollArea, QTabWidget, QTableWidget,
-    QTableWidgetItem, QHeaderView
+    QTableWidgetItem, QHeaderView, QMenu, QCompleter, QTableView, QFileDialog
 )
-from PyQt6.QtGui import QFont, QColor
-from PyQt6.QtCharts import QChart, QChartView, QLineSeries, QCandlestickSeries, QCandlestickSet
-
-# ----------------- DUMMY DATA -----------------
-def get_key_metrics():
-    return {
-        "Market Cap": "1,23,456 Cr",
-        "Current Price": "1,234",
-        "P/E": "25.3",
-        "ROCE": "18%",
-        "ROE": "15%",
-        "Dividend Yield": "1.2%",
-        "Book Value": "450"
-    }
-
-def get_stock_data():
-    return [
-        (100,110,95,105),(105,115,100,110),(110,120,105,115),
-        (115,125,110,120),(120,130,115,125),(125,140,120,135),
-        (135,150,130,145),(140,155,135,150)
-    ]
-
-def get_line_chart_data():
-    return [100,120,115,130,125,140,150,160]
-
-def get_pros_cons():
-    return {
-        "Pros":[
-            "Strong balance sheet","High ROE","Consistent dividend",
-            "Good management","Strong growth in past years",
-            "Efficient cost management","Low debt-to-equity ratio",
-            "High operating margin","Expanding market share","Stable cash flows"
-        ],
-        "Cons":[
-            "High debt","Cyclical industry","Limited growth",
-            "Vulnerable to regulation changes","Low liquidity",
-            "Dependence on single product","Exposure to currency fluctuations",
-            "High competition","Slow innovation","Geopolitical risks"
-        ]
-    }
-
-def get_peers():
-    return [
-        ["Company A","1200","24","17%"],["Company B","980","22","14%"],
-        ["Company C","1500","28","19%"],["Company D","1350","26","16%"],
-        ["Company E","900","21","13%"],["Company F","1100","23","15%"],
-        ["Company G","1400","27","18%"],["Company H","1250","25","16%"],
-        ["Company I","1450","29","20%"],["Company J","1300","24","17%"],
-        ["Company K","1150","22","15%"],["Company L","1050","23","14%"],
-        ["Company M","950","21","13%"],["Company N","1250","25","16%"],
-        ["Company O","1400","28","18%"],["Company P","1500","30","19%"]
-    ]
-
-def get_financials(tab_name):
-    if tab_name=="Quarterly":
-        return [[f"Q{i} 2025", str(1000+i*50), str(150+i*5), str(120+i*5)] for i in range(12)]
-    elif tab_name=="Profit & Loss":
-        return [[f"{2025-i}", str(5000-i*100), str(700-i*10), str(600-i*10)] for i in range(12)]
-    elif tab_name=="Balance Sheet":
-        return [[f"{2025-i}", str(20000-i*500), str(5000-i*50), str(15000-i*450)] for i in range(12)]
-    elif tab_name=="Cashflows":
-        return [[f"{2025-i}", str(600-i*10), str(400-i*5), str(200-i*5)] for i in range(12)]
-    elif tab_name=="Ratios":
-        return [[f"{2025-i}", str(25-i), f"{18-i}%", f"{15-i}%"] for i in range(12)]
-    elif tab_name=="Shareholding":
-        return [["Promoters","50%"],["Institutional","30%"],["Retail","20%"]]
-    return []
+from PyQt6.QtGui import QFont, QColor, QActionGroup
+from PyQt6.QtCore import Qt, QPointF, QStringListModel, QTimer
+from PyQt6.QtCharts import QBarCategoryAxis, QChart, QChartView, QLineSeries, QCandlestickSeries, QCandlestickSet, QValueAxis
+
+from async_loader import AsyncLoader
+from backtest import STRATEGIES, run as run_backtest
+from downsample import for_view, lttb, period_keys
+from export import DATASETS, EXPORT_DIR, SINKS, export
+from indicators import INDICATORS, IndicatorEngine, available
+from live_feed import LiveFeed, load_tape, synthetic_tape
+from lazy_widgets import LazyScrollWatcher, LazySection, LazyTabWidget, LoadingPlaceholder
+from ohlcv_store import Bars
+from providers import default_market_data
+from search_index import SearchIndex
+from table_models import ColumnFilterProxy, ColumnTableModel
+from theme import ThemeEngine, chart_background
+from timings import DEBUG, METRICS_PORT, TIMINGS, timed
+from timings import serve as serve_metrics
+from universe import UNIVERSE
+from watchlist import WatchlistRefresher, WatchlistStore
+
+# Built once; the header search box queries it on every keystroke
+SEARCH_INDEX=SearchIndex(UNIVERSE)
+TICKS_PATH=os.environ.get("MARKETPULSE_TICKS","data/ticks.csv")
+LIVE_REFRESH_MS=100
+WATCHLIST_POLL_MS=500
+_live_feed=None
+_watchlist=None
+
+# ----------------- DATA -----------------
+# Shared provider chain (files, built-in samples, optional HTTP server)
+DATA=default_market_data()
+CHART_DAYS=365
+
+def get_financial_frame(tab_name,symbol):
+    return DATA.ratios(symbol) if tab_name=="Ratios" else DATA.statement(symbol,tab_name)
+
+def most_correlated(symbol,k=8):
+    closest=DATA.correlations().most_correlated(symbol,k)
+    return closest.rename_axis("Most correlated").reset_index()
+
+def get_live_feed():
+    # Started on first use and shared by every window
+    global _live_feed
+    if _live_feed is None:
+        tape=load_tape(TICKS_PATH) if os.path.exists(TICKS_PATH) else \
+            synthetic_tape(dict(zip(DATA.profiles().symbols,DATA.profiles().columns["Price"].tolist())))
+        _live_feed=LiveFeed(tape).start()
+        if _watchlist is not None:
+            _watchlist.live=_live_feed
+    return _live_feed
+
+def get_watchlist():
+    # One refresher per process: a batched quote request per interval
+    global _watchlist
+    if _watchlist is None:
+        _watchlist=WatchlistRefresher(WatchlistStore(),DATA.quotes)
+        _watchlist.live=_live_feed
+        _watchlist.start()
+    return _watchlist
 
 # ----------------- MAIN APP -----------------
 class MarketPulseApp(QMainWindow):
@@ -516,7 +445,24 @@ class MarketPulseApp(QMainWindow):
         super().__init__()
         self.setWindowTitle("MarketPulse - Final Clone")
         self.setGeometry(100,100,1300,950)
-        self.is_dark=False
+        # App-wide stylesheet shared by every window; see theme.py
+        self.theme=ThemeEngine.instance()
+        self.theme.changed.connect(self.on_theme_changed)
+        self.company=None
+        self.indicators=[]
+        self.indicator_engine=IndicatorEngine()
+        self.strategy=None
+        self.live_timer=QTimer(self)
+        self.live_timer.setInterval(LIVE_REFRESH_MS)
+        self.live_timer.timeout.connect(self.update_live)
+        self.watchlist_table=None
+        self.watchlist_timer=QTimer(self)
+        self.watchlist_timer.setInterval(WATCHLIST_POLL_MS)
+        self.watchlist_timer.timeout.connect(self.update_watchlist)
+        # Providers run off the GUI thread; widgets show placeholders meanwhile
+        self.loader=AsyncLoader(self)
+        # Exports outlive company changes, so they are not on self.loader
+        self.export_loader=AsyncLoader(self,max_threads=1)
         self.initUI()
 
     def initUI(self):
@@ -533,71 +479,247 @@ class MarketPulseApp(QMainWindow):
         # Header
         self.header_widget=self.create_header()
         self.main_layout.addWidget(self.header_widget)
+        # Watchlist, shown from the header button
+        self.watchlist_slot=QWidget()
+        self.watchlist_slot.setLayout(QVBoxLayout())
+        self.watchlist_slot.layout().setContentsMargins(0,0,0,0)
+        self.watchlist_slot.hide()
+        self.main_layout.addWidget(self.watchlist_slot)
 
         # Key Metrics
-        self.metrics_layout=self.create_key_metrics()
-        self.main_layout.addLayout(self.metrics_layout)
+        self.metric_cards=[]
+        self.metrics_slot=LoadingPlaceholder("Loading key metrics…",60)
+        self.main_layout.addWidget(self.metrics_slot)
+        self.load_key_metrics()
 
         # Stock Chart
         self.chart_view=self.create_stock_chart()
         self.main_layout.addWidget(self.chart_view)
-
+        self.load_stock_chart()
+        self.indicator_panels=QWidget()
+        self.indicator_panels.setLayout(QVBoxLayout())
+        self.indicator_panels.layout().setContentsMargins(0,0,0,0)
+        self.indicator_panels.hide()
+        self.panel_charts=[]
+        self.main_layout.addWidget(self.indicator_panels)
+        # Backtest equity curve, shown once a strategy is picked
+        self.backtest_chart=None
+        self.backtest_view=QChartView()
+        self.backtest_view.setMinimumHeight(220)
+        self.backtest_view.hide()
+        self.main_layout.addWidget(self.backtest_view)
+
+        # Below the fold: built when scrolled into view
+        self.pros_cards=[]
+        self.peers_table=None
+        self.financial_tabs=None
         # Pros & Cons
-        self.pros_layout,self.pros_cards=self.create_pros_cons()
-        self.main_layout.addLayout(self.pros_layout)
+        self.pros_section=LazySection(self.build_pros_cons,150)
+        self.main_layout.addWidget(self.pros_section)
 
         # Peers Table
-        self.peers_table=self.create_peers_table()
-        self.main_layout.addWidget(self.peers_table)
+        self.peers_section=LazySection(self.build_peers_section,340)
+        self.main_layout.addWidget(self.peers_section)
 
         # Financial Tabs
-        self.financial_tabs,self.fin_tables=self.create_financial_tabs()
-        self.main_layout.addWidget(self.financial_tabs)
+        self.tabs_section=LazySection(self.build_financial_tabs,300)
+        self.main_layout.addWidget(self.tabs_section)
+        self.lazy_sections=[self.pros_section,self.peers_section,self.tabs_section]
+        self.scroll_watcher=LazyScrollWatcher(scroll_area,self.lazy_sections)
 
-        # Apply theme
-        self.apply_theme()
+        # Render timings (MARKETPULSE_DEBUG=1)
+        if DEBUG:
+            self.timings_table=self.create_timings_panel()
+            self.main_layout.addWidget(self.timings_table)
+
+    def symbol(self):
+        return self.company or DATA.companies()[0]
 
     # ----------------- Header -----------------
+    @timed("create_header")
     def create_header(self):
         header=QFrame()
         layout=QHBoxLayout()
         layout.setContentsMargins(10,5,10,5)
         layout.setSpacing(10)
         self.title_lbl=QLabel("MarketPulse")
+        self.title_lbl.setObjectName("title")
         self.title_lbl.setFont(QFont("Arial",16,QFont.Weight.Bold))
         layout.addWidget(self.title_lbl)
         layout.addStretch()
         self.search_box=QLineEdit()
         self.search_box.setPlaceholderText("Search Stocks")
         self.search_box.setFixedWidth(250)
+        # The index does the matching, so the completer must not filter again
+        self.search_model=QStringListModel()
+        completer=QCompleter(self.search_model,self.search_box)
+        completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        completer.activated.connect(self.select_company)
+        self.search_box.setCompleter(completer)
+        self.search_box.textEdited.connect(self.update_search)
+        self.search_box.returnPressed.connect(self.submit_search)
         layout.addWidget(self.search_box)
         self.follow_btn=QPushButton("Follow")
+        self.follow_btn.setCheckable(True)
+        self.follow_btn.setEnabled(False)
+        self.follow_btn.clicked.connect(self.toggle_follow)
         self.export_btn=QPushButton("Export")
+        menu=QMenu(self.export_btn)
+        for scope in ["This company","All companies"]:
+            scope_menu=menu.addMenu(scope)
+            for fmt,sink in SINKS.items():
+                scope_menu.addAction(sink.label).triggered.connect(
+                    lambda checked,scope=scope,fmt=fmt:self.start_export(scope=="All companies",fmt))
+        self.export_btn.setMenu(menu)
         self.watchlist_btn=QPushButton("Watchlist")
-        self.mode_btn=QPushButton("Dark Mode")
+        self.watchlist_btn.setCheckable(True)
+        self.watchlist_btn.toggled.connect(self.toggle_watchlist)
+        self.indicators_btn=QPushButton("Indicators")
+        self.indicators_btn.setMenu(QMenu(self.indicators_btn))
+        self.backtest_btn=QPushButton("Backtest")
+        menu=QMenu(self.backtest_btn)
+        group=QActionGroup(menu)
+        for name in ["None"]+list(STRATEGIES):
+            action=group.addAction(name)
+            action.setCheckable(True)
+            action.setChecked(name=="None")
+            action.triggered.connect(lambda checked,name=name:self.select_backtest(name))
+            menu.addAction(action)
+        self.backtest_btn.setMenu(menu)
+        self.live_btn=QPushButton("Live")
+        self.live_btn.setCheckable(True)
+        self.live_btn.toggled.connect(self.toggle_live)
+        self.mode_btn=QPushButton("Light Mode" if self.theme.is_dark else "Dark Mode")
         self.mode_btn.clicked.connect(self.toggle_mode)
-        for btn in [self.follow_btn,self.export_btn,self.watchlist_btn,self.mode_btn]:
+        for btn in [self.follow_btn,self.export_btn,self.watchlist_btn,self.indicators_btn,self.backtest_btn,self.live_btn,self.mode_btn]:
             layout.addWidget(btn)
         header.setLayout(layout)
-        header.setStyleSheet("border-bottom:1px solid gray; padding:5px;")
+        header.setObjectName("header")
         return header
 
+    def update_search(self,text):
+        self.search_model.setStringList(SEARCH_INDEX.search(text))
+
+    def submit_search(self):
+        matches=SEARCH_INDEX.search(self.search_box.text(),limit=1)
+        if matches:
+            self.select_company(matches[0])
+
+    def select_company(self,name):
+        self.company=name
+        self.search_box.setText(name)
+        self.title_lbl.setText(f"MarketPulse · {name}")
+        self.update_follow()
+        # Results still in flight belong to the previous company
+        self.loader.cancel()
+        self.live_timer.stop()
+        self.reload_key_metrics()
+        self.load_stock_chart()
+        # Company-specific sections rebuild when next in view
+        self.pros_cards=[]
+        self.peers_table=None
+        self.financial_tabs=None
+        for section in self.lazy_sections:
+            section.reset()
+        self.scroll_watcher.check()
+
+    # ----------------- Watchlist -----------------
+    def toggle_follow(self,checked):
+        watchlist=get_watchlist()
+        if checked:
+            watchlist.follow(self.company)
+        else:
+            watchlist.unfollow(self.company)
+        self.update_follow()
+
+    def update_follow(self):
+        following=get_watchlist().following(self.company)
+        self.follow_btn.setEnabled(True)
+        self.follow_btn.setChecked(following)
+        self.follow_btn.setText("Following" if following else "Follow")
+
+    def toggle_watchlist(self,checked):
+        if not checked:
+            self.watchlist_timer.stop()
+            self.watchlist_slot.hide()
+            return
+        if self.watchlist_table is None:
+            self.watchlist_table=self.create_watchlist_table()
+            self.watchlist_slot.layout().addWidget(self.watchlist_table)
+        self.watch_layout,self.watch_version=None,0
+        self.update_watchlist()
+        self.watchlist_slot.show()
+        self.watchlist_timer.start()
+
+    @timed("create_watchlist_table")
+    def create_watchlist_table(self):
+        table=self.create_table_view(None,{"Change":"{:+,.2f}","Change %":"{:+.2f}%"})
+        table.setMinimumHeight(220)
+        table.doubleClicked.connect(lambda index:self.select_company(index.siblingAtColumn(0).data()))
+        return table
+
+    def update_watchlist(self):
+        # Polls the shared board: a changed list rebuilds the model, otherwise
+        # only rows whose quote changed since the last poll repaint
+        board=get_watchlist().board
+        layout,version,rows,frame=board.changed_since(self.watch_version)
+        model=self.watchlist_table.model().sourceModel()
+        if layout!=self.watch_layout:
+            model.set_frame(board.frame())
+        elif len(rows):
+            model.update_rows(rows,{c:frame[c].to_numpy() for c in ["Price","Change","Change %"]})
+        self.watch_layout,self.watch_version=layout,version
+
+    # ----------------- Export -----------------
+    def choose_export_dir(self):
+        return QFileDialog.getExistingDirectory(self,"Export to",EXPORT_DIR)
+
+    def start_export(self,universe,fmt):
+        out_dir=self.choose_export_dir()
+        if not out_dir:
+            return
+        symbols=None if universe else [self.symbol()]
+        self.export_btn.setEnabled(False)
+        self.export_btn.setText("Exporting…")
+        self.export_loader.load(export,DATA,out_dir,symbols,tuple(DATASETS),fmt,
+                                on_done=lambda paths:self.export_done(f"Exported {len(paths)} files to {out_dir}"),
+                                on_error=lambda message:self.export_done(f"Export failed: {message}"))
+
+    def export_done(self,message):
+        self.export_btn.setEnabled(True)
+        self.export_btn.setText("Export")
+        self.statusBar().showMessage(message,10000)
+
     # ----------------- Key Metrics -----------------
-    def create_key_metrics(self):
+    def load_key_metrics(self):
+        self.loader.load(DATA.key_metrics,self.symbol(),on_done=self.show_key_metrics,on_error=self.metrics_slot.set_error)
+
+    def reload_key_metrics(self):
+        slot=LoadingPlaceholder("Loading key metrics…",60)
+        self.main_layout.replaceWidget(self.metrics_slot,slot)
+        self.metrics_slot.deleteLater()
+        self.metrics_slot=slot
+        self.metric_cards=[]
+        self.load_key_metrics()
+
+    def show_key_metrics(self,data):
+        self.metrics_slot.set_content(self.create_key_metrics(data))
+
+    @timed("create_key_metrics")
+    def create_key_metrics(self,data):
         layout=QHBoxLayout()
         layout.setSpacing(15)
-        data=get_key_metrics()
         self.metric_cards=[]
         for key,value in data.items():
             card=QFrame()
             card.setFrameShape(QFrame.Shape.Box)
-            card.setStyleSheet("background-color:white; border:1px solid #ccc; border-radius:5px; padding:12px;")
+            card.setProperty("role","metric-card")
             card_layout=QVBoxLayout()
             lbl_key=QLabel(key)
             lbl_key.setFont(QFont("Arial",10))
             lbl_value=QLabel(value)
             lbl_value.setFont(QFont("Arial",12,QFont.Weight.Bold))
-            lbl_value.setStyleSheet("color:#007bff;")
+            lbl_value.setProperty("role","metric-value")
             card_layout.addWidget(lbl_key)
             card_layout.addWidget(lbl_value)
             card.setLayout(card_layout)
@@ -606,33 +728,243 @@ class MarketPulseApp(QMainWindow):
         return layout
 
     # ----------------- Stock Chart -----------------
+    @timed("create_stock_chart")
     def create_stock_chart(self):
+        self.stock_bars=None
+        chart_view=QChartView(self.placeholder_chart())
+        chart_view.setMinimumHeight(320)
+        return chart_view
+
+    def placeholder_chart(self):
+        chart=QChart()
+        chart.setTitle("Loading price history…")
+        chart.setBackgroundBrush(chart_background(self.theme.name))
+        chart.legend().hide()
+        self.chart=chart
+        return chart
+
+    def load_stock_chart(self):
+        if self.stock_bars is not None:
+            self.stock_bars=None
+            self.replace_chart(self.placeholder_chart())
+        self.loader.load(DATA.history.get,self.symbol(),CHART_DAYS,on_done=self.show_stock_bars,on_error=self.chart_error)
+
+    def chart_error(self,message):
+        self.chart.setTitle(f"Could not load price history: {message}")
+
+    def show_stock_bars(self,bars):
+        self.stock_bars=bars
+        menu=self.indicators_btn.menu()
+        menu.clear()
+        names=available(bars)
+        self.indicators=[name for name in self.indicators if name in names]
+        for name in names:
+            action=menu.addAction(name)
+            action.setCheckable(True)
+            action.setChecked(name in self.indicators)
+            action.toggled.connect(lambda checked,name=name:self.toggle_indicator(name,checked))
+        self.replace_chart(self.build_stock_chart())
+        self.refresh_indicator_panels()
+        self.load_backtest()
+        if self.live_btn.isChecked():
+            self.start_live()
+
+    def replace_chart(self,chart):
+        old=self.chart_view.chart()
+        self.chart_view.setChart(chart)
+        old.deleteLater()
+
+    @timed("build_stock_chart")
+    def build_stock_chart(self):
+        # Resample to what fits the window so the scene holds a bounded number of items
+        width=self.chart_view.width() if hasattr(self,"chart_view") else self.width()
+        self.chart_width=width
+        self.view_resolution,self.view_bars=for_view(self.stock_bars,width)
+        line=np.asarray(self.stock_bars.close,dtype=float)
         line_series=QLineSeries()
-        for i,val in enumerate(get_line_chart_data()):
-            line_series.append(i,val)
+        line_series.replace([QPointF(i,line[i]) for i in lttb(np.arange(len(line)),line,width//2).tolist()])
+        self.line_series=line_series
         candle_series=QCandlestickSeries()
         candle_series.setName("Candlestick")
         candle_series.setIncreasingColor(QColor("#007bff"))
         candle_series.setDecreasingColor(QColor("#ff4d4d"))
-        for o,h,l,c in get_stock_data():
-            candle_series.append(QCandlestickSet(o,c,l,h))
+        bars=self.view_bars
+        self.candle_series=candle_series
+        candle_series.append([QCandlestickSet(o,h,l,c) for o,h,l,c in
+                              zip(bars.open.tolist(),bars.high.tolist(),bars.low.tolist(),bars.close.tolist())])
         chart=QChart()
         chart.addSeries(line_series)
         chart.addSeries(candle_series)
+        for name in self.indicators:
+            if INDICATORS[name].panel=="price":
+                for series in self.indicator_series(name):
+                    chart.addSeries(series)
         chart.createDefaultAxes()
-        chart.setBackgroundBrush(QColor("white") if not self.is_dark else QColor("#2c2c2c"))
+        chart.setBackgroundBrush(chart_background(self.theme.name))
         chart.legend().hide()
         chart.setTitle("Stock Price Chart")
-        chart_view=QChartView(chart)
-        chart_view.setMinimumHeight(320)
         self.chart=chart
-        return chart_view
+        return chart
+
+    # ----------------- Live -----------------
+    def toggle_live(self,checked):
+        if checked:
+            self.start_live()
+        else:
+            self.live_timer.stop()
+
+    def start_live(self):
+        # Ticks continue the last loaded bar; nothing to do until bars arrive
+        if self.stock_bars is None:
+            return
+        # Ticks are written into the last bar, so work on a private copy: the
+        # loaded arrays are shared through the history cache (and read-only
+        # when they come from the OHLCV store)
+        self.stock_bars=Bars(*(None if c is None else np.array(c) for c in self.stock_bars))
+        feed=get_live_feed()
+        feed.seed(self.symbol(),self.stock_bars)
+        self.live_seq=-1
+        self.live_bar_seq=None
+        self.live_timer.start()
+
+    def update_live(self):
+        # Only the last QCandlestickSet is touched; a new daily bar appends a
+        # set only when it starts a new candle at the view's resolution
+        bar=get_live_feed().snapshot(self.symbol())
+        if bar is None or bar.seq==self.live_seq or self.stock_bars is None:
+            return
+        bars=self.stock_bars
+        if self.live_bar_seq is not None and bar.bar_seq!=self.live_bar_seq:
+            day=np.datetime64(int(bar.start),"s").astype("M8[D]")
+            new_candle=period_keys(day[None],self.view_resolution)[0]!=period_keys(bars.dates[-1:],self.view_resolution)[0]
+            volume=None if bars.volume is None else np.append(bars.volume,bar.volume)
+            self.stock_bars=Bars(np.append(np.asarray(bars.dates).astype("M8[D]"),day),np.append(bars.open,bar.open),
+                                 np.append(bars.high,bar.high),np.append(bars.low,bar.low),
+                                 np.append(bars.close,bar.close),volume)
+            if new_candle:
+                self.candle_series.append(QCandlestickSet(bar.open,bar.high,bar.low,bar.close))
+            else:
+                last=self.candle_series.sets()[-1]
+                last.setHigh(max(last.high(),bar.high))
+                last.setLow(min(last.low(),bar.low))
+                last.setClose(bar.close)
+            last_x=len(self.stock_bars.close)-1
+            self.line_series.append(QPointF(last_x,bar.close))
+            for axis in self.chart.axes(Qt.Orientation.Horizontal):
+                if isinstance(axis,QValueAxis) and last_x>axis.max():
+                    axis.setMax(last_x)
+                elif new_candle and isinstance(axis,QBarCategoryAxis) and axis.count()==len(self.candle_series.sets())-1:
+                    axis.append(str(axis.count()))
+        else:
+            bars.open[-1],bars.high[-1],bars.low[-1],bars.close[-1]=bar.open,bar.high,bar.low,bar.close
+            # The last candle may span several bars when the view is resampled
+            last=self.candle_series.sets()[-1]
+            last.setHigh(max(last.high(),bar.high))
+            last.setLow(min(last.low(),bar.low))
+            last.setClose(bar.close)
+            points=self.line_series.count()
+            if points:
+                self.line_series.replace(points-1,QPointF(len(bars.close)-1,bar.close))
+        for axis in self.chart.axes(Qt.Orientation.Vertical):
+            if bar.high>axis.max():
+                axis.setMax(bar.high)
+            if bar.low<axis.min():
+                axis.setMin(bar.low)
+        self.live_seq,self.live_bar_seq=bar.seq,bar.bar_seq
+
+    # ----------------- Indicators -----------------
+    def indicator_series(self,name):
+        bars=self.view_bars
+        x=np.arange(len(bars.dates))
+        series_list=[]
+        for label,values in self.indicator_engine.get(None,name,bars).items():
+            keep=lttb(x,values,max(3,self.chart_width//2))
+            series=QLineSeries()
+            series.setName(label)
+            series.replace([QPointF(i,v) for i,v in zip(keep.tolist(),values[keep].tolist())])
+            series_list.append(series)
+        return series_list
+
+    def toggle_indicator(self,name,checked):
+        if checked and name not in self.indicators:
+            self.indicators.append(name)
+        elif not checked and name in self.indicators:
+            self.indicators.remove(name)
+        if self.stock_bars is None:
+            return
+        self.replace_chart(self.build_stock_chart())
+        self.refresh_indicator_panels()
+
+    def refresh_indicator_panels(self):
+        layout=self.indicator_panels.layout()
+        while layout.count():
+            layout.takeAt(0).widget().deleteLater()
+        self.panel_charts=[]
+        for name in self.indicators:
+            if INDICATORS[name].panel=="price":
+                continue
+            chart=QChart()
+            for series in self.indicator_series(name):
+                chart.addSeries(series)
+            chart.createDefaultAxes()
+            chart.setTitle(name)
+            chart.setBackgroundBrush(chart_background(self.theme.name))
+            view=QChartView(chart)
+            view.setMinimumHeight(160)
+            layout.addWidget(view)
+            self.panel_charts.append(chart)
+        self.indicator_panels.setVisible(bool(self.panel_charts))
+
+    # ----------------- Backtest -----------------
+    def select_backtest(self,name):
+        self.strategy=None if name=="None" else name
+        self.load_backtest()
+
+    def load_backtest(self):
+        if self.strategy is None or self.stock_bars is None:
+            self.backtest_view.hide()
+            return
+        self.loader.load(run_backtest,self.stock_bars,self.strategy,on_done=self.show_backtest,on_error=self.backtest_error)
+
+    def backtest_error(self,message):
+        # Keep the panel visible so a stale equity curve is not mistaken for this run
+        self.backtest_chart=QChart()
+        self.backtest_chart.setTitle(f"Could not run {self.strategy} backtest: {message}")
+        self.backtest_chart.setBackgroundBrush(chart_background(self.theme.name))
+        old=self.backtest_view.chart()
+        self.backtest_view.setChart(self.backtest_chart)
+        old.deleteLater()
+        self.backtest_view.show()
+
+    def show_backtest(self,result):
+        old=self.backtest_view.chart()
+        self.backtest_chart=self.create_backtest_chart(result)
+        self.backtest_view.setChart(self.backtest_chart)
+        old.deleteLater()
+        self.backtest_view.show()
+
+    @timed("create_backtest_chart")
+    def create_backtest_chart(self,result):
+        width=max(3,self.chart_width//2)
+        close=np.asarray(self.stock_bars.close,dtype=float)
+        chart=QChart()
+        for label,values in [("Strategy",result.equity),("Buy & Hold",close/close[0])]:
+            series=QLineSeries()
+            series.setName(label)
+            series.replace([QPointF(i,values[i]) for i in lttb(np.arange(len(values)),values,width).tolist()])
+            chart.addSeries(series)
+        chart.createDefaultAxes()
+        stats=result.stats
+        chart.setTitle(f"{self.strategy} · return {stats['Total Return (%)']:.1f}% · Sharpe {stats['Sharpe']:.2f} · "
+                       f"max drawdown {stats['Max Drawdown (%)']:.1f}% · {stats['Trades']} trades")
+        chart.setBackgroundBrush(chart_background(self.theme.name))
+        return chart
 
     # ----------------- Pros & Cons -----------------
-    def create_pros_cons(self):
+    @timed("create_pros_cons")
+    def create_pros_cons(self,data):
         layout=QHBoxLayout()
         layout.setSpacing(20)
-        data=get_pros_cons()
         pros_cards=[]
         for section,items in data.items():
             frame=QFrame()
@@ -647,103 +979,133 @@ class MarketPulseApp(QMainWindow):
                 lbl_item.setFont(QFont("Arial",10))
                 frame_layout.addWidget(lbl_item)
             frame.setLayout(frame_layout)
-            frame.setStyleSheet("background-color:white; border:1px solid #ccc; border-radius:5px; padding:10px;")
+            frame.setProperty("role","pros-card")
             layout.addWidget(frame)
             pros_cards.append(frame)
         return layout,pros_cards
 
+    def build_pros_cons(self):
+        slot=LoadingPlaceholder("Loading pros & cons…",150)
+        self.loader.load(DATA.pros_cons,self.symbol(),on_done=lambda data:self.show_pros_cons(slot,data),on_error=slot.set_error)
+        return slot
+
+    def show_pros_cons(self,slot,data):
+        layout,self.pros_cards=self.create_pros_cons(data)
+        slot.set_content(layout)
+
     # ----------------- Peers Table -----------------
-    def create_peers_table(self):
-        table=QTableWidget()
-        peers=get_peers()
-        table.setRowCount(len(peers))
-        table.setColumnCount(4)
-        table.setHorizontalHeaderLabels(["Company","Price","P/E","ROE"])
+    def create_table_view(self,frame,formats=None):
+        # Model/view: cells are formatted only when visible, sort and filter run on numpy columns
+        model=ColumnTableModel(frame,formats)
+        proxy=ColumnFilterProxy(model)
+        table=QTableView()
+        table.setModel(proxy)
+        # Keep the provider's row order until a header is clicked
+        table.horizontalHeader().setSortIndicator(-1,Qt.SortOrder.AscendingOrder)
+        table.setSortingEnabled(True)
         table.horizontalHeader().setStretchLastSection(True)
         table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         table.verticalHeader().setVisible(False)
         table.setAlternatingRowColors(True)
-        for i,row in enumerate(peers):
-            for j,val in enumerate(row):
-                table.setItem(i,j,QTableWidgetItem(val))
+        return table
+
+    @timed("create_peers_table")
+    def create_peers_table(self,frame):
+        peers=frame[["Name","CMP","P/E","ROE (%)"]]
+        peers=peers.set_axis(["Company","Price","P/E","ROE"],axis=1)
+        table=self.create_table_view(peers,{"Price":"{:,.0f}","P/E":"{:.1f}","ROE":"{:.1f}%"})
         table.setMinimumHeight(300)
         return table
 
+    def build_peers_section(self):
+        widget=QWidget()
+        layout=QVBoxLayout(widget)
+        layout.setContentsMargins(0,0,0,0)
+        self.peers_filter=QLineEdit()
+        self.peers_filter.setPlaceholderText("Filter peers")
+        slot=LoadingPlaceholder("Loading peers…",300)
+        corr_slot=LoadingPlaceholder("Loading correlations…",300)
+        corr_slot.setMaximumWidth(320)
+        row=QHBoxLayout()
+        row.addWidget(slot,3)
+        row.addWidget(corr_slot,1)
+        layout.addWidget(self.peers_filter)
+        layout.addLayout(row)
+        self.loader.load(DATA.peers,self.symbol(),on_done=lambda frame:self.show_peers(slot,frame),on_error=slot.set_error)
+        self.loader.load(most_correlated,self.symbol(),on_done=lambda frame:self.show_correlated(corr_slot,frame),
+                         on_error=corr_slot.set_error)
+        return widget
+
+    def show_peers(self,slot,frame):
+        self.peers_table=slot.set_content(self.create_peers_table(frame))
+        self.peers_filter.textChanged.connect(self.peers_table.model().set_text_filter)
+        self.peers_table.model().set_text_filter(self.peers_filter.text())
+
+    def show_correlated(self,slot,frame):
+        self.correlated_table=slot.set_content(self.create_table_view(frame,{"Correlation":"{:.2f}"}))
+
     # ----------------- Financial Tabs -----------------
+    @timed("create_financial_tabs")
     def create_financial_tabs(self):
-        tabs=QTabWidget()
-        tabs.setStyleSheet("QTabBar::tab {padding:10px;} QTabBar::tab:selected {border-bottom:2px solid #007bff;}")
-        tab_names=["Quarterly","Profit & Loss","Balance Sheet","Cashflows","Ratios","Shareholding"]
-        fin_tables={}
+        # Each tab's table is built on first activation
+        tabs=LazyTabWidget()
+        tab_names=["Quarterly","Profit & Loss","Balance Sheet","Cash Flow","Ratios","Shareholding"]
         for name in tab_names:
-            table=self.create_financial_table(name)
-            tabs.addTab(table,name)
-            fin_tables[name]=table
-        return tabs,fin_tables
+            tabs.add_lazy_tab(name,lambda name=name:self.create_financial_table(name),250)
+        tabs.setTabToolTip(tab_names.index("Ratios"),"Derived from the statements; Industry Avg is the sector median, "
+                           "Quoted is the figure in the header and peer table")
+        return tabs
+
+    def build_financial_tabs(self):
+        self.financial_tabs=self.create_financial_tabs()
+        self.financial_tabs.ensure_current()
+        return self.financial_tabs
 
+    @timed("create_financial_table")
     def create_financial_table(self,tab_name):
-        data=get_financials(tab_name)
-        if not data:
-            return QLabel("No data available")
-        cols=len(data[0])
-        table=QTableWidget()
-        table.setRowCount(len(data))
-        table.setColumnCount(cols)
-        table.setHorizontalHeaderLabels([f"Col {i+1}" for i in range(cols)])
-        table.horizontalHeader().setStretchLastSection(True)
-        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        table.verticalHeader().setVisible(False)
-        table.setAlternatingRowColors(True)
+        slot=LoadingPlaceholder(f"Loading {tab_name}…",250)
+        self.loader.load(get_financial_frame,tab_name,self.symbol(),
+                         on_done=lambda data:self.show_financial_table(slot,tab_name,data),on_error=slot.set_error)
+        return slot
+
+    def show_financial_table(self,slot,tab_name,data):
+        if data is None or data.empty:
+            slot.set_content(QLabel("No data available"))
+            return
+        table=self.create_table_view(data)
+        table.setMinimumHeight(250)
+        slot.set_content(table)
+
+    # ----------------- Timings -----------------
+    def create_timings_panel(self):
+        table=self.create_table_view(self.timings_frame(),{c:"{:.1f}" for c in ["last_ms","p50_ms","p95_ms","max_ms"]})
         table.setMinimumHeight(250)
-        for i,row in enumerate(data):
-            for j,val in enumerate(row):
-                table.setItem(i,j,QTableWidgetItem(val))
+        self.timings_timer=QTimer(self)
+        self.timings_timer.setInterval(1000)
+        self.timings_timer.timeout.connect(lambda:table.model().sourceModel().set_frame(self.timings_frame()))
+        self.timings_timer.start()
         return table
 
+    def timings_frame(self):
+        summary=TIMINGS.summary()
+        return pd.DataFrame({"section":list(summary),
+                             **{c:[s[c] for s in summary.values()] for c in ["count","last_ms","p50_ms","p95_ms","max_ms"]}})
+
     # ----------------- Theme -----------------
     def toggle_mode(self):
-        self.is_dark=not self.is_dark
-        self.mode_btn.setText("Light Mode" if self.is_dark else "Dark Mode")
-        self.apply_theme()
+        self.theme.toggle()
 
-    def apply_theme(self):
-        # Header
-        self.setStyleSheet("background-color:#2c2c2c; color:white;" if self.is_dark else "background-color:#f8f8f8; color:black;")
-        self.title_lbl.setStyleSheet("color:#00bfff;" if self.is_dark else "color:#007bff;")
-        self.search_box.setStyleSheet(
-            "background-color:#444; color:white; border:1px solid #666;" if self.is_dark else "background-color:white; color:black; border:1px solid #ccc;")
-        for btn in [self.follow_btn,self.export_btn,self.watchlist_btn,self.mode_btn]:
-            btn.setStyleSheet(
-                "background-color:#444; color:white; border:1px solid #666;" if self.is_dark else "background-color:white; color:black; border:1px solid #ccc;")
-        # Metrics cards
-        for card in self.metric_cards:
-            card.setStyleSheet(
-                "background-color:#3c3c3c; border:1px solid #666; border-radius:5px; padding:12px;" if self.is_dark else
-                "background-color:white; border:1px solid #ccc; border-radius:5px; padding:12px;")
-        # Chart
-        self.chart.setBackgroundBrush(QColor("#2c2c2c") if self.is_dark else QColor("white"))
-        # Pros & Cons
-        for card in self.pros_cards:
-            card.setStyleSheet(
-                "background-color:#3c3c3c; border:1px solid #666; border-radius:5px; padding:10px; color:white;" if self.is_dark else
-                "background-color:white; border:1px solid #ccc; border-radius:5px; padding:10px; color:black;")
-        # Peers table
-        self.peers_table.setStyleSheet(
-            "QTableWidget { background-color:#3c3c3c; alternate-background-color:#2c2c2c; color:white; } QHeaderView::section { background-color:#3c3c3c; font-weight:bold; color:white; }"
-            if self.is_dark else
-            "QTableWidget { background-color:white; alternate-background-color:#f8f8f8; color:black; } QHeaderView::section { background-color:white; font-weight:bold; color:black; }"
-        )
-        # Financial tables
-        for table in self.fin_tables.values():
-            table.setStyleSheet(
-                "QTableWidget { background-color:#3c3c3c; alternate-background-color:#2c2c2c; color:white; } QHeaderView::section { background-color:#3c3c3c; font-weight:bold; color:white; }"
-                if self.is_dark else
-                "QTableWidget { background-color:white; alternate-background-color:#f8f8f8; color:black; } QHeaderView::section { background-color:white; font-weight:bold; color:black; }"
-            )
+    def on_theme_changed(self,name):
+        # Widgets restyle through the app stylesheet; only charts need a brush
+        self.mode_btn.setText("Light Mode" if self.theme.is_dark else "Dark Mode")
+        for chart in [c for c in [self.chart,self.backtest_chart]+self.panel_charts if c is not None]:
+            chart.setBackgroundBrush(chart_background(name))
 
 # ----------------- RUN -----------------
 if __name__=="__main__":
     app=QApplication(sys.argv)
+    if METRICS_PORT:
+        serve_metrics(TIMINGS,port=METRICS_PORT,background=True)
     window=MarketPulseApp()
     window.show()
     sys.exit(app.exec())
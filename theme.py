@@ -0,0 +1,80 @@
+# theme.py
+# One application-wide stylesheet per theme. Widgets are tagged once with an
+# objectName or a "role" dynamic property and the QSS template targets those,
+# so switching theme is a single QApplication.setStyleSheet call however many
+# cards, tables and windows are open.
+from functools import lru_cache
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QApplication
+
+THEMES = {
+    "light": {
+        "window": "#f8f8f8", "text": "black", "accent": "#007bff",
+        "input": "white", "border": "#ccc",
+        "card": "white", "table": "white", "table_alt": "#f8f8f8", "chart": "white",
+    },
+    "dark": {
+        "window": "#2c2c2c", "text": "white", "accent": "#00bfff",
+        "input": "#444", "border": "#666",
+        "card": "#3c3c3c", "table": "#3c3c3c", "table_alt": "#2c2c2c", "chart": "#2c2c2c",
+    },
+}
+
+# Placeholders are filled with str.format, so literal braces are doubled
+QSS_TEMPLATE = """
+QWidget {{ background-color:{window}; color:{text}; }}
+QLabel#title {{ color:{accent}; }}
+QLabel[role="metric-value"] {{ color:#007bff; }}
+QLabel[role="placeholder"] {{ color:gray; }}
+QFrame#header {{ border-bottom:1px solid gray; padding:5px; }}
+QLineEdit, QPushButton {{ background-color:{input}; color:{text}; border:1px solid {border}; }}
+QFrame[role="metric-card"] {{ background-color:{card}; border:1px solid {border}; border-radius:5px; padding:12px; }}
+QFrame[role="pros-card"] {{ background-color:{card}; border:1px solid {border}; border-radius:5px; padding:10px; color:{text}; }}
+QTableView {{ background-color:{table}; alternate-background-color:{table_alt}; color:{text}; }}
+QHeaderView::section {{ background-color:{table}; font-weight:bold; color:{text}; }}
+QTabBar::tab {{ padding:10px; }}
+QTabBar::tab:selected {{ border-bottom:2px solid #007bff; }}
+"""
+
+
+@lru_cache(maxsize=None)
+def stylesheet(name):
+    return QSS_TEMPLATE.format(**THEMES[name])
+
+
+def chart_background(name):
+    # QtCharts ignore QSS, so charts take their brush from here
+    return QColor(THEMES[name]["chart"])
+
+
+class ThemeEngine(QObject):
+    changed = pyqtSignal(str)
+    _instance = None
+
+    def __init__(self, name="light"):
+        super().__init__()
+        self.name = None
+        self.apply(name)
+
+    @classmethod
+    def instance(cls):
+        # Shared by every window so they all follow one toggle
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @property
+    def is_dark(self):
+        return self.name == "dark"
+
+    def apply(self, name):
+        if name == self.name:
+            return
+        self.name = name
+        QApplication.instance().setStyleSheet(stylesheet(name))
+        self.changed.emit(name)
+
+    def toggle(self):
+        self.apply("light" if self.is_dark else "dark")
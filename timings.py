@@ -0,0 +1,165 @@
+# timings.py
+# Render timings per dashboard section, shared by the Streamlit and Qt front
+# ends. Each section keeps a rolling window of recent durations (for p50/p95)
+# and lifetime histogram buckets, exported as Prometheus text or JSON:
+#   with section("peers"): render_peers(company)
+#   @timed("create_header")
+#   serve(port=9108, background=True)   # GET /metrics, /metrics.json
+import functools
+import json
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds in milliseconds; one more bucket catches everything above
+BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+WINDOW = 512
+# Show the timings panel in both front ends
+DEBUG = os.environ.get("MARKETPULSE_DEBUG", "") not in ("", "0")
+# Serve /metrics from the app process when set
+METRICS_PORT = int(os.environ.get("MARKETPULSE_METRICS_PORT", "0"))
+
+
+# ----------------- Histogram -----------------
+class RollingHistogram:
+    def __init__(self, window=WINDOW, buckets=BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.recent = deque(maxlen=window)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, ms):
+        self.recent.append(ms)
+        self.counts[bisect_left(self.buckets, ms)] += 1
+        self.count += 1
+        self.total += ms
+
+    def quantile(self, q):
+        # Nearest rank over the rolling window
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "last_ms": self.recent[-1] if self.recent else None,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "max_ms": max(self.recent) if self.recent else None,
+            "mean_ms": self.total / self.count if self.count else None,
+        }
+
+
+# ----------------- Registry -----------------
+class Timings:
+    def __init__(self, window=WINDOW, buckets=BUCKETS_MS, clock=time.perf_counter):
+        self.window = window
+        self.buckets = buckets
+        self.clock = clock
+        self._sections = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, ms):
+        with self._lock:
+            hist = self._sections.get(name)
+            if hist is None:
+                hist = self._sections[name] = RollingHistogram(self.window, self.buckets)
+            hist.observe(ms)
+
+    @contextmanager
+    def section(self, name):
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.observe(name, (self.clock() - start) * 1e3)
+
+    def timed(self, name):
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.section(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def summary(self):
+        # {section: {count, last_ms, p50_ms, p95_ms, max_ms, mean_ms}} in first-seen order
+        with self._lock:
+            return {name: hist.summary() for name, hist in self._sections.items()}
+
+    def reset(self):
+        with self._lock:
+            self._sections.clear()
+
+    # ----------------- Export -----------------
+    def to_json(self):
+        return json.dumps({"sections": self.summary()})
+
+    def to_prometheus(self):
+        name = "marketpulse_section_seconds"
+        lines = [f"# HELP {name} Time spent rendering a dashboard section.", f"# TYPE {name} histogram"]
+        quantiles = ["# HELP marketpulse_section_recent_seconds Quantiles over the last renders of a section.",
+                     "# TYPE marketpulse_section_recent_seconds gauge"]
+        with self._lock:
+            for section, hist in self._sections.items():
+                label = section.replace("\\", "\\\\").replace('"', '\\"')
+                cumulative = 0
+                for bound, count in zip(hist.buckets + (None,), hist.counts):
+                    cumulative += count
+                    le = "+Inf" if bound is None else f"{bound / 1e3:g}"
+                    lines.append(f'{name}_bucket{{section="{label}",le="{le}"}} {cumulative}')
+                lines.append(f'{name}_sum{{section="{label}"}} {hist.total / 1e3:.6f}')
+                lines.append(f'{name}_count{{section="{label}"}} {hist.count}')
+                for q in (0.5, 0.95):
+                    quantiles.append(f'marketpulse_section_recent_seconds{{section="{label}",quantile="{q}"}} '
+                                     f'{hist.quantile(q) / 1e3:.6f}')
+        return "\n".join(lines + quantiles) + "\n"
+
+
+def _handler(timings):
+    routes = {
+        "/metrics": (timings.to_prometheus, "text/plain; version=0.0.4"),
+        "/metrics.json": (timings.to_json, "application/json"),
+    }
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            route = routes.get(self.path.split("?")[0])
+            if route is None:
+                self.send_error(404)
+                return
+            render, content_type = route
+            body = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(timings=None, host="127.0.0.1", port=9108, background=False):
+    server = ThreadingHTTPServer((host, port), _handler(timings or TIMINGS))
+    if background:
+        threading.Thread(target=server.serve_forever, daemon=True, name="marketpulse-metrics").start()
+        return server
+    server.serve_forever()
+
+
+# Process-wide registry used by both front ends
+TIMINGS = Timings()
+section = TIMINGS.section
+timed = TIMINGS.timed
@@ -0,0 +1,41 @@
+# universe.py
+# Symbol universe shared by the Streamlit and Qt front ends:
+# (display name, NSE ticker, aliases people type)
+UNIVERSE = [
+    ("Tata Motors", "TATAMOTORS", ["Tata Motors Ltd", "Tata Motor"]),
+    ("Maruti Suzuki", "MARUTI", ["Maruti Suzuki India", "MSIL", "Maruti"]),
+    ("M & M", "M&M", ["Mahindra & Mahindra", "Mahindra and Mahindra", "Mahindra"]),
+    ("Hyundai Motor", "HYUNDAI", ["Hyundai Motor India", "Hyundai"]),
+    ("Force Motors", "FORCEMOT", ["Force"]),
+    ("Olectra Greentech", "OLECTRA", ["Olectra"]),
+    ("Mercury EV-Tech", "MERCURYEV", ["Mercury EV", "Mercury"]),
+]
+
+COMPANIES = [name for name, _, _ in UNIVERSE]
+TICKERS = {name: ticker for name, ticker, _ in UNIVERSE}
+
+# ----------------- Profiles -----------------
+# Net Profit is the latest quarter, in Cr
+PROFILES = {
+    "Tata Motors": {"Price": 701, "Change": -1.67, "Market Cap": "2,57,980 Cr", "HighLow": "948 / 536",
+                    "PE": 12.0, "Book": 315, "Div": 0.84, "ROCE": 20.0, "ROE": 28.1,
+                    "Sector": "Automobiles", "Net Profit": 4003},
+    "Maruti Suzuki": {"Price": 16117, "Change": 0.87, "Market Cap": "5,06,714 Cr", "HighLow": "18000 / 9600",
+                    "PE": 34.9, "Book": 1200, "Div": 0.84, "ROCE": 21.7, "ROE": 18.2,
+                    "Sector": "Automobiles", "Net Profit": 3792},
+    "M & M": {"Price": 3494, "Change": 2.15, "Market Cap": "4,34,532 Cr", "HighLow": "4200 / 1800",
+                    "PE": 31.7, "Book": 850, "Div": 0.73, "ROCE": 13.9, "ROE": 15.5,
+                    "Sector": "Automobiles", "Net Profit": 4376},
+    "Hyundai Motor": {"Price": 2445, "Change": -7.74, "Market Cap": "1,98,682 Cr", "HighLow": "3000 / 1500",
+                    "PE": 36.9, "Book": 600, "Div": 0.87, "ROCE": 54.3, "ROE": 25.1,
+                    "Sector": "Automobiles", "Net Profit": 1335},
+    "Force Motors": {"Price": 15898, "Change": 52.40, "Market Cap": "20,947 Cr", "HighLow": "18500 / 8000",
+                    "PE": 34.7, "Book": 2100, "Div": 0.24, "ROCE": 30.0, "ROE": 22.8,
+                    "Sector": "Automobiles", "Net Profit": 176},
+    "Olectra Greentech": {"Price": 1545, "Change": 8.46, "Market Cap": "12,681 Cr", "HighLow": "2000 / 800",
+                    "PE": 90.0, "Book": 300, "Div": 0.03, "ROCE": 20.5, "ROE": 12.3,
+                    "Sector": "Automobiles", "Net Profit": 46},
+    "Mercury EV-Tech": {"Price": 47, "Change": 304.08, "Market Cap": "888 Cr", "HighLow": "85 / 15",
+                    "PE": 94.5, "Book": 25, "Div": 0.00, "ROCE": 5.2, "ROE": 8.1,
+                    "Sector": "Automobiles", "Net Profit": 2},
+}
@@ -0,0 +1,261 @@
+# watchlist.py
+# Followed companies, kept in SQLite so both front ends (and every Streamlit
+# session) share one list. The database runs in WAL mode: the refresher's
+# writes never block a window reading the list.
+#
+# A WatchlistRefresher asks for every watched symbol's quote in one batched
+# call per interval and folds the answer into a QuoteBoard, which compares it
+# with the previous one and stamps only the rows that changed. Front ends poll
+# board.changed_since(version) and repaint those rows; only changed quotes
+# are written back.
+import os
+import sqlite3
+import sys
+import threading
+import time
+import traceback
+
+import numpy as np
+import pandas as pd
+
+WATCHLIST_PATH = os.environ.get("MARKETPULSE_WATCHLIST", "data/watchlist.db")
+REFRESH_S = float(os.environ.get("MARKETPULSE_WATCHLIST_REFRESH", "5"))
+DEFAULT_LIST = "default"
+COLUMNS = ["Symbol", "Price", "Change", "Change %"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS watchlist (
+    list TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    added REAL NOT NULL,
+    PRIMARY KEY (list, symbol)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS quotes (
+    symbol TEXT PRIMARY KEY,
+    price REAL,
+    prev_close REAL,
+    updated REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+# ----------------- Storage -----------------
+class WatchlistStore:
+    def __init__(self, path=WATCHLIST_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # One connection shared by the refresher thread and the GUI thread
+        self.conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self.lock = threading.Lock()
+        with self.lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+
+    def symbols(self, name=DEFAULT_LIST):
+        # Oldest first
+        with self.lock:
+            rows = self.conn.execute("SELECT symbol FROM watchlist WHERE list = ? ORDER BY added, symbol",
+                                     (name,)).fetchall()
+        return [row[0] for row in rows]
+
+    def contains(self, symbol, name=DEFAULT_LIST):
+        with self.lock:
+            return self.conn.execute("SELECT 1 FROM watchlist WHERE list = ? AND symbol = ?",
+                                     (name, symbol)).fetchone() is not None
+
+    def add(self, symbols, name=DEFAULT_LIST):
+        symbols = [symbols] if isinstance(symbols, str) else list(symbols)
+        now = time.time()
+        with self.lock:
+            self.conn.executemany("INSERT OR IGNORE INTO watchlist VALUES (?, ?, ?)",
+                                  [(name, s, now) for s in symbols])
+
+    def remove(self, symbols, name=DEFAULT_LIST):
+        symbols = [symbols] if isinstance(symbols, str) else list(symbols)
+        with self.lock:
+            self.conn.executemany("DELETE FROM watchlist WHERE list = ? AND symbol = ?", [(name, s) for s in symbols])
+
+    def save_quotes(self, symbols, price, prev_close):
+        # One transaction for the whole batch
+        now = time.time()
+        rows = [(s, None if np.isnan(p) else p, None if np.isnan(c) else c, now)
+                for s, p, c in zip(symbols, price.tolist(), prev_close.tolist())]
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.executemany("INSERT OR REPLACE INTO quotes VALUES (?, ?, ?, ?)", rows)
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def quotes(self, symbols):
+        # Last saved {symbol: [price, previous close]}, so a window has
+        # something to show before the first refresh
+        wanted = set(symbols)
+        with self.lock:
+            rows = self.conn.execute("SELECT symbol, price, prev_close FROM quotes").fetchall()
+        return {s: [np.nan if p is None else p, np.nan if c is None else c] for s, p, c in rows if s in wanted}
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+# ----------------- Diffing -----------------
+class QuoteBoard:
+    # Quotes of the watched symbols as columns. Every apply() that changes
+    # something is a new version; seq holds the version each row last changed
+    # in, and layout changes when symbols are added or removed.
+    def __init__(self, symbols=()):
+        self.lock = threading.RLock()
+        self.symbols = []
+        self.price = np.empty(0)
+        self.prev_close = np.empty(0)
+        self.seq = np.empty(0, dtype=np.int64)
+        self.version = 0
+        self.layout = 0
+        self.set_symbols(symbols)
+
+    def set_symbols(self, symbols):
+        symbols = list(symbols)
+        with self.lock:
+            if symbols == self.symbols:
+                return False
+            # Symbols still watched keep their quotes
+            old = {s: i for i, s in enumerate(self.symbols)}
+            keep = np.array([old.get(s, -1) for s in symbols], dtype=np.int64)
+            found = keep >= 0
+            price, prev_close = np.full(len(symbols), np.nan), np.full(len(symbols), np.nan)
+            price[found], prev_close[found] = self.price[keep[found]], self.prev_close[keep[found]]
+            self.symbols, self.price, self.prev_close = symbols, price, prev_close
+            self.version += 1
+            self.layout += 1
+            self.seq = np.full(len(symbols), self.version, dtype=np.int64)
+            return True
+
+    def apply(self, quotes):
+        # quotes: {symbol: [price, previous close]}; symbols missing from the
+        # answer keep their last quote. Returns the rows that changed.
+        with self.lock:
+            answer = [quotes.get(s) for s in self.symbols]
+            got = np.array([q is not None for q in answer], dtype=bool)
+            new = np.array([q if q is not None else (np.nan, np.nan) for q in answer], dtype=np.float64).reshape(-1, 2)
+            price = np.where(got, new[:, 0], self.price)
+            prev_close = np.where(got, new[:, 1], self.prev_close)
+            changed = np.flatnonzero(_differs(price, self.price) | _differs(prev_close, self.prev_close))
+            if len(changed):
+                self.version += 1
+                self.price, self.prev_close = price, prev_close
+                self.seq[changed] = self.version
+            return changed
+
+    def changed_since(self, version):
+        # (layout, version, rows changed after `version`, their frame), all
+        # from the same state
+        with self.lock:
+            rows = np.flatnonzero(self.seq > version)
+            return self.layout, self.version, rows, self.frame(rows)
+
+    def rows(self, rows=None):
+        # (symbols, price, previous close) for every row, or for `rows` only
+        with self.lock:
+            rows = np.arange(len(self.symbols)) if rows is None else np.asarray(rows, dtype=np.int64)
+            return [self.symbols[i] for i in rows.tolist()], self.price[rows], self.prev_close[rows]
+
+    def frame(self, rows=None):
+        # COLUMNS for every row, or for `rows` only
+        symbols, price, prev_close = self.rows(rows)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return pd.DataFrame({"Symbol": symbols, "Price": price, "Change": price - prev_close,
+                                 "Change %": 100 * (price / prev_close - 1)})
+
+
+def _differs(a, b):
+    # NaN equals NaN here: a quote that is still missing has not changed
+    return (a != b) & ~(np.isnan(a) & np.isnan(b))
+
+
+# ----------------- Refresher -----------------
+class WatchlistRefresher:
+    # One per process; every window and session reads its board. quotes is
+    # the batched source, symbols -> {symbol: [price, previous close]}.
+    def __init__(self, store, quotes, interval=REFRESH_S, name=DEFAULT_LIST):
+        self.store = store
+        self.quotes = quotes
+        self.interval = interval
+        self.name = name
+        # Set by live mode: its last prices win over the polled quotes
+        self.live = None
+        symbols = store.symbols(name)
+        self.board = QuoteBoard(symbols)
+        self.board.apply(store.quotes(symbols))
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ----------------- List -----------------
+    def symbols(self):
+        return self.store.symbols(self.name)
+
+    def following(self, symbol):
+        return self.store.contains(symbol, self.name)
+
+    def follow(self, symbol):
+        self.store.add(symbol, self.name)
+        self.refresh_soon()
+
+    def unfollow(self, symbol):
+        self.store.remove(symbol, self.name)
+        self.refresh_soon()
+
+    # ----------------- Refresh -----------------
+    def refresh(self):
+        # Picks up list changes made elsewhere, then one batched request
+        symbols = self.symbols()
+        self.board.set_symbols(symbols)
+        if not symbols:
+            return np.empty(0, dtype=np.int64)
+        quotes = self.quotes(symbols)
+        if self.live is not None and self.live.running:
+            for symbol, price in self.live.last_prices(symbols).items():
+                quotes[symbol] = [price, quotes.get(symbol, [np.nan, np.nan])[1]]
+        changed = self.board.apply(quotes)
+        if len(changed):
+            self.store.save_quotes(*self.board.rows(changed))
+        return changed
+
+    def refresh_soon(self):
+        # Without a running thread, refresh on the caller's thread
+        if self.running:
+            self._wake.set()
+        else:
+            self.refresh()
+
+    def start(self):
+        if not self.running:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True, name="marketpulse-watchlist")
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                # Whatever a backend raises, a failed round leaves the last
+                # quotes up and the next interval tries again; the thread
+                # must not die quietly
+                print(f"watchlist refresh failed:\n{traceback.format_exc()}", file=sys.stderr)
+            self._wake.wait(self.interval)
+            self._wake.clear()